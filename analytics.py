@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+from listing_groups import GROUP_COLUMN, collapse_duplicates
+
+# ㎡당 가격을 계산하는 거래 유형 (월세는 보증금만으로 비교할 수 없으므로 제외)
+PER_AREA_TRADES = ["매매", "전세"]
+PERCENTILES = [0.1, 0.25, 0.5, 0.75, 0.9]
+FLOOR_BANDS = ["저층", "중층", "고층"]
+# 네이버 층 표기 "저/15", "중/20", "고/25"
+FLOOR_WORDS = {"저": "저층", "중": "중층", "고": "고층"}
+# 건물별 집계 키 (여러 지역을 함께 집계할 때 이름이 같은 건물을 구분)
+BUILDING_KEYS = ["주소지", "건물명"]
+
+
+def floor_band(text):
+    """층수 문자열 하나("12/25", "고/20", "B1/15")의 층 구분 - 전체 층의 1/3 이하 저층, 2/3 이하 중층, 그 위 고층"""
+    floor, _, total = str(text).partition("/")
+    floor = floor.strip()
+    if floor in FLOOR_WORDS:
+        return FLOOR_WORDS[floor]
+    if floor.upper().startswith("B"):
+        return "저층"
+    try:
+        floor, total = int(floor), int(total)
+    except ValueError:
+        return ""
+    if total <= 0:
+        return ""
+    ratio = floor / total
+    return "저층" if ratio <= 1 / 3 else "중층" if ratio <= 2 / 3 else "고층"
+
+
+def floor_band_series(values, index=None):
+    """층수 값 목록의 층 구분 Series (고유값만 해석한 뒤 코드 배열로 펼침)"""
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    bands = np.array([floor_band(value) for value in uniques] + [""], dtype=object)
+    return pd.Series(pd.Categorical(bands[codes], categories=[*FLOOR_BANDS, ""]), index=index)
+
+
+def _column(df, column, default):
+    return df[column] if column in df.columns else pd.Series(default, index=df.index)
+
+
+def analytics_frame(df):
+    """집계에 쓰는 컬럼만 모은 DataFrame (중복 매물은 묶음 대표 하나만, ㎡당 가격/층 구분/면적 구간 추가)"""
+    if GROUP_COLUMN in df.columns:
+        df = collapse_duplicates(df)
+    price = pd.to_numeric(_column(df, "가격(만원)", np.nan), errors="coerce")
+    area = pd.to_numeric(_column(df, "전용면적(㎡)", np.nan), errors="coerce")
+    trade = _column(df, "거래타입", "").astype(object).fillna("").astype("category")
+    per_area = trade.isin(PER_AREA_TRADES).to_numpy() & (area > 0).to_numpy()
+    frame = pd.DataFrame({
+        "거래타입": trade,
+        "주소지": _column(df, "주소지", "").astype(object).fillna("").astype("category"),
+        "건물명": _column(df, "건물명", "").astype(object).fillna("").astype("category"),
+        "가격(만원)": price,
+        "전용면적(㎡)": area,
+        "㎡당 가격(만원)": np.where(per_area, price / area, np.nan),
+        # 같은 평형끼리 매매/전세를 비교하기 위한 면적 구간 (㎡ 정수)
+        "면적 구간": area.round(),
+    }, index=df.index)
+    if "층수" in df.columns:
+        frame["층 구분"] = floor_band_series(df["층수"], index=df.index)
+    return frame
+
+
+def _overview(frame):
+    """거래 유형별 매물 수, 평균/중앙 가격, 중앙 ㎡당 가격, 평균 전용면적"""
+    return frame.groupby("거래타입", observed=True).agg(**{
+        "매물 수": ("가격(만원)", "size"),
+        "평균 가격(만원)": ("가격(만원)", "mean"),
+        "중앙 가격(만원)": ("가격(만원)", "median"),
+        "중앙 ㎡당 가격(만원)": ("㎡당 가격(만원)", "median"),
+        "평균 전용면적(㎡)": ("전용면적(㎡)", "mean"),
+    })
+
+
+def _bands(frame):
+    """거래 유형별 가격/㎡당 가격 백분위 구간 (p10, p25, p50, p75, p90)"""
+    quantiles = frame.groupby("거래타입", observed=True)[["가격(만원)", "㎡당 가격(만원)"]].quantile(PERCENTILES)
+    bands = quantiles.unstack()
+    bands.columns = [f"{column.split('(')[0]} p{round(q * 100)}" for column, q in bands.columns]
+    return bands
+
+
+def _jeonse_ratios(frame, keys):
+    """keys(+ 면적 구간)별 전세 중앙가 / 매매 중앙가 비율(%) - 매매와 전세가 모두 있는 구간만"""
+    subset = frame[frame["거래타입"].isin(PER_AREA_TRADES) & frame["가격(만원)"].notna()]
+    if subset.empty:
+        return pd.Series(dtype=float)
+    medians = (subset.groupby([*keys, "면적 구간", "거래타입"], observed=True)["가격(만원)"]
+               .median().unstack("거래타입"))
+    if not set(PER_AREA_TRADES) <= set(medians.columns):
+        return pd.Series(dtype=float)
+    return (medians["전세"] / medians["매매"] * 100).dropna()
+
+
+def _buildings(named, ratios):
+    """(주소지, 건물명)별 매물 수, 매매/전세 중앙가, 매매 중앙 ㎡당 가격, 전세가율(%) - 매물 수가 많은 순
+
+    named는 건물명이 있는 행, ratios는 _jeonse_ratios(named, BUILDING_KEYS) 결과다.
+    """
+    keys = BUILDING_KEYS
+    if named.empty:
+        return pd.DataFrame()
+    buildings = named.groupby(keys, observed=True).size().to_frame("매물 수")
+    medians = named.groupby([*keys, "거래타입"], observed=True)["가격(만원)"].median().unstack("거래타입")
+    for trade in PER_AREA_TRADES:
+        buildings[f"{trade} 중앙가(만원)"] = medians[trade] if trade in medians.columns else np.nan
+    sale = named[named["거래타입"] == "매매"]
+    buildings["매매 중앙 ㎡당 가격(만원)"] = sale.groupby(keys, observed=True)["㎡당 가격(만원)"].median()
+    buildings["전세가율(%)"] = ratios.groupby(level=keys, observed=True).median() if not ratios.empty else np.nan
+    return buildings.sort_values("매물 수", ascending=False, kind="stable")
+
+
+def _floors(frame):
+    """(거래 유형, 층 구분)별 매물 수, 중앙 가격, 중앙 ㎡당 가격"""
+    if "층 구분" not in frame.columns:
+        return pd.DataFrame()
+    return frame[frame["층 구분"] != ""].groupby(["거래타입", "층 구분"], observed=True).agg(**{
+        "매물 수": ("가격(만원)", "size"),
+        "중앙 가격(만원)": ("가격(만원)", "median"),
+        "중앙 ㎡당 가격(만원)": ("㎡당 가격(만원)", "median"),
+    })
+
+
+def aggregate_results(df):
+    """정규화된 수집 결과(또는 PriceHistory.listings())의 집계 dict
+
+    - overview: 거래 유형별 매물 수/평균·중앙 가격/중앙 ㎡당 가격/평균 전용면적
+    - bands: 거래 유형별 가격·㎡당 가격 백분위 (p10~p90)
+    - buildings: (주소지, 건물명)별 매물 수, 매매/전세 중앙가, 매매 중앙 ㎡당 가격, 전세가율
+    - floors: (거래 유형, 층 구분)별 매물 수/중앙 가격/중앙 ㎡당 가격 (층수 컬럼이 없으면 빈 DataFrame)
+    - jeonse_ratio: 같은 건물·면적 구간의 전세 중앙가 / 매매 중앙가 비율(%)의 중앙값 (건물명이 없는 매물 제외,
+      비교할 구간이 없으면 None)
+    - rows: 집계한 행 수 (중복 매물 묶음은 하나로 셈)
+    - collapsed: 중복 매물 묶음(중복그룹)을 대표 하나로 줄여 실제로 집계 행이 줄었는지 여부
+
+    모든 집계는 groupby로 계산하며 행 단위 파이썬 반복이 없다. 결과 집합별 메모는 호출하는 쪽에서 한다.
+    """
+    frame = analytics_frame(df)
+    named = frame[frame["건물명"] != ""]
+    ratios = _jeonse_ratios(named, BUILDING_KEYS)
+    return {
+        "overview": _overview(frame),
+        "bands": _bands(frame),
+        "buildings": _buildings(named, ratios),
+        "floors": _floors(frame),
+        "jeonse_ratio": float(ratios.median()) if not ratios.empty else None,
+        "rows": len(frame),
+        "collapsed": len(frame) < len(df),
+    }
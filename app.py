@@ -1,14 +1,25 @@
 import streamlit as st
 import pandas as pd
-import requests
-import time
-from bs4 import BeautifulSoup
-import io
-from datetime import datetime
+from datetime import datetime, date, timedelta
 import logging
-import re
 import os
 
+from detail_cache import DetailCache
+from analytics import aggregate_results
+from crawl_checkpoint import CrawlCheckpoint
+from detail_enricher import DetailEnricher, apply_details, detail_targets, group_members, pending_detail_atclNos
+from listing_store import ListingStore
+from price_history import PriceHistory
+from run_metrics import RunMetrics
+from export import EXCEL_MIME, EXPORT_FORMATS, PARQUET_AVAILABLE
+from normalize import normalize_results
+from record_columns import RecordColumns
+from response_cache import ResponseCache
+from listing_groups import GROUP_COLUMN, collapse_duplicates
+from legal_code import LegalCodeIndex, LEGAL_CODE_COLUMNS
+from region_geo import RegionGeoIndex, search_tiles
+from crawler import PROPERTY_TYPES, TRADE_TYPES, DETAIL_COLUMNS, RETRY_HINT, AdaptivePacer, RateLimiter, iter_property_pages
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,8 +32,159 @@ st.markdown("**📌 지역 이름을 입력하면 자동으로 법정동 코드
 # 세션 상태 초기화
 if 'cortarNo' not in st.session_state:
     st.session_state.cortarNo = ""
-if 'search_results' not in st.session_state:
-    st.session_state.search_results = []
+if 'search_df' not in st.session_state:
+    st.session_state.search_df = pd.DataFrame()
+    st.session_state.result_key = None
+    st.session_state.result_cache = {}
+if 'crawl_stats' not in st.session_state:
+    st.session_state.crawl_stats = {"hits": 0, "misses": 0, "unchanged": 0, "filtered_out": 0, "resumed_pages": 0}
+if 'run_metrics' not in st.session_state:
+    st.session_state.run_metrics = None
+if 'enricher' not in st.session_state:
+    st.session_state.enricher = None
+if 'enrich_polling' not in st.session_state:
+    st.session_state.enrich_polling = False
+
+def store_search_results(df):
+    """검색 결과 DataFrame 저장 - 결과 해시가 바뀌면 통계/정렬/내보내기 메모를 비움"""
+    key = int(pd.util.hash_pandas_object(df, index=False).sum())
+    if key != st.session_state.result_key:
+        st.session_state.result_cache = {}
+    st.session_state.result_key = key
+    st.session_state.search_df = df
+
+def result_cached(name, compute, cache=None):
+    """현재 결과 집합에 대해 name 값을 한 번만 계산하고 재실행 때는 메모를 사용
+
+    스크립트 실행 밖(다운로드 시점)에서 부를 때는 미리 꺼내 둔 result_cache를 cache로 넘긴다.
+    """
+    if cache is None:
+        cache = st.session_state.result_cache
+    if name not in cache:
+        cache[name] = compute()
+    return cache[name]
+
+def export_cached(export_format, df, cache, metrics=None, memo_prefix=""):
+    """결과 집합별로 한 번만 만드는 내보내기 파일 바이트 (다운로드 시점에 부름)
+
+    metrics(마지막 검색의 RunMetrics)가 주어지면 생성 시간을 export_{확장자} 단계에 더해 실행 프로파일에 표시한다.
+    """
+    extension, _, convert = EXPORT_FORMATS[export_format]
+
+    def build():
+        if metrics is None:
+            return convert(df)
+        with metrics.stage(f"export_{extension}"):
+            return convert(df)
+
+    return result_cached(f"{memo_prefix}export:{export_format}", build, cache)
+
+def summarize_results(df):
+    """결과 요약 통계 (평균 전용면적, 최빈 층수/용도, 마지막 검색 시각)"""
+    summary = {"count": len(df), "last_search": None, "mean_area": None, "top_floor": None, "top_purpose": None}
+    if df.empty:
+        return summary
+    if '수집일시' in df.columns:
+        summary["last_search"] = df['수집일시'].iloc[0][:16]
+    if '전용면적(㎡)' in df.columns:
+        areas = df['전용면적(㎡)'].dropna()
+        if not areas.empty:
+            summary["mean_area"] = areas.mean()
+    for key, column in (("top_floor", "층수"), ("top_purpose", "용도")):
+        if column in df.columns:
+            counts = df[column].value_counts()
+            if not counts.empty:
+                summary[key] = counts.index[0]
+    return summary
+
+def show_aggregates(aggregates):
+    """aggregate_results 결과 표시 (㎡당 가격/전세가율 지표와 가격 분포·건물별·층별 표)"""
+    overview = aggregates["overview"]
+    col_sale, col_jeonse, col_ratio = st.columns(3)
+    for col, trade in ((col_sale, "매매"), (col_jeonse, "전세")):
+        if trade in overview.index and pd.notna(overview.loc[trade, "중앙 ㎡당 가격(만원)"]):
+            col.metric(f"{trade} 중앙 ㎡당 가격", f"{overview.loc[trade, '중앙 ㎡당 가격(만원)']:,.0f}만원")
+    if aggregates["jeonse_ratio"] is not None:
+        col_ratio.metric("전세가율 (같은 건물·면적)", f"{aggregates['jeonse_ratio']:.1f}%")
+    tab_overview, tab_bands, tab_buildings, tab_floors = st.tabs(["거래 유형별", "가격 분포", "건물별", "층별"])
+    with tab_overview:
+        st.dataframe(overview.round(1), use_container_width=True)
+    with tab_bands:
+        st.dataframe(aggregates["bands"].round(1), use_container_width=True)
+    with tab_buildings:
+        st.dataframe(aggregates["buildings"].head(50).round(1), use_container_width=True)
+    with tab_floors:
+        if aggregates["floors"].empty:
+            st.caption("층수 정보가 없습니다.")
+        else:
+            st.dataframe(aggregates["floors"].round(1), use_container_width=True)
+    st.caption(f"집계 대상 {aggregates['rows']:,}건{' (중복 매물은 묶음 대표만)' if aggregates['collapsed'] else ''} · "
+               "㎡당 가격은 전용면적 기준, 월세 제외")
+
+# 엑셀 내보내기 형식 이름 (검색 직후/상세 채우기 패널의 엑셀 다운로드가 결과 영역과 같은 메모를 씀)
+EXCEL_EXPORT = next(name for name, (extension, _, _) in EXPORT_FORMATS.items() if extension == "xlsx")
+
+def detail_enrichment_panel():
+    """백그라운드에서 도착한 상세 정보를 결과에 반영하고, 선택한 매물만 수집하거나 현재 상태로 내보내기
+
+    진행 중인 요청이 있을 때만 2초마다 다시 실행되는 fragment로 그린다 (아래 호출부 참고).
+    새로 끝난 상세 정보가 있을 때만 결과를 고치고, 남은 매물은 결과 전체를 다시 훑지 않고 enricher가 추적한다.
+    """
+    enricher = st.session_state.enricher
+    if enricher is None:
+        return
+    ready = enricher.take()
+    if ready:
+        store_search_results(apply_details(st.session_state.search_df, ready))
+    if st.session_state.enrich_polling and not enricher.pending:
+        # 요청이 모두 끝나면 한 번 전체를 다시 그려 결과 영역에도 반영하고 주기적 실행을 멈춤
+        st.rerun()
+    df = st.session_state.search_df
+    pending = enricher.blank
+    
+    st.subheader("🧩 상세 정보 채우기")
+    if enricher.submitted:
+        st.progress((enricher.completed + enricher.failed) / enricher.submitted,
+                    text=f"상세 정보 {enricher.completed}/{enricher.submitted}건 수집 (대기 {enricher.pending}건"
+                         f"{f', 실패 {enricher.failed}건' if enricher.failed else ''})")
+    st.caption(f"상세 정보가 비어 있는 매물 {len(pending)}건 · 표에서 행을 선택하면 그 매물만 수집할 수 있습니다.")
+    event = st.dataframe(
+        df[["매물번호", "건물명", "보증금/매매가", *DETAIL_COLUMNS]],
+        key="enrich_table",
+        on_select="rerun",
+        selection_mode="multi-row",
+        hide_index=True,
+    )
+    col_selected, col_all, col_export = st.columns(3)
+    with col_selected:
+        if st.button("선택한 매물 상세 수집", disabled=not event.selection.rows):
+            if enricher.submit(detail_targets(df, event.selection.rows)):
+                st.rerun()
+    with col_all:
+        if st.button("남은 매물 모두 수집", disabled=not pending):
+            if enricher.submit(pending):
+                st.rerun()
+    with col_export:
+        # 지금까지 채운 값으로 내보내기
+        result_cache = st.session_state.result_cache
+        run_metrics = st.session_state.run_metrics
+        st.download_button(
+            "📥 현재 상태로 엑셀 다운로드",
+            data=lambda: export_cached(EXCEL_EXPORT, df, result_cache, run_metrics),
+            file_name=f"매물정보_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+            mime=EXCEL_MIME,
+            key="enrich_download",
+        )
+
+# 실행 프로파일 저장 경로 (모니터링 수집용, 검색할 때마다 덮어씀)
+RUN_PROFILE_PATHS = ["run_profile.json", "run_profile.prom"]
+# 공유 응답 캐시 지표 저장 경로 (서버 프로세스 전체 누적값)
+RESPONSE_CACHE_METRICS_PATH = "response_cache.prom"
+
+@st.cache_resource
+def get_response_cache():
+    """서버 프로세스의 모든 세션이 공유하는 목록/상세 응답 캐시 (5분 유지, 같은 요청은 하나로 합침)"""
+    return ResponseCache(max_entries=5000, max_bytes=128 * 1024 * 1024, ttl_seconds=300)
 
 # 법정동코드 파일 자동 생성 함수
 def create_sample_legal_code():
@@ -49,66 +211,53 @@ if not os.path.exists('법정동코드.csv'):
     create_sample_legal_code()
     st.success("샘플 법정동코드.csv 파일이 생성되었습니다!")
 
+@st.cache_resource(max_entries=1)
+def get_legal_code_index(path, mtime):
+    """세션/재실행 간 공유되는 법정동코드 인덱스 (파일 수정 시각이 바뀔 때만 다시 생성)"""
+    return LegalCodeIndex.from_csv(path)
+
+def apply_region_suggestion():
+    """자동완성에서 고른 지역을 입력칸과 법정동 코드에 반영"""
+    code = st.session_state.region_suggestion
+    if code:
+        st.session_state.cortarNo = code
+        st.session_state.sido_input, st.session_state.sigungu_input, st.session_state.eupmyeondong_input = st.session_state.region_suggestion_names[code]
+
 # --- 1. 법정동 코드 자동 검색기 ---
 st.subheader("1️⃣ 지역 정보 입력")
 
+region_query = st.text_input("🔎 지역 빠른 검색", placeholder="예: 삼성동, 강남 삼성, ㅅㅅㄷ", help="지역명 일부나 초성을 입력하면 후보를 추천합니다.")
+if region_query:
+    try:
+        suggestions = get_legal_code_index("법정동코드.csv", os.path.getmtime("법정동코드.csv")).autocomplete.search(region_query)
+    except (FileNotFoundError, ValueError):
+        suggestions = []
+    if suggestions:
+        st.session_state.region_suggestion_names = {code: names for code, *names in suggestions}
+        st.selectbox(
+            "추천 지역",
+            options=list(st.session_state.region_suggestion_names),
+            index=None,
+            format_func=lambda code: f"{' '.join(st.session_state.region_suggestion_names[code])} ({code})",
+            placeholder=f"{len(suggestions)}개 후보 중 선택하세요",
+            key="region_suggestion",
+            on_change=apply_region_suggestion
+        )
+    else:
+        st.caption("일치하는 지역이 없습니다.")
+
 col1, col2, col3 = st.columns(3)
 with col1:
-    sido = st.text_input("시/도", placeholder="예: 서울특별시")
+    sido = st.text_input("시/도", placeholder="예: 서울특별시", key="sido_input")
 with col2:
-    sigungu = st.text_input("시/군/구", placeholder="예: 강남구")
+    sigungu = st.text_input("시/군/구", placeholder="예: 강남구", key="sigungu_input")
 with col3:
-    eupmyeondong = st.text_input("읍/면/동", placeholder="예: 삼성동")
+    eupmyeondong = st.text_input("읍/면/동", placeholder="예: 삼성동", key="eupmyeondong_input")
 
 def search_legal_code(sido, sigungu, eupmyeondong):
     """법정동 코드를 검색하는 함수"""
     try:
-        # 여러 인코딩으로 시도
-        encodings = ['utf-8', 'utf-8-sig', 'cp949', 'euc-kr']
-        law_df = None
-        
-        for encoding in encodings:
-            try:
-                law_df = pd.read_csv("법정동코드.csv", dtype=str, encoding=encoding)
-                break
-            except UnicodeDecodeError:
-                continue
-        
-        if law_df is None:
-            return "", False, "❌ 법정동코드.csv 파일 읽기 실패 (인코딩 문제)"
-        
-        # 컬럼명 확인 및 표준화
-        columns = law_df.columns.tolist()
-        st.write(f"🔍 CSV 파일 컬럼: {columns}")  # 디버깅용
-        
-        # 다양한 컬럼명 패턴 지원
-        column_mapping = {}
-        for col in columns:
-            col_lower = col.strip().lower()
-            if '법정동' in col or 'code' in col_lower or '코드' in col:
-                column_mapping['법정동코드'] = col
-            elif '시도' in col or 'sido' in col_lower:
-                column_mapping['시도'] = col
-            elif '시군구' in col or 'sigungu' in col_lower or '구군' in col:
-                column_mapping['시군구'] = col
-            elif '읍면동' in col or 'dong' in col_lower or '동' in col:
-                column_mapping['읍면동'] = col
-        
-        # 필수 컬럼 확인
-        required_cols = ['법정동코드', '시도', '시군구', '읍면동']
-        missing_cols = [col for col in required_cols if col not in column_mapping]
-        
-        if missing_cols:
-            return "", False, f"❌ CSV 파일에 필요한 컬럼이 없습니다: {missing_cols}. 현재 컬럼: {columns}"
-        
-        # 컬럼명 매핑 적용
-        if column_mapping:
-            law_df = law_df.rename(columns={v: k for k, v in column_mapping.items()})
-        
-        # 공백 제거 및 정규화
-        for col in ['시도', '시군구', '읍면동']:
-            if col in law_df.columns:
-                law_df[col] = law_df[col].astype(str).str.strip()
+        index = get_legal_code_index("법정동코드.csv", os.path.getmtime("법정동코드.csv"))
         
         # 검색 실행
         sido_clean = sido.strip()
@@ -116,39 +265,26 @@ def search_legal_code(sido, sigungu, eupmyeondong):
         eupmyeondong_clean = eupmyeondong.strip()
         
         # 정확한 매칭
-        exact_match = law_df[
-            (law_df["시도"] == sido_clean) &
-            (law_df["시군구"] == sigungu_clean) &
-            (law_df["읍면동"] == eupmyeondong_clean)
-        ]
-        
-        if not exact_match.empty:
-            return exact_match.iloc[0]["법정동코드"], True, "✅ 법정동 코드를 찾았습니다!"
+        code = index.find_exact(sido_clean, sigungu_clean, eupmyeondong_clean)
+        if code:
+            return code, True, "✅ 법정동 코드를 찾았습니다!"
         
         # 부분 매칭
-        partial_match = law_df[
-            (law_df["시도"].str.contains(sido_clean, na=False)) &
-            (law_df["시군구"].str.contains(sigungu_clean, na=False)) &
-            (law_df["읍면동"].str.contains(eupmyeondong_clean, na=False))
-        ]
-        
-        if not partial_match.empty:
-            return partial_match.iloc[0]["법정동코드"], True, "✅ 부분 일치로 법정동 코드를 찾았습니다!"
+        code = index.find_partial(sido_clean, sigungu_clean, eupmyeondong_clean)
+        if code:
+            return code, True, "✅ 부분 일치로 법정동 코드를 찾았습니다!"
         
         # 시도, 시군구만 매칭하여 사용 가능한 동 표시
-        area_match = law_df[
-            (law_df["시도"].str.contains(sido_clean, na=False)) &
-            (law_df["시군구"].str.contains(sigungu_clean, na=False))
-        ]
-        
-        if not area_match.empty:
-            available_dongs = area_match["읍면동"].unique()[:10]
+        available_dongs = index.dongs_in_area(sido_clean, sigungu_clean)
+        if available_dongs:
             return "", False, f"❗ '{eupmyeondong_clean}'을 찾을 수 없습니다. 사용 가능한 동: {', '.join(available_dongs)}"
         else:
             return "", False, f"❗ '{sido_clean} {sigungu_clean}'를 찾을 수 없습니다."
                 
     except FileNotFoundError:
         return "", False, "❌ '법정동코드.csv' 파일이 없습니다."
+    except ValueError as e:
+        return "", False, f"❌ {str(e)}"
     except Exception as e:
         logger.error(f"법정동 코드 검색 오류: {e}")
         return "", False, f"❌ 오류가 발생했습니다: {str(e)}"
@@ -171,22 +307,11 @@ st.subheader("2️⃣ 검색 조건 설정")
 col4, col5 = st.columns(2)
 with col4:
     # 올바른 네이버 부동산 매물 유형 코드 사용
-    property_types = {
-        "APT": "아파트",
-        "OPST": "오피스텔", 
-        "VL": "빌라/연립/다세대",
-        "ABYG": "아파트분양권",
-        "OBYG": "오피스텔분양권",
-        "SG": "상가",
-        "SMS": "사무실",
-        "GJCG": "공장/창고",
-        "TJ": "토지",
-        "JGC": "재개발/재건축"
-    }
+    property_types = PROPERTY_TYPES
     
     rletTpCd = st.selectbox("매물 유형", options=list(property_types.keys()), format_func=lambda x: property_types[x])
 with col5:
-    tradTpCd = st.selectbox("거래 유형", options=["A1", "B1", "B2"], format_func=lambda x: {"A1": "매매", "B1": "전세", "B2": "월세"}[x])
+    tradTpCd = st.selectbox("거래 유형", options=["A1", "B1", "B2"], format_func=lambda x: TRADE_TYPES[x])
 
 # 면적 조건 설정
 st.subheader("📐 면적 조건 (선택사항)")
@@ -210,358 +335,104 @@ with col9:
 
 # 추가 검색 옵션
 st.subheader("⚙️ 고급 설정 (선택사항)")
+pacing_mode = st.radio(
+    "요청 간격 조절",
+    options=["고정", "자동 (AIMD)"],
+    horizontal=True,
+    help="자동: 응답이 정상이면 초당 요청 수를 조금씩 늘리고, 429/5xx·지연·Retry-After가 오면 크게 줄입니다."
+)
+adaptive_pacing = pacing_mode != "고정"
 col10, col11 = st.columns(2)
 with col10:
-    max_pages = st.slider("최대 페이지 수", min_value=1, max_value=10, value=3)
+    max_pages = st.slider("최대 페이지 수", min_value=1, max_value=10, value=3,
+                          help="클러스터 기반 검색 계획을 쓰면 클러스터 매물 수만큼 페이지를 요청하고, 계획 이후 늘어난 매물은 이 수만큼 더 요청합니다.")
 with col11:
-    delay_time = st.slider("요청 간격 (초)", min_value=0.1, max_value=2.0, value=0.5, step=0.1)
-
-def get_coordinates_from_legal_code(cortarNo):
-    """법정동 코드로부터 대략적인 좌표를 얻는 함수"""
-    # 주요 지역별 좌표 매핑 (더 정확한 주소 검색을 위해)
-    coord_mapping = {
-        # 서울 강남구
-        "1168010100": ("37.5009", "127.0374"),  # 역삼동
-        "1168010200": ("37.5139", "127.0379"),  # 논현동  
-        "1168010300": ("37.5271", "127.0276"),  # 압구정동
-        "1168010400": ("37.5175", "127.0203"),  # 신사동
-        "1168010500": ("37.5197", "127.0486"),  # 청담동
-        "1168010600": ("37.5089", "127.0637"),  # 삼성동
-        "1168010700": ("37.4946", "127.0619"),  # 대치동
-        "1168010800": ("37.4782", "127.0761"),  # 개포동
-        
-        # 서울 서초구  
-        "1165010100": ("37.4833", "127.0327"),  # 서초동
-        "1165010200": ("37.5229", "127.0114"),  # 잠원동
-        "1165010300": ("37.5035", "127.0070"),  # 반포동
-        "1165010400": ("37.4817", "126.9965"),  # 방배동
-        "1165010500": ("37.4845", "127.0371"),  # 양재동
-        
-        # 서울 종로구
-        "1111013100": ("37.5701", "126.9835"),  # 종로1가
-        "1111013200": ("37.5658", "126.9859"),  # 종로2가
-        "1111013300": ("37.5700", "126.9910"),  # 종로3가
-    }
-    
-    # 법정동 코드에 해당하는 좌표가 있으면 사용, 없으면 기본값
-    if cortarNo in coord_mapping:
-        return coord_mapping[cortarNo]
-    else:
-        # 기본 좌표 (서울 시청 기준)
-        return ("37.5665", "126.9780")
+    delay_time = st.slider("요청 간격 (초)", min_value=0.1, max_value=2.0, value=0.5, step=0.1, disabled=adaptive_pacing)
+if adaptive_pacing:
+    min_rps, max_rps = st.slider("초당 요청 수 범위 (자동 조절)", min_value=0.5, max_value=20.0, value=(0.5, 5.0), step=0.5)
 
-def scrape_property_details(atclNo, headers):
-    """매물 상세 정보를 스크래핑하는 함수"""
-    try:
-        detail_url = f"https://m.land.naver.com/article/info/{atclNo}"
-        response = requests.get(detail_url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        zoning = purpose = management_fee = ""
-        detailed_address = ""
-        
-        # 상세 주소 정보 추출
-        address_selectors = [
-            "div.article_header",
-            "div.article_info",
-            "div.location_info", 
-            "div.addr_info",
-            "h1",
-            "h2",
-            ".article_title"
-        ]
-        
-        for selector in address_selectors:
-            elements = soup.select(selector)
-            for elem in elements:
-                text = elem.get_text(strip=True)
-                if text and any(keyword in text for keyword in ["동", "로", "길", "가", "번지", "번지"]):
-                    if len(text) > len(detailed_address) and len(text) < 100:  # 너무 긴 텍스트 제외
-                        detailed_address = text
-        
-        # 다양한 셀렉터로 정보 추출 시도
-        detail_selectors = [
-            "div.detail_box",
-            "div.info_detail",
-            "div.article_detail",
-            "div.detail_info",
-            "div.item_detail"
-        ]
-        
-        detail_boxes = []
-        for selector in detail_selectors:
-            boxes = soup.find_all("div", class_=selector.split('.')[1] if '.' in selector else selector)
-            if boxes:
-                detail_boxes.extend(boxes)
-        
-        # 추가로 모든 div 태그에서 키워드 검색
-        if not detail_boxes:
-            all_divs = soup.find_all("div")
-            detail_boxes = [div for div in all_divs if div.get_text() and any(keyword in div.get_text() for keyword in ["용도지역", "건물용도", "관리비"])]
-        
-        for box in detail_boxes:
-            text = box.get_text(strip=True, separator="\n")
-            
-            # 용도지역 추출
-            if "용도지역" in text and not zoning:
-                try:
-                    lines = text.split("\n")
-                    for i, line in enumerate(lines):
-                        if "용도지역" in line and i + 1 < len(lines):
-                            zoning = lines[i + 1].strip()
-                            break
-                except (IndexError, AttributeError):
-                    pass
-            
-            # 건물용도 추출  
-            if "건물용도" in text and not purpose:
-                try:
-                    lines = text.split("\n")
-                    for i, line in enumerate(lines):
-                        if "건물용도" in line and i + 1 < len(lines):
-                            purpose = lines[i + 1].strip()
-                            break
-                except (IndexError, AttributeError):
-                    pass
-            
-            # 관리비 추출
-            if "관리비" in text and not management_fee:
-                try:
-                    lines = text.split("\n")
-                    for i, line in enumerate(lines):
-                        if "관리비" in line and i + 1 < len(lines):
-                            management_fee = lines[i + 1].strip()
-                            break
-                except (IndexError, AttributeError):
-                    pass
-        
-        # 공장/창고의 경우 특별 처리
-        if not purpose:
-            # 제목이나 설명에서 용도 추출 시도
-            title_elem = soup.find("h1") or soup.find("title")
-            if title_elem:
-                title_text = title_elem.get_text()
-                if any(keyword in title_text for keyword in ["공장", "창고", "물류", "제조", "생산"]):
-                    purpose = "공장/창고"
-                    
-        return zoning, purpose, management_fee, detailed_address
-        
-    except requests.RequestException as e:
-        logger.error(f"매물 상세 정보 요청 오류 (ID: {atclNo}): {e}")
-        return "", "", "", ""
-    except Exception as e:
-        logger.error(f"매물 상세 정보 파싱 오류 (ID: {atclNo}): {e}")
-        return "", "", "", ""
+cluster_first = st.checkbox("클러스터 기반 검색 계획 (매물 수만큼만 페이지 요청)", value=True,
+                            help="타일마다 클러스터별 매물 수를 먼저 조회해 매물이 있는 클러스터만, 필요한 페이지 수만큼 요청합니다.")
 
-def filter_by_conditions(results, area_filter_enabled, min_area, max_area, price_filter_enabled, min_price, max_price):
-    """수집된 데이터를 조건에 따라 필터링하는 함수"""
-    if not results:
-        return results
-    
-    filtered_results = []
-    
-    for result in results:
-        # 면적 필터링
-        if area_filter_enabled:
-            area_str = result.get("전용면적(㎡)", "") or result.get("임대면적(㎡)", "")
-            if area_str:
-                try:
-                    # 숫자만 추출 (예: "85.5㎡" -> 85.5)
-                    area_match = re.search(r'[\d,]+\.?\d*', str(area_str).replace(',', ''))
-                    if area_match:
-                        area = float(area_match.group())
-                        if not (min_area <= area <= max_area):
-                            continue
-                    else:
-                        continue  # 면적 정보가 없으면 제외
-                except (ValueError, TypeError):
-                    continue  # 면적 파싱 실패시 제외
-        
-        # 가격 필터링  
-        if price_filter_enabled:
-            price_str = result.get("보증금/매매가", "")
-            if price_str:
-                try:
-                    # 숫자만 추출하고 만원 단위로 변환
-                    # 억, 만원 단위 처리
-                    price_text = str(price_str).replace(',', '')
-                    
-                    # 억원 처리
-                    if '억' in price_text:
-                        eok_match = re.search(r'(\d+(?:\.\d+)?)억', price_text)
-                        man_match = re.search(r'(\d+(?:\.\d+)?)만', price_text)
-                        
-                        eok_value = float(eok_match.group(1)) * 10000 if eok_match else 0
-                        man_value = float(man_match.group(1)) if man_match else 0
-                        price = eok_value + man_value
-                    # 만원만 있는 경우
-                    elif '만' in price_text:
-                        man_match = re.search(r'(\d+(?:\.\d+)?)만', price_text)
-                        price = float(man_match.group(1)) if man_match else 0
-                    # 숫자만 있는 경우 (만원 단위로 가정)
-                    else:
-                        num_match = re.search(r'(\d+(?:\.\d+)?)', price_text)
-                        price = float(num_match.group(1)) if num_match else 0
-                    
-                    if not (min_price <= price <= max_price):
-                        continue
-                except (ValueError, TypeError, AttributeError):
-                    continue  # 가격 파싱 실패시 제외
-        
-        filtered_results.append(result)
-    
-    return filtered_results
-
-def search_properties(cortarNo, rletTpCd, tradTpCd, max_pages, delay_time, sido="", sigungu="", eupmyeondong=""):
-    """매물을 검색하는 함수"""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "application/json, text/plain, */*",
-        "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
-        "Referer": "https://m.land.naver.com/",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive",
-        "Cache-Control": "no-cache"
-    }
-    
-    # 법정동 코드에 따른 좌표 설정
-    lat, lon = get_coordinates_from_legal_code(cortarNo)
-    z = "15"
-    
-    # 검색 범위 확장 (더 넓은 범위에서 검색)
-    range_offset = 0.02  # 범위를 더 넓게 설정
-    btm, top = float(lat) - range_offset, float(lat) + range_offset
-    lft, rgt = float(lon) - range_offset, float(lon) + range_offset
-    
-    all_results = []
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
+concurrent_mode = st.checkbox("동시 수집 모드 (상세 정보 병렬 수집)", value=False)
+col_workers, col_rps = st.columns(2)
+with col_workers:
+    max_workers = st.slider("동시 작업 수", min_value=1, max_value=16, value=4, disabled=not concurrent_mode)
+with col_rps:
+    requests_per_second = st.slider("초당 최대 요청 수", min_value=0.5, max_value=10.0, value=2.0, step=0.5, disabled=not concurrent_mode or adaptive_pacing)
+
+col_cache1, col_cache2, col_cache3 = st.columns(3)
+with col_cache1:
+    bypass_cache = st.checkbox("상세 정보 캐시 사용 안 함", value=False)
+with col_cache2:
+    cache_ttl_hours = st.number_input("캐시 유효 시간 (시간)", min_value=1, max_value=720, value=24, step=1, disabled=bypass_cache)
+with col_cache3:
+    cache_max_entries = st.number_input("캐시 최대 항목 수", min_value=1000, max_value=1000000, value=50000, step=1000, disabled=bypass_cache)
+
+@st.cache_resource(max_entries=8)
+def get_detail_cache(ttl_seconds, max_entries):
+    """세션/재실행 간 공유되는 상세 정보 캐시
+
+    공유 객체의 설정을 세션마다 바꾸면 다른 세션에도 적용되므로 (유효 시간, 최대 항목 수)별로 따로 만든다.
+    모두 같은 SQLite 파일을 쓴다.
+    """
+    return DetailCache("detail_cache.sqlite3", ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+detail_cache = get_detail_cache(cache_ttl_hours * 3600, cache_max_entries)
+
+incremental_mode = st.checkbox("증분 수집 (새 매물과 가격/면적/층이 바뀐 매물만 상세 정보 수집)", value=False)
+group_duplicates = st.checkbox("중복 매물 묶기 (건물명·층·면적·가격·방향이 같은 매물은 상세 정보를 한 번만 수집)", value=True,
+                               help="여러 중개사가 올린 같은 매물을 한 묶음으로 보고, 결과에 묶음 ID(중복그룹)와 매물 수(중복수)를 표시합니다.")
+
+@st.cache_resource
+def get_listing_store():
+    """세션/재실행 간 공유되는 수집 매물 저장소"""
+    return ListingStore("listing_store.sqlite3")
+
+col_lazy1, col_lazy2 = st.columns(2)
+with col_lazy1:
+    lazy_mode = st.checkbox("목록 먼저 표시 (상세 정보는 백그라운드에서 채움)", value=False)
+with col_lazy2:
+    auto_enrich = st.checkbox("상세 정보 자동으로 모두 채우기", value=True, disabled=not lazy_mode,
+                              help="끄면 결과 표에서 선택한 매물만 상세 정보를 수집합니다.")
+
+resume_mode = st.checkbox("중단된 수집 이어받기 (페이지마다 진행 상황을 저장해 오류/새로고침 후 같은 조건으로 다시 검색하면 이어서 수집)", value=True)
+
+@st.cache_resource
+def get_crawl_checkpoint():
+    """세션/재실행 간 공유되는 수집 체크포인트"""
+    return CrawlCheckpoint("crawl_checkpoint.sqlite3")
+
+if resume_mode:
+    pending_jobs = get_crawl_checkpoint().pending()
+    if pending_jobs:
+        st.caption("⏯️ 이어받을 수 있는 수집: " + ", ".join(
+            f"{params['sigungu']} {params['eupmyeondong']} {PROPERTY_TYPES.get(params['rletTpCd'], params['rletTpCd'])} "
+            f"{TRADE_TYPES.get(params['tradTpCd'], params['tradTpCd'])} ({page_count}페이지 · {record_count}건)"
+            for _, params, page_count, record_count, _ in pending_jobs[:3]
+        ))
+
+save_history = st.checkbox("가격 이력 저장 (수집할 때마다 가격이 바뀐 매물만 스냅샷으로 기록)", value=True)
+
+@st.cache_resource
+def get_price_history():
+    """세션/재실행 간 공유되는 가격 이력 저장소"""
+    return PriceHistory("price_history.sqlite3")
+
+# 분석용 파티션 Parquet 데이터셋 경로 (pyarrow가 있을 때만)
+DATASET_ROOT = "crawl_dataset"
+save_dataset = PARQUET_AVAILABLE and st.checkbox(
+    f"분석용 데이터셋에 추가 저장 ({DATASET_ROOT}/, 법정동코드·매물유형·수집일별 Parquet)", value=False,
+    help="목록 먼저 표시 모드에서는 저장 시점에 비어 있는 상세 정보는 빈 값으로 저장됩니다."
+)
+
+def get_region_extent(cortarNo):
+    """법정동 코드로부터 중심 좌표, 검색 범위와 그 정밀도를 얻는 함수"""
     try:
-        for page in range(1, max_pages + 1):
-            status_text.text(f"페이지 {page}/{max_pages} 검색 중...")
-            progress_bar.progress(page / max_pages)
-            
-            list_url = (
-                f"https://m.land.naver.com/cluster/ajax/articleList?"
-                f"itemId={cortarNo}&rletTpCd={rletTpCd}&tradTpCd={tradTpCd}&"
-                f"z={z}&lat={lat}&lon={lon}&btm={btm}&lft={lft}&top={top}&rgt={rgt}&page={page}"
-            )
-            
-            response = requests.get(list_url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            items = data.get("body", [])
-            
-            if not items:
-                status_text.text(f"페이지 {page}에서 더 이상 매물이 없습니다.")
-                break
-            
-            for i, item in enumerate(items):
-                atclNo = item.get("atclNo")
-                if not atclNo:
-                    continue
-                    
-                status_text.text(f"페이지 {page}/{max_pages} - 매물 {i+1}/{len(items)} 상세정보 수집 중...")
-                
-                # 면적 정보 개선 - 다양한 형식 처리
-                area_info = {
-                    "전용면적(㎡)": item.get("spc2", ""),
-                    "임대면적(㎡)": item.get("spc1", ""),
-                    "연면적(㎡)": item.get("spc3", ""),
-                    "대지면적(㎡)": item.get("spc4", ""),
-                }
-                
-                # 가격 정보 개선 - 형식 표준화
-                price_info = {
-                    "보증금/매매가": item.get("hanPrc", ""),
-                    "월세": item.get("rentPrc", ""),
-                    "전세금": item.get("rentPrc", "") if tradTpCd == "B1" else "",
-                }
-                
-                basic_info = {
-                    "매물번호": atclNo,
-                    "층수": item.get("flrInfo", ""),
-                    **area_info,
-                    **price_info,
-                    "건물명": item.get("bildNm", ""),
-                    "방향": item.get("direction", ""),
-                    "매물타입": property_types.get(rletTpCd, rletTpCd),
-                    "거래타입": {"A1": "매매", "B1": "전세", "B2": "월세"}.get(tradTpCd, tradTpCd),
-                }
-                
-                # 상세 정보 수집 (웹 스크래핑)
-                zoning, purpose, management_fee, scraped_address = scrape_property_details(atclNo, headers)
-                
-                # 주소 정보 개선 - 법정동 기반 주소 생성
-                # 세션에서 입력된 지역 정보 활용
-                base_address = ""
-                detailed_address = ""
-                
-                # 입력된 지역 정보로 기본 주소 생성
-                if sido and sigungu and eupmyeondong:
-                    base_address = f"{sido} {sigungu} {eupmyeondong}"
-                
-                # API에서 제공되는 주소 정보들
-                address_candidates = [
-                    item.get("atclNm", ""),
-                    item.get("addr1", ""),
-                    item.get("addr2", ""),
-                    item.get("bildNm", ""),
-                    scraped_address
-                ]
-                
-                # 상세 주소 선택 로직
-                for addr in address_candidates:
-                    if addr and addr.strip():
-                        addr_clean = addr.strip()
-                        # "일반상가", "상가", "오피스텔" 등의 일반적인 단어만 있는 경우 제외
-                        if not any(only_word in addr_clean for only_word in ["일반상가", "상가", "오피스텔", "아파트", "빌라"]):
-                            # 실제 주소가 포함된 경우 (도로명, 지번 등)
-                            if any(addr_keyword in addr_clean for addr_keyword in ["로", "길", "동", "가", "번지", "번", "-"]):
-                                detailed_address = addr_clean
-                                break
-                
-                # 주소가 여전히 없으면 기본 법정동 정보 사용
-                if not base_address:
-                    base_address = f"법정동코드: {cortarNo}"
-                
-                # 상세주소가 없으면 빈 문자열
-                if not detailed_address:
-                    detailed_address = ""
-                
-                result = {
-                    **basic_info,
-                    "주소지": base_address,
-                    "상세주소": detailed_address,
-                    "용도": purpose,
-                    "지역지구": zoning,
-                    "관리비": management_fee,
-                    "매물 링크": f"https://m.land.naver.com/article/info/{atclNo}",
-                    "수집일시": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                
-                all_results.append(result)
-                time.sleep(delay_time)
-            
-            # 페이지 간 딜레이
-            if page < max_pages:
-                time.sleep(delay_time * 2)
-                
-    except requests.RequestException as e:
-        st.error(f"❌ 네이버 접속 오류: {str(e)}")
-        logger.error(f"네이버 접속 오류: {e}")
-    except Exception as e:
-        st.error(f"❌ 예상치 못한 오류: {str(e)}")
-        logger.error(f"예상치 못한 오류: {e}")
-    finally:
-        progress_bar.empty()
-        status_text.empty()
-    
-    return all_results
+        geo = get_legal_code_index("법정동코드.csv", os.path.getmtime("법정동코드.csv")).geo
+    except (FileNotFoundError, ValueError):
+        geo = RegionGeoIndex(pd.DataFrame(columns=LEGAL_CODE_COLUMNS))
+    return geo.lookup(cortarNo)
 
 # --- 3. 검색 실행 버튼 ---
 st.subheader("3️⃣ 매물 검색 및 엑셀 저장")
@@ -571,7 +442,24 @@ if st.button("🚀 매물 검색 시작"):
         if sido and sigungu and eupmyeondong:
             st.info("🔄 데이터 수집 중... 잠시만 기다려주세요.")
             
-            results = search_properties(
+            _, _, extent, precision = get_region_extent(st.session_state.cortarNo)
+            tiles = search_tiles(extent, precision)
+            st.caption(f"🗺️ 검색 범위: {precision} 단위 · 타일 {len(tiles)}개 (줌 {tiles[0].z})")
+            if precision != "읍면동":
+                st.warning(f"⚠️ {eupmyeondong}의 좌표 범위가 없어 {precision} 범위를 타일 {len(tiles)}개로만 검색합니다. "
+                           f"매물 위치는 시군구 단위까지만 정확하므로 주소지는 '{sido} {sigungu}'로 기록됩니다.")
+            
+            # 이전 검색의 백그라운드 상세 수집 중단
+            if st.session_state.enricher is not None:
+                st.session_state.enricher.shutdown()
+                st.session_state.enricher = None
+            
+            progress_bar = st.progress(0)
+            status_text = st.empty()
+            crawl_stats = {}
+            run_metrics = RunMetrics()
+            pacer = AdaptivePacer(min_rps, max_rps) if adaptive_pacing else None
+            pages = iter_property_pages(
                 st.session_state.cortarNo, 
                 rletTpCd, 
                 tradTpCd, 
@@ -579,32 +467,105 @@ if st.button("🚀 매물 검색 시작"):
                 delay_time,
                 sido,
                 sigungu, 
-                eupmyeondong
+                eupmyeondong,
+                concurrent_mode=concurrent_mode,
+                max_workers=max_workers,
+                requests_per_second=requests_per_second,
+                detail_cache=detail_cache,
+                bypass_cache=bypass_cache,
+                listing_store=get_listing_store() if incremental_mode else None,
+                area_range=(min_area, max_area) if area_filter_enabled else None,
+                price_range=(min_price, max_price) if price_filter_enabled else None,
+                extent=extent,
+                extent_precision=precision,
+                stats=crawl_stats,
+                metrics=run_metrics,
+                checkpoint=get_crawl_checkpoint() if resume_mode else None,
+                pacer=pacer,
+                lazy_details=lazy_mode,
+                response_cache=get_response_cache(),
+                cluster_first=cluster_first,
+                group_duplicates=group_duplicates,
+                on_status=status_text.text,
+                on_progress=progress_bar.progress,
+                on_error=lambda message: st.error(f"❌ {message}")
             )
             
-            if results:
-                # 조건 필터링 적용
-                if area_filter_enabled or price_filter_enabled:
-                    original_count = len(results)
-                    results = filter_by_conditions(
-                        results, 
-                        area_filter_enabled, min_area, max_area,
-                        price_filter_enabled, min_price, max_price
-                    )
-                    filtered_count = len(results)
-                    
-                    if filtered_count < original_count:
-                        st.info(f"📊 필터링 결과: {original_count}개 중 {filtered_count}개 매물이 조건에 맞습니다.")
+            # 페이지 단위로 도착하는 레코드를 미리보기에 바로 반영
+            # (면적/가격 조건은 상세 수집 전에 목록 단계에서 적용됨)
+            # 레코드 dict를 그대로 들고 있지 않고 컬럼별 배열로 모음 (미리보기용 처음 10개만 유지)
+            results = RecordColumns()
+            first_records = []
+            preview_caption = st.empty()
+            preview_table = st.empty()
+            for page_results in pages:
+                if not page_results:
+                    continue
+                results.append(page_results)
+                first_records.extend(page_results[:10 - len(first_records)])
+                preview_caption.caption(f"⏳ 지금까지 {len(results)}개 매물 수집 (최근 수집분 표시)")
+                preview_table.dataframe(pd.DataFrame(page_results[-10:]), use_container_width=True)
+            preview_caption.empty()
+            preview_table.empty()
+            progress_bar.empty()
+            status_text.empty()
+            
+            st.session_state.crawl_stats = crawl_stats
+            st.caption(f"🗄️ 상세 정보 캐시: 적중 {crawl_stats['hits']}건 / 미스 {crawl_stats['misses']}건 (저장된 항목 약 {len(detail_cache):,}개)")
+            if pacer is not None:
+                st.caption(f"🚦 자동 간격 조절: 최종 초당 {pacer.rate:.1f}건 (감속 {pacer.cuts}회)")
+            if crawl_stats["deferred"]:
+                st.caption(f"🧩 상세 정보 {crawl_stats['deferred']}건은 목록 표시 후 채웁니다.")
+            if crawl_stats["resumed_pages"]:
+                st.caption(f"⏯️ 이어받기: 이전에 중단된 수집에서 저장된 페이지 {crawl_stats['resumed_pages']}개 재사용")
+            if crawl_stats["failed_details"]:
+                st.warning(f"⚠️ 상세 정보 수집 실패 {crawl_stats['failed_details']}건{f' - {RETRY_HINT}' if resume_mode else ''}")
+            if crawl_stats["grouped"]:
+                st.caption(f"👥 중복 매물 묶기: {crawl_stats['grouped']}건은 같은 묶음 대표의 상세 정보를 복사해 요청 생략")
+            if incremental_mode:
+                st.caption(f"♻️ 증분 수집: 변경 없는 매물 {crawl_stats['unchanged']}건은 상세 요청 생략")
+            
+            original_count = len(results) + crawl_stats["filtered_out"]
+            if original_count:
+                # 조건 필터링 결과
+                if (area_filter_enabled or price_filter_enabled) and len(results) < original_count:
+                    st.info(f"📊 필터링 결과: {original_count}개 중 {len(results)}개 매물이 조건에 맞습니다.")
                 
                 if results:
-                    st.session_state.search_results = results
-                    df = pd.DataFrame(results)
+                    # 가격/면적을 숫자 컬럼으로 한 번만 변환해 두고 통계/정렬/내보내기에 재사용
+                    with run_metrics.stage("normalize"):
+                        search_df = normalize_results(results.to_frame(), copy=False)
+                    store_search_results(search_df)
+                    if lazy_mode:
+                        # 고정 간격 모드에서는 항목별 대기 시간과 같은 초당 요청 수로 제한
+                        st.session_state.enricher = DetailEnricher(
+                            detail_cache=detail_cache,
+                            bypass_cache=bypass_cache,
+                            max_workers=max_workers if concurrent_mode else 1,
+                            limiter=None if pacer is not None else RateLimiter(requests_per_second if concurrent_mode else 1 / delay_time),
+                            pacer=pacer,
+                            response_cache=get_response_cache(),
+                            listing_store=get_listing_store() if incremental_mode else None,
+                            groups=group_members(search_df),
+                        )
+                        pending = pending_detail_atclNos(search_df)
+                        st.session_state.enricher.watch(pending)
+                        if auto_enrich:
+                            st.session_state.enricher.submit(pending)
+                    if save_history:
+                        stored = get_price_history().append(st.session_state.search_df)
+                        st.caption(f"📈 가격 이력: {len(results)}건 중 새 매물/가격 변경 {stored}건 기록")
+                    if save_dataset:
+                        from crawl_dataset import CrawlDataset  # pyarrow 필요
+                        with run_metrics.stage("export_dataset"):
+                            written = CrawlDataset(DATASET_ROOT).append(search_df)
+                        st.caption(f"🗂️ 분석용 데이터셋: {written}건 추가 ({DATASET_ROOT}/)")
                     
                     st.success(f"🎉 총 {len(results)}개의 매물 정보를 수집했습니다!")
                     
                     # 미리보기
                     st.subheader("📊 수집된 데이터 미리보기")
-                    st.dataframe(df.head(10), use_container_width=True)
+                    st.dataframe(pd.DataFrame(first_records), use_container_width=True)
                     
                     if len(results) > 10:
                         st.info(f"처음 10개만 표시됩니다. 전체 {len(results)}개 데이터는 엑셀 파일에서 확인하세요.")
@@ -619,84 +580,202 @@ if st.button("🚀 매물 검색 시작"):
                             filter_info.append(f"💰 가격: {min_price:,}만원 ~ {max_price:,}만원")
                         st.info(" | ".join(filter_info))
                     
-                    # 엑셀 파일 생성
                     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                     filename = f"{sigungu}_{eupmyeondong}_매물정보_{timestamp}.xlsx"
                     
-                    # 메모리에서 엑셀 파일 생성
-                    output = io.BytesIO()
-                    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                        df.to_excel(writer, index=False, sheet_name='매물정보')
-                        
-                        # 워크시트 스타일링
-                        worksheet = writer.sheets['매물정보']
-                        for column in worksheet.columns:
-                            max_length = 0
-                            column_letter = column[0].column_letter
-                            for cell in column:
-                                try:
-                                    if len(str(cell.value)) > max_length:
-                                        max_length = len(str(cell.value))
-                                except:
-                                    pass
-                            adjusted_width = min(max_length + 2, 50)
-                            worksheet.column_dimensions[column_letter].width = adjusted_width
-                    
-                    output.seek(0)
-                    
+                    # 정규화된 결과로 다운로드할 때 한 번만 생성 (결과 영역의 엑셀 내보내기와 같은 파일)
+                    result_cache = st.session_state.result_cache
                     st.download_button(
                         label="📥 엑셀 파일 다운로드",
-                        data=output.getvalue(),
+                        data=lambda: export_cached(EXCEL_EXPORT, search_df, result_cache, run_metrics),
                         file_name=filename,
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                        mime=EXCEL_MIME
                     )
                 else:
                     st.warning("⚠️ 설정한 조건에 맞는 매물이 없습니다. 조건을 완화해보세요.")
                     st.info("💡 **조건 완화 제안:**\n- 면적 범위를 넓혀보세요\n- 가격 범위를 조정해보세요\n- 다른 지역을 시도해보세요")
             else:
                 st.warning("⚠️ 검색 결과가 없습니다. 검색 조건을 변경해보세요.")
+            
+            # 실행 프로파일 저장 (모니터링용 JSON/Prometheus 텍스트 파일)
+            st.session_state.run_metrics = run_metrics.finish()
+            for path in RUN_PROFILE_PATHS:
+                try:
+                    run_metrics.write(path)
+                except OSError as e:
+                    logger.error(f"실행 프로파일 저장 오류 ({path}): {e}")
+            try:
+                get_response_cache().write(RESPONSE_CACHE_METRICS_PATH)
+            except OSError as e:
+                logger.error(f"응답 캐시 지표 저장 오류 ({RESPONSE_CACHE_METRICS_PATH}): {e}")
         else:
             st.warning("모든 지역 정보를 입력해주세요.")
     else:
         st.warning("❗ 법정동 코드를 먼저 검색해주세요.")
 
+# --- 공유 응답 캐시 (운영자용) ---
+with st.expander("🗃️ 공유 응답 캐시 (서버 전체)"):
+    cache_stats = get_response_cache().stats()
+    col_rate, col_entries, col_size, col_saved = st.columns(4)
+    with col_rate:
+        st.metric("적중률", f"{cache_stats['hit_rate']:.0%}")
+    with col_entries:
+        st.metric("보관 응답", f"{cache_stats['entries']:,}개")
+    with col_size:
+        st.metric("메모리", f"{cache_stats['bytes'] / 1024 / 1024:,.1f}MB / {cache_stats['max_bytes'] / 1024 / 1024:,.0f}MB")
+    with col_saved:
+        st.metric("생략한 요청", f"{cache_stats['hits'] + cache_stats['coalesced']:,}건")
+    st.caption(
+        f"적중 {cache_stats['hits']:,} · 진행 중 요청 합류 {cache_stats['coalesced']:,} · 미스 {cache_stats['misses']:,} · "
+        f"LRU 제거 {cache_stats['evictions']:,} · 만료 {cache_stats['expirations']:,} "
+        f"(지표 파일: {RESPONSE_CACHE_METRICS_PATH})"
+    )
+
+# --- 실행 프로파일 ---
+if st.session_state.run_metrics is not None:
+    with st.expander("⏱️ 실행 프로파일 (마지막 검색)"):
+        profile = st.session_state.run_metrics.to_dict()
+        col_wall, col_requests, col_bytes = st.columns(3)
+        with col_wall:
+            st.metric("전체 소요 시간", f"{profile['wall_seconds']:.1f}초")
+        with col_requests:
+            st.metric("요청 수", sum(profile["requests"].values()))
+        with col_bytes:
+            st.metric("수신 데이터", f"{sum(profile['bytes'].values()) / 1024:,.0f}KB")
+        
+        st.dataframe(pd.DataFrame(st.session_state.run_metrics.stage_rows()), use_container_width=True, hide_index=True)
+        st.caption("단계 시간은 스레드별 시간을 합산하므로 동시 수집 모드에서는 전체 소요 시간보다 클 수 있습니다.")
+        
+        request_rows = [
+            {
+                "요청": {"list": "목록", "detail": "상세", "cluster": "클러스터"}.get(kind, kind),
+                "요청 수": count,
+                "수신(KB)": round(profile["bytes"].get(kind, 0) / 1024, 1),
+                "HTTP 상태": ", ".join(f"{status}: {n}" for status, n in sorted(profile["http_status"].get(kind, {}).items())),
+                "재시도": profile["retries"].get(kind, 0),
+            }
+            for kind, count in profile["requests"].items()
+        ]
+        if request_rows:
+            st.dataframe(pd.DataFrame(request_rows), use_container_width=True, hide_index=True)
+        st.caption(f"📄 저장 위치: {', '.join(RUN_PROFILE_PATHS)}")
+
 # --- 기존 검색 결과 표시 ---
-if st.session_state.search_results:
+# 재실행마다 결과 크기에 비례하는 계산을 하지 않도록 통계/정렬/내보내기는 결과 집합별로 메모
+if not st.session_state.search_df.empty:
     st.subheader("📋 최근 검색 결과")
-    df = pd.DataFrame(st.session_state.search_results)
+    df = st.session_state.search_df
+    # 중복 묶음마다 대표 한 행만 보기/내보내기 (메모 이름을 따로 써서 전체 결과와 섞이지 않게 함)
+    memo_prefix = ""
+    group_count = result_cached("group_count", lambda: df[GROUP_COLUMN].nunique() if GROUP_COLUMN in df.columns else len(df))
+    if group_count < len(df):
+        if st.checkbox(f"중복 매물은 대표 1건만 표시/내보내기 ({len(df):,}행 → 묶음 {group_count:,}개)", value=False):
+            memo_prefix = "collapsed:"
+            df = result_cached("collapsed", lambda: collapse_duplicates(df))
+    summary = result_cached(f"{memo_prefix}summary", lambda: summarize_results(df))
     
     col12, col13 = st.columns(2)
     with col12:
-        st.metric("총 매물 수", len(df))
+        st.metric("총 매물 수", summary["count"])
     with col13:
-        if not df.empty and '수집일시' in df.columns:
-            st.metric("마지막 검색", df['수집일시'].iloc[0][:16])
+        if summary["last_search"]:
+            st.metric("마지막 검색", summary["last_search"])
+    
+    # 다른 형식으로 내보내기 (다운로드할 때 한 번만 생성)
+    col_format, col_download = st.columns(2)
+    with col_format:
+        export_format = st.selectbox("내보내기 형식", options=list(EXPORT_FORMATS.keys()))
+    with col_download:
+        extension, mime, _ = EXPORT_FORMATS[export_format]
+        result_cache = st.session_state.result_cache
+        last_metrics = st.session_state.run_metrics
+        st.write("")  # 공간 확보
+        st.download_button(
+            label=f"📥 {export_format} 다운로드",
+            data=lambda: export_cached(export_format, df, result_cache, last_metrics, memo_prefix),
+            file_name=f"매물정보_{result_cached('timestamp', lambda: datetime.now().strftime('%Y%m%d_%H%M%S'))}.{extension}",
+            mime=mime
+        )
+    
+    # 숫자 컬럼 기준 정렬
+    sort_options = {
+        "수집 순서": None,
+        "가격 낮은 순": ("가격(만원)", True),
+        "가격 높은 순": ("가격(만원)", False),
+        "전용면적 큰 순": ("전용면적(㎡)", False),
+        "전용면적 작은 순": ("전용면적(㎡)", True),
+    }
+    sort_choice = st.selectbox("정렬 기준", options=list(sort_options.keys()))
+    if sort_options[sort_choice] and sort_options[sort_choice][0] in df.columns:
+        sort_column, ascending = sort_options[sort_choice]
+        top_rows = result_cached(
+            f"{memo_prefix}sort:{sort_choice}",
+            lambda: df.sort_values(sort_column, ascending=ascending, na_position="last").head(10)
+        )
+        st.dataframe(top_rows, use_container_width=True)
     
     # 간단한 통계
-    if not df.empty:
-        st.subheader("📈 간단 통계")
-        col14, col15, col16 = st.columns(3)
-        
-        with col14:
-            if '전용면적(㎡)' in df.columns:
-                try:
-                    areas = pd.to_numeric(df['전용면적(㎡)'], errors='coerce').dropna()
-                    if not areas.empty:
-                        st.metric("평균 전용면적", f"{areas.mean():.1f}㎡")
-                except:
-                    pass
-        
-        with col15:
-            if '층수' in df.columns:
-                floor_counts = df['층수'].value_counts()
-                if not floor_counts.empty:
-                    st.metric("가장 많은 층수", floor_counts.index[0])
-        
-        with col16:
-            if '용도' in df.columns:
-                purpose_counts = df['용도'].value_counts()
-                if not purpose_counts.empty:
-                    st.metric("가장 많은 용도", purpose_counts.index[0])
+    st.subheader("📈 간단 통계")
+    col14, col15, col16 = st.columns(3)
+    
+    with col14:
+        if summary["mean_area"] is not None:
+            st.metric("평균 전용면적", f"{summary['mean_area']:.1f}㎡")
+    
+    with col15:
+        if summary["top_floor"] is not None:
+            st.metric("가장 많은 층수", summary["top_floor"])
+    
+    with col16:
+        if summary["top_purpose"] is not None:
+            st.metric("가장 많은 용도", summary["top_purpose"])
+    
+    # ㎡당 가격/백분위/건물·층별 집계 (결과 집합별로 한 번만 계산, 중복 매물은 묶음 대표만 집계)
+    aggregates = result_cached("analytics", lambda: aggregate_results(st.session_state.search_df))
+    show_aggregates(aggregates)
+
+# --- 누적 매물 통계 (가격 이력 저장소) ---
+@st.cache_resource(max_entries=4)
+def get_history_aggregates(version, since):
+    """가격 이력 저장소의 매물별 최신 가격 집계 (저장소 내용이 바뀔 때만 다시 계산)"""
+    return aggregate_results(get_price_history().listings(since))
+
+with st.expander("🌐 누적 매물 통계 (가격 이력 저장소 전체 지역)"):
+    history_days = st.number_input("최근 확인된 매물만 (일)", min_value=1, max_value=3650, value=30, step=1)
+    if st.checkbox("누적 통계 보기", value=False):
+        price_history = get_price_history()
+        history_aggregates = get_history_aggregates(price_history.version(), date.today() - timedelta(days=history_days))
+        if history_aggregates["rows"]:
+            show_aggregates(history_aggregates)
+        else:
+            st.caption("저장된 매물이 없습니다. 검색할 때 가격 이력 저장을 켜 두세요.")
+
+# --- 백그라운드 상세 정보 채우기 ---
+if not st.session_state.search_df.empty and st.session_state.enricher is not None:
+    # 진행 중인 요청이 없으면 주기적으로 다시 그리지 않음 (새로 요청하면 전체를 다시 실행해 켬)
+    st.session_state.enrich_polling = bool(st.session_state.enricher.pending)
+    st.fragment(run_every=2 if st.session_state.enrich_polling else None)(detail_enrichment_panel)()
+
+# --- 가격 이력 조회 ---
+with st.expander("📈 가격 이력 조회"):
+    price_history = get_price_history()
+    history_atclNo = st.text_input("매물번호", placeholder="예: 2412345678", key="history_atclNo")
+    if history_atclNo.strip():
+        listing_history = price_history.history(history_atclNo.strip())
+        if listing_history.empty:
+            st.caption("저장된 가격 이력이 없습니다.")
+        else:
+            st.line_chart(listing_history.set_index("날짜")["가격(만원)"])
+            st.dataframe(listing_history, use_container_width=True)
+    
+    drop_days = st.number_input("기준 시점 (며칠 전)", min_value=1, max_value=365, value=7, step=1)
+    if st.button("📉 가격 하락 매물 조회"):
+        drops = price_history.price_drops(since=date.today() - timedelta(days=drop_days))
+        if drops.empty:
+            st.caption(f"{drop_days}일 전보다 가격이 내린 매물이 없습니다.")
+        else:
+            st.write(f"{drop_days}일 전보다 가격이 내린 매물 {len(drops)}건")
+            st.dataframe(drops, use_container_width=True)
 
 # --- 도움말 및 주의사항 ---
 with st.expander("💡 사용법 및 주의사항"):
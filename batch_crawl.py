@@ -0,0 +1,290 @@
+"""여러 지역 × 매물 유형 × 거래 유형을 Streamlit 없이 한 번에 수집하는 배치 수집기
+
+실행 예:
+    python batch_crawl.py --sido 서울특별시 --sigungu 강남구 --types APT,OPST,SG --trades A1,B1,B2 \
+        --processes 4 --rps 2 --output 강남구.parquet
+    python batch_crawl.py --jobs jobs.csv --output 결과.csv
+    python batch_crawl.py --jobs jobs.csv --dataset crawl_dataset   # 분석용 파티션 Parquet 데이터셋에 추가
+
+작업은 프로세스 풀에서 나눠 실행하되, 모든 목록/상세 요청은 프로세스 간 공유되는
+ProcessRateLimiter 하나를 거치므로 전체 초당 요청 수는 --rps를 넘지 않는다.
+결과는 매물번호로 중복 제거한 하나의 데이터셋으로 저장한다.
+"""
+import os
+import csv
+import time
+import logging
+import argparse
+import multiprocessing
+from collections import namedtuple
+
+import pandas as pd
+
+from crawler import PROPERTY_TYPES, TRADE_TYPES, ProcessRateLimiter, iter_property_pages
+from crawl_checkpoint import CrawlCheckpoint
+from detail_cache import DetailCache
+from listing_store import ListingStore
+from export import EXPORT_FORMATS
+from legal_code import read_legal_code_csv, LEGAL_CODE_COLUMNS
+from listing_groups import collapse_duplicates
+from normalize import normalize_results
+from price_history import PriceHistory
+from record_columns import RecordColumns
+from region_geo import RegionGeoIndex
+from run_metrics import RunMetrics
+
+logger = logging.getLogger(__name__)
+
+CrawlJob = namedtuple("CrawlJob", ["cortarNo", "rletTpCd", "tradTpCd", "sido", "sigungu", "eupmyeondong"])
+
+# 작업자 프로세스 전역 상태 (_init_worker에서 설정)
+_worker = {}
+
+
+def build_jobs(law_df, sido, sigungu, property_types, trade_types, dongs=None):
+    """시도/시군구의 모든 읍면동(또는 dongs에 있는 것만) × 매물 유형 × 거래 유형 작업 목록"""
+    area = law_df[(law_df['시도'] == sido) & (law_df['시군구'] == sigungu)].drop_duplicates('읍면동')
+    if dongs:
+        area = area[area['읍면동'].isin(dongs)]
+    return [
+        CrawlJob(code, rletTpCd, tradTpCd, sido, sigungu, dong)
+        for code, _, _, dong in area[LEGAL_CODE_COLUMNS].itertuples(index=False)
+        for rletTpCd in property_types
+        for tradTpCd in trade_types
+    ]
+
+
+def read_jobs_csv(path, law_df=None):
+    """작업 목록 CSV (법정동코드, 매물유형, 거래유형 필수 / 시도, 시군구, 읍면동 선택)
+
+    지역명이 비어 있고 law_df가 주어지면 법정동코드로 채운다.
+    """
+    names = {}
+    if law_df is not None:
+        names = {code: (sido, sigungu, dong) for code, sido, sigungu, dong in law_df[LEGAL_CODE_COLUMNS].itertuples(index=False)}
+    jobs = []
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            code = row["법정동코드"].strip()
+            region = tuple(row.get(column, "").strip() for column in ("시도", "시군구", "읍면동"))
+            if not all(region):
+                region = names.get(code, region)
+            jobs.append(CrawlJob(code, row["매물유형"].strip(), row["거래유형"].strip(), *region))
+    return jobs
+
+
+def _init_worker(limiter, options):
+    """작업자 프로세스 초기화 - 공유 제한기와 프로세스별 캐시/저장소 연결"""
+    logging.basicConfig(level=logging.INFO)
+    _worker["limiter"] = limiter
+    _worker["options"] = options
+    _worker["detail_cache"] = DetailCache(options["cache_path"]) if options["cache_path"] else None
+    _worker["listing_store"] = ListingStore(options["store_path"]) if options["store_path"] else None
+    _worker["checkpoint"] = CrawlCheckpoint(options["checkpoint_path"]) if options["checkpoint_path"] else None
+
+
+def _run_job(args):
+    """작업 하나 실행 - (작업 번호, 레코드 리스트, 통계, 오류 메시지 리스트, 실행 지표 dict) 반환"""
+    job_no, job, (extent, precision) = args
+    options = _worker["options"]
+    stats = {}
+    metrics = RunMetrics()
+    errors = []
+    records = [
+        record
+        for page_results in iter_property_pages(
+            job.cortarNo, job.rletTpCd, job.tradTpCd, options["max_pages"], 0,
+            job.sido, job.sigungu, job.eupmyeondong,
+            concurrent_mode=options["threads"] > 1,
+            max_workers=options["threads"],
+            detail_cache=_worker["detail_cache"],
+            listing_store=_worker["listing_store"],
+            area_range=options["area_range"],
+            price_range=options["price_range"],
+            extent=extent,
+            extent_precision=precision,
+            limiter=_worker["limiter"],
+            stats=stats,
+            on_error=errors.append,
+            metrics=metrics,
+            checkpoint=_worker["checkpoint"],
+            cluster_first=options["cluster_first"],
+            group_duplicates=options["group_duplicates"],
+        )
+        for record in page_results
+    ]
+    return job_no, records, stats, errors, metrics.finish().to_dict()
+
+
+def run_batch(jobs, processes=4, requests_per_second=2.0, max_pages=10, threads=1,
+              cache_path="detail_cache.sqlite3", store_path=None, area_range=None, price_range=None,
+              law_df=None, on_job_done=None, metrics=None, checkpoint_path=None, cluster_first=True,
+              group_duplicates=True):
+    """작업 목록을 프로세스 풀에서 실행하고 하나로 합친 정규화 DataFrame 반환
+
+    requests_per_second는 모든 프로세스/스레드를 합친 전체 예산이다.
+    결과는 작업 순서대로 이어 붙인 뒤 매물번호로 중복 제거한다 (먼저 나온 작업 우선).
+    on_job_done(완료 수, 전체 수, 작업, 레코드 수, 통계, 오류)은 작업이 끝날 때마다 부모 프로세스에서 호출된다.
+    metrics(RunMetrics)가 주어지면 작업자들의 단계별 지표를 합산한다.
+    checkpoint_path가 주어지면 작업마다 페이지 단위 체크포인트를 남겨, 중단 후 같은 작업 목록으로
+    다시 실행하면 중단된 작업은 저장된 페이지를 재사용해 멈춘 곳부터 이어서 수집한다.
+    cluster_first가 켜져 있으면 작업마다 클러스터 매물 수로 요청할 페이지를 먼저 계획한다.
+    group_duplicates가 켜져 있으면 작업 안의 중복 매물은 묶음 대표만 상세 정보를 요청한다 (중복그룹/중복수 컬럼).
+    """
+    if law_df is None:
+        law_df = pd.DataFrame(columns=LEGAL_CODE_COLUMNS)
+    geo = RegionGeoIndex(law_df)
+    tasks = [(job_no, job, geo.lookup(job.cortarNo)[2:]) for job_no, job in enumerate(jobs)]
+    coarse = sum(precision != "읍면동" for _, _, (_, precision) in tasks)
+    if coarse:
+        logger.warning(f"읍면동 좌표 범위가 없는 작업 {coarse}개: 시군구 범위를 한 타일로만 검색하고 주소지는 시군구까지만 기록")
+    options = {
+        "max_pages": max_pages,
+        "threads": threads,
+        "cache_path": cache_path,
+        "store_path": store_path,
+        "checkpoint_path": checkpoint_path,
+        "cluster_first": cluster_first,
+        "group_duplicates": group_duplicates,
+        "area_range": area_range,
+        "price_range": price_range,
+    }
+
+    results = [None] * len(jobs)
+    limiter = ProcessRateLimiter(requests_per_second)
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(limiter, options)) as pool:
+        for done, (job_no, records, stats, errors, job_metrics) in enumerate(pool.imap_unordered(_run_job, tasks), start=1):
+            results[job_no] = records
+            if metrics is not None:
+                metrics.merge(job_metrics)
+            if on_job_done:
+                on_job_done(done, len(jobs), jobs[job_no], len(records), stats, errors)
+
+    # 작업 순서대로 컬럼 배열에 옮기면서 작업별 레코드 리스트는 바로 해제
+    records = RecordColumns()
+    for job_no in range(len(results)):
+        records.append(results[job_no])
+        results[job_no] = None
+    if not records:
+        return pd.DataFrame()
+    df = records.to_frame().drop_duplicates("매물번호", keep="first").reset_index(drop=True)
+    if metrics is None:
+        return normalize_results(df, copy=False)
+    with metrics.stage("normalize"):
+        return normalize_results(df, copy=False)
+
+
+def write_dataset(df, path):
+    """확장자(.xlsx/.csv/.parquet)에 맞는 형식으로 데이터셋 저장"""
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    for ext, _, convert in EXPORT_FORMATS.values():
+        if ext == extension:
+            with open(path, "wb") as f:
+                f.write(convert(df))
+            return
+    raise ValueError(f"지원하지 않는 저장 형식입니다: .{extension} (지원: {', '.join(ext for ext, _, _ in EXPORT_FORMATS.values())})")
+
+
+def _parse_range(text):
+    if not text:
+        return None
+    low, high = text.split(",")
+    return (int(low), int(high))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="네이버 부동산 매물 배치 수집기")
+    parser.add_argument("--jobs", help="작업 목록 CSV (법정동코드, 매물유형, 거래유형[, 시도, 시군구, 읍면동])")
+    parser.add_argument("--sido", help="시/도 (예: 서울특별시)")
+    parser.add_argument("--sigungu", help="시/군/구 (예: 강남구)")
+    parser.add_argument("--dongs", help="수집할 읍/면/동 (쉼표 구분, 기본: 시군구 전체)")
+    parser.add_argument("--types", default="APT", help=f"매물 유형 (쉼표 구분: {','.join(PROPERTY_TYPES)})")
+    parser.add_argument("--trades", default="A1", help=f"거래 유형 (쉼표 구분: {','.join(TRADE_TYPES)})")
+    parser.add_argument("--legal-code", default="법정동코드.csv", help="법정동코드 CSV 경로")
+    parser.add_argument("--processes", type=int, default=4, help="작업 프로세스 수")
+    parser.add_argument("--threads", type=int, default=1, help="프로세스당 상세 수집 스레드 수")
+    parser.add_argument("--rps", type=float, default=2.0, help="전체 초당 최대 요청 수 (모든 프로세스 합계)")
+    parser.add_argument("--max-pages", type=int, default=10, help="타일당 최대 페이지 수")
+    parser.add_argument("--area", help="면적 조건 ㎡ (최소,최대)")
+    parser.add_argument("--price", help="가격 조건 만원 (최소,최대)")
+    parser.add_argument("--cache", default="detail_cache.sqlite3", help="상세 정보 캐시 경로 (빈 값이면 사용 안 함)")
+    parser.add_argument("--checkpoint", default="crawl_checkpoint.sqlite3",
+                        help="중단된 작업을 이어받기 위한 체크포인트 경로 (빈 값이면 사용 안 함)")
+    parser.add_argument("--cluster-first", action=argparse.BooleanOptionalAction, default=True,
+                        help="클러스터 매물 수로 요청할 페이지를 먼저 계획 (--no-cluster-first면 타일마다 최대 페이지까지 요청)")
+    parser.add_argument("--group-duplicates", action=argparse.BooleanOptionalAction, default=True,
+                        help="건물명/층/면적/가격/방향이 같은 매물은 상세 정보를 한 번만 요청")
+    parser.add_argument("--collapse-duplicates", action="store_true",
+                        help="결과 파일에는 중복 묶음마다 대표 한 행만 저장 (중복수 컬럼에 묶인 매물 수)")
+    parser.add_argument("--incremental", metavar="STORE", help="증분 수집 저장소 경로")
+    parser.add_argument("--history", metavar="DB", help="가격 이력 저장소 경로 (결과를 오늘 스냅샷으로 추가)")
+    parser.add_argument("--metrics", action="append", default=[], metavar="PATH",
+                        help="실행 지표 저장 경로 (.json 또는 .prom, 여러 번 지정 가능)")
+    parser.add_argument("--output", help="결과 파일 (.xlsx/.csv/.parquet)")
+    parser.add_argument("--dataset", metavar="DIR",
+                        help="분석용 파티션 Parquet 데이터셋 경로 (법정동코드/매물유형/수집일별로 추가 저장, pyarrow 필요)")
+    args = parser.parse_args(argv)
+    if not args.output and not args.dataset:
+        parser.error("--output 또는 --dataset을 지정해주세요.")
+
+    logging.basicConfig(level=logging.INFO)
+    law_df = read_legal_code_csv(args.legal_code)
+    if args.jobs:
+        jobs = read_jobs_csv(args.jobs, law_df)
+    elif args.sido and args.sigungu:
+        dongs = [dong.strip() for dong in args.dongs.split(",")] if args.dongs else None
+        jobs = build_jobs(law_df, args.sido, args.sigungu, args.types.split(","), args.trades.split(","), dongs)
+    else:
+        parser.error("--jobs 또는 --sido/--sigungu를 지정해주세요.")
+    if not jobs:
+        parser.error("실행할 작업이 없습니다. 지역명을 확인해주세요.")
+
+    unknown = {job.rletTpCd for job in jobs} - set(PROPERTY_TYPES) | {job.tradTpCd for job in jobs} - set(TRADE_TYPES)
+    if unknown:
+        parser.error(f"알 수 없는 매물/거래 유형: {', '.join(sorted(unknown))}")
+
+    def report(done, total, job, count, stats, errors):
+        status = f"오류 {len(errors)}건" if errors else "완료"
+        logger.info(
+            f"[{done}/{total}] {job.sigungu} {job.eupmyeondong} {PROPERTY_TYPES[job.rletTpCd]} "
+            f"{TRADE_TYPES[job.tradTpCd]}: {count}건 {status} "
+            f"(캐시 적중 {stats.get('hits', 0)} / 미스 {stats.get('misses', 0)} / 중복 묶음 {stats.get('grouped', 0)})"
+        )
+
+    start = time.perf_counter()
+    metrics = RunMetrics()
+    df = run_batch(
+        jobs,
+        processes=args.processes,
+        requests_per_second=args.rps,
+        max_pages=args.max_pages,
+        threads=args.threads,
+        cache_path=args.cache or None,
+        store_path=args.incremental,
+        checkpoint_path=args.checkpoint or None,
+        cluster_first=args.cluster_first,
+        group_duplicates=args.group_duplicates,
+        area_range=_parse_range(args.area),
+        price_range=_parse_range(args.price),
+        law_df=law_df,
+        on_job_done=report,
+        metrics=metrics,
+    )
+    if args.output:
+        with metrics.stage("export_" + os.path.splitext(args.output)[1].lstrip(".").lower()):
+            write_dataset(collapse_duplicates(df) if args.collapse_duplicates else df, args.output)
+    if args.dataset:
+        from crawl_dataset import CrawlDataset  # pyarrow 필요
+        with metrics.stage("export_dataset"):
+            CrawlDataset(args.dataset).append(df)
+    if args.history and not df.empty:
+        PriceHistory(args.history).append(df)
+    metrics.finish()
+    for path in args.metrics:
+        metrics.write(path)
+    targets = ", ".join(path for path in (args.output, args.dataset) if path)
+    logger.info(f"작업 {len(jobs)}개, 매물 {len(df)}건 저장: {targets} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""집계 엔진 벤치마크: aggregate_results의 대용량 결과/여러 지역 가격 이력 집계 시간
+
+실행: python benchmarks/bench_analytics.py [행 수]
+
+- 검색 결과: 지역 10곳 × 건물 500개에 매매/전세/월세를 섞은 정규화 결과를 처음 집계하는 시간,
+  결과를 저장할 때 한 번 계산하는 결과 해시 시간, 재실행 때의 메모 조회 시간
+  (app.py store_search_results/result_cached와 같은 방식)
+- 가격 이력: 같은 결과를 PriceHistory에 넣은 뒤 version() + listings() + 집계 시간
+전세가는 같은 건물·면적 매매가의 60%로 만들었으므로 전세가율이 60%로 나오는지, ㎡당 가격 중앙값이
+직접 계산한 값과 같은지 확인한다.
+"""
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from analytics import aggregate_results  # noqa: E402
+from price_history import PriceHistory  # noqa: E402
+
+REGIONS = [f"서울특별시 구{i}구 동{i}동" for i in range(10)]
+JEONSE_RATIO = 0.6
+
+
+def make_results(rows, seed=0):
+    """정규화 결과와 같은 컬럼의 가짜 수집 결과 (중복 매물 10%)"""
+    rng = np.random.default_rng(seed)
+    building = rng.integers(0, 500, rows)
+    area = rng.choice([59.0, 84.0, 114.0], rows)
+    base = (building % 50 + 50) * area * 30
+    trade = rng.choice(np.array(["매매", "전세", "월세"], dtype=object), rows, p=[0.5, 0.3, 0.2])
+    price = np.where(trade == "매매", base, np.where(trade == "전세", base * JEONSE_RATIO, base * 0.1))
+    floor = rng.integers(1, 31, rows)
+    atclNos = np.array([str(2400000000 + i) for i in range(rows)], dtype=object)
+    duplicate = rng.random(rows) < 0.1
+    groups = atclNos.copy()
+    groups[1:][duplicate[1:]] = atclNos[:-1][duplicate[1:]]
+    return pd.DataFrame({
+        "매물번호": atclNos,
+        "층수": [f"{f}/30" for f in floor],
+        "전용면적(㎡)": area,
+        "가격(만원)": price,
+        "월세(만원)": np.where(trade == "월세", 100.0, np.nan),
+        "건물명": [f"래미안{b}차" for b in building],
+        "매물타입": "아파트",
+        "거래타입": trade,
+        "주소지": np.array(REGIONS, dtype=object)[building % len(REGIONS)],
+        "중복그룹": groups,
+        "수집일시": "2026-10-18 09:00:00",
+    })
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    df = make_results(rows)
+
+    key, hashing = timed(lambda: int(pd.util.hash_pandas_object(df, index=False).sum()))
+    memo = {}
+
+    def cached():
+        if "analytics" not in memo.setdefault(key, {}):
+            memo[key]["analytics"] = aggregate_results(df)
+        return memo[key]["analytics"]
+
+    aggregates, cold = timed(cached)
+    _, warm = timed(cached)
+    print(f"검색 결과 {rows:,}행 (집계 {aggregates['rows']:,}건, 건물 {len(aggregates['buildings']):,}개)")
+    print(f"  처음 집계 {cold:.3f}s, 재실행 메모 조회 {warm * 1e6:.1f}µs (결과 저장 시 해시 1회 {hashing:.3f}s)")
+
+    sale = df.drop_duplicates("중복그룹")
+    sale = sale[sale["거래타입"] == "매매"]
+    expected = float(np.median(sale["가격(만원)"] / sale["전용면적(㎡)"]))
+    assert np.isclose(aggregates["overview"].loc["매매", "중앙 ㎡당 가격(만원)"], expected), "㎡당 가격 중앙값이 다릅니다."
+    assert np.isclose(aggregates["jeonse_ratio"], JEONSE_RATIO * 100), "전세가율이 다릅니다."
+    assert list(aggregates["floors"].index.get_level_values("층 구분").unique()) == ["저층", "중층", "고층"]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        history = PriceHistory(os.path.join(workdir, "price_history.sqlite3"))
+        _, append = timed(lambda: history.append(df))
+        _, version_time = timed(history.version)
+        listings, load = timed(history.listings)
+        history_aggregates, history_cold = timed(lambda: aggregate_results(listings))
+        print(f"가격 이력 {len(listings):,}건 (지역 {listings['주소지'].nunique()}곳, 저장 {append:.2f}s)")
+        print(f"  version() {version_time:.3f}s, listings() {load:.3f}s, 집계 {history_cold:.3f}s")
+        assert np.isclose(history_aggregates["jeonse_ratio"], JEONSE_RATIO * 100)
+        assert history_aggregates["floors"].empty
+        history._conn.close()
+
+
+if __name__ == "__main__":
+    main()
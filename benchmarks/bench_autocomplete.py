@@ -0,0 +1,39 @@
+"""지역명 자동완성(RegionAutocomplete) 마이크로 벤치마크
+
+실행: python benchmarks/bench_autocomplete.py
+"""
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from legal_code import LegalCodeIndex, RegionAutocomplete  # noqa: E402
+
+QUERIES = ["ㅅㅅㄷ", "삼성", "강남 삼성", "삼ㅅ", "ㄱㄴ ㅅㅅ", "종로1", "분당", "수원 ㅇ", "동"]
+
+
+def main():
+    index = LegalCodeIndex.from_csv(os.path.join(ROOT, "법정동코드.csv"))
+
+    build_runs = 20
+    build_time = timeit.timeit(lambda: RegionAutocomplete(index.df), number=build_runs) / build_runs
+    print(f"인덱스 생성: {build_time * 1000:.2f} ms ({len(index.autocomplete.entries)}개 지역)")
+
+    print(f"{'검색어':<10} {'후보 수':>6} {'최초(µs)':>10} {'캐시(µs)':>10}")
+    runs = 2000
+    for query in QUERIES:
+        # 캐시되지 않은 검색 시간은 매번 새 캐시로 측정
+        autocomplete = index.autocomplete
+        def cold():
+            autocomplete._query_cache.clear()
+            return autocomplete.search(query)
+        cold_time = timeit.timeit(cold, number=runs) / runs
+        warm_time = timeit.timeit(lambda: autocomplete.search(query), number=runs) / runs
+        count = len(autocomplete.search(query))
+        print(f"{query:<10} {count:>6} {cold_time * 1e6:>10.1f} {warm_time * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""분석용 데이터셋 벤치마크: 엑셀 파일 vs 파티션 Parquet 데이터셋(CrawlDataset)의 쓰기/다시 읽기 시간
+
+실행: python benchmarks/bench_dataset.py [행 수]
+
+bench_export.make_records 레코드를 법정동 4곳 × 매물유형 2종 × 수집일 3일로 나눠 정규화한 뒤
+- 쓰기: dataframe_to_excel_bytes로 만든 xlsx 파일 저장 vs CrawlDataset.append
+- 전체 읽기: pd.read_excel vs CrawlDataset.read()
+- 일부 읽기: 한 법정동·한 매물유형의 가격/면적 컬럼만 (엑셀은 전체를 읽은 뒤 거름)
+를 측정하고, 데이터셋에서 다시 읽은 가격/면적이 원본과 같은지 확인한다.
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_export import make_records  # noqa: E402
+from crawl_dataset import CrawlDataset  # noqa: E402
+from export import dataframe_to_excel_bytes  # noqa: E402
+from normalize import normalize_results  # noqa: E402
+
+CORTAR_NOS = ["1168010500", "1168010100", "1165010800", "1171010100"]
+PROPERTY_NAMES = ["아파트", "오피스텔"]
+DATES = ["2026-10-16", "2026-10-17", "2026-10-18"]
+SELECTED_COLUMNS = ["매물번호", "가격(만원)", "전용면적(㎡)"]
+
+
+def make_results(rows):
+    """파티션이 고르게 나뉘는 정규화된 수집 결과"""
+    records = make_records(rows)
+    for i, record in enumerate(records):
+        record["법정동코드"] = CORTAR_NOS[i % len(CORTAR_NOS)]
+        record["매물타입"] = PROPERTY_NAMES[i // len(CORTAR_NOS) % len(PROPERTY_NAMES)]
+        record["수집일시"] = f"{DATES[i % len(DATES)]} 09:00:00"
+    return normalize_results(pd.DataFrame(records))
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    df = make_results(rows)
+    workdir = tempfile.mkdtemp(prefix="bench_dataset_")
+    excel_path = os.path.join(workdir, "매물정보.xlsx")
+    dataset = CrawlDataset(os.path.join(workdir, "dataset"))
+    try:
+        def write_excel():
+            with open(excel_path, "wb") as f:
+                f.write(dataframe_to_excel_bytes(df))
+
+        _, excel_write = timed(write_excel)
+        _, dataset_write = timed(lambda: dataset.append(df))
+        excel_df, excel_read = timed(lambda: pd.read_excel(excel_path))
+        dataset_df, dataset_read = timed(dataset.read)
+
+        def excel_subset():
+            full = pd.read_excel(excel_path, dtype={"법정동코드": str})
+            return full.loc[(full["법정동코드"] == CORTAR_NOS[0]) & (full["매물타입"] == PROPERTY_NAMES[0]), SELECTED_COLUMNS]
+
+        excel_part, excel_subset_read = timed(excel_subset)
+        dataset_part, dataset_subset_read = timed(
+            lambda: dataset.read(columns=SELECTED_COLUMNS, where={"cortarNo": CORTAR_NOS[0], "rletTpCd": "APT"})
+        )
+
+        excel_size = os.path.getsize(excel_path)
+        dataset_size = sum(os.path.getsize(os.path.join(path, name))
+                           for path, _, names in os.walk(dataset.root) for name in names)
+        partitions = sum(1 for _, _, names in os.walk(dataset.root) if names)
+
+        print(f"{rows:,}행 x {len(df.columns)}열, 데이터셋 파티션 {partitions}개")
+        print(f"{'경로':<20} {'쓰기(s)':>8} {'전체 읽기(s)':>12} {'일부 읽기(s)':>12} {'크기(KB)':>10}")
+        print(f"{'엑셀 (.xlsx)':<20} {excel_write:>8.2f} {excel_read:>12.2f} {excel_subset_read:>12.3f} {excel_size / 1e3:>10.0f}")
+        print(f"{'Parquet 데이터셋':<20} {dataset_write:>8.2f} {dataset_read:>12.2f} {dataset_subset_read:>12.3f} {dataset_size / 1e3:>10.0f}")
+        print(f"다시 읽기 {excel_read / dataset_read:.0f}배, 일부 읽기 {excel_subset_read / dataset_subset_read:.0f}배 빠름")
+
+        assert len(excel_df) == len(dataset_df) == rows
+        assert len(dataset_part) == len(excel_part)
+        # 데이터셋은 파티션 순서로 읽히므로 매물번호로 맞춰 비교
+        original = df.set_index("매물번호")[["가격(만원)", "전용면적(㎡)"]].sort_index()
+        reloaded = dataset_df.set_index("매물번호")[["가격(만원)", "전용면적(㎡)"]].sort_index()
+        assert np.allclose(original.to_numpy(), reloaded.to_numpy(), equal_nan=True), "다시 읽은 값이 다릅니다."
+        assert str(dataset_df["수집일시"].dtype).startswith("datetime64"), "수집일시가 timestamp가 아닙니다."
+        assert dataset_read < excel_read, "데이터셋 다시 읽기가 엑셀보다 느립니다."
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""상세 페이지 추출 벤치마크: BeautifulSoup(html.parser) vs lxml 단일 순회
+
+실행: python benchmarks/bench_detail_parser.py [반복 수]
+두 구현의 결과가 같은지는 tests/test_detail_parser.py에서 확인한다.
+실제 상세 페이지 크기에 맞춰 본문을 부풀린 페이지로도 측정한다.
+"""
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from detail_parser import LXML_AVAILABLE, extract_details_soup, extract_details_lxml  # noqa: E402
+
+FIXTURE_DIR = os.path.join(ROOT, "benchmarks", "fixtures", "detail")
+
+def load_fixtures():
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            fixtures[os.path.basename(path)] = f.read()
+    return fixtures
+
+
+def padded_page(html, filler_divs=500):
+    """상세 박스 앞뒤로 관련 없는 div/스크립트를 넣어 100KB 이상으로 만든 페이지"""
+    filler = "".join(
+        f'<div class="card"><span class="label">항목 {i}</span><a href="/item/{i}">설명 {i}</a></div>\n'
+        for i in range(filler_divs)
+    )
+    script = "<script>" + "var x = 1;" * 2000 + "</script>"
+    return html.replace("<body>", "<body>\n" + filler, 1).replace("</body>", script + filler + "</body>", 1)
+
+
+def measure(func, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            func(html)
+    elapsed = time.perf_counter() - start
+    return elapsed, repeat * len(pages) / elapsed
+
+
+def main():
+    if not LXML_AVAILABLE:
+        print("lxml이 설치되어 있지 않아 비교할 수 없습니다.")
+        return
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    fixtures = load_fixtures()
+    padded = {f"{name} (부풀림)": padded_page(html) for name, html in fixtures.items()}
+
+    for label, pages in (("픽스처 원본", list(fixtures.values())), ("100KB+ 페이지", list(padded.values()))):
+        size = sum(len(html.encode("utf-8")) for html in pages) / len(pages) / 1024
+        print(f"\n[{label}] 페이지 {len(pages)}개, 평균 {size:.1f}KB, 반복 {repeat}회")
+        soup_time, soup_rate = measure(extract_details_soup, pages, repeat)
+        lxml_time, lxml_rate = measure(extract_details_lxml, pages, repeat)
+        print(f"  BeautifulSoup: {soup_time:.2f}s ({soup_rate:,.0f} 페이지/초)")
+        print(f"  lxml 단일 순회: {lxml_time:.2f}s ({lxml_rate:,.0f} 페이지/초) - {soup_time / lxml_time:.1f}배")
+
+
+if __name__ == "__main__":
+    main()
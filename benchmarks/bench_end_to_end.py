@@ -0,0 +1,225 @@
+"""오프라인 수집 파이프라인 벤치마크 (로컬 모의 서버 사용)
+
+실행: python benchmarks/bench_end_to_end.py [--listings 200] [--latency-ms 30] [--error-rate 0] [--rate-429 0] [--capacity-rps 0]
+                                          [--save-baseline base.json | --baseline base.json]
+
+mock_naver.MockNaverServer를 띄우고 crawler.BASE_URL을 그 주소로 바꾼 뒤 다음 단계를 측정한다.
+- 수집: search_properties와 같은 경로(iter_property_pages)를 순차/동시 모드로 실행 - 매물/초, 페이지 지연 p50/p99
+  동시 모드는 고정 초당 요청 수(--rps)와 자동 간격 조절(AdaptivePacer, --max-rps까지)을 각각 측정하며,
+  --capacity-rps로 서버 측 요청 제한을 걸면 429 응답 수(throttled)도 함께 기록한다.
+  여러 타일(--tiles)로 나눈 검색은 타일마다 페이지를 넘기는 방식과 클러스터 기반 계획(cluster_first)을 비교하며,
+  목록/클러스터 요청 수(list_requests)를 함께 기록한다.
+  --duplicate-rate 비율로 같은 매물을 여러 번 올린 목록에서는 중복 매물 묶기(group_duplicates)를 끈 경우와 켠 경우의
+  상세 요청 수(detail_requests)와 묶음 수(groups)를 비교한다.
+- 상세: scrape_property_details 단건 호출 지연 p50/p99
+- 필터: filter_by_conditions (수집 결과를 반복해 늘린 레코드)
+- 내보내기: normalize_results + 엑셀 바이트 생성
+마지막에 최대 RSS를 함께 기록한다. --save-baseline으로 결과를 저장하고, --baseline으로 비교하면
+허용 범위(--tolerance)를 넘게 느려진 지표가 있을 때 종료 코드 1을 반환한다.
+"""
+import os
+import sys
+import json
+import math
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import crawler  # noqa: E402
+from crawler import HEADERS, AdaptivePacer, iter_property_pages, scrape_property_details, filter_by_conditions  # noqa: E402
+from export import dataframe_to_excel_bytes  # noqa: E402
+from normalize import normalize_results  # noqa: E402
+from region_geo import BASE_ZOOM, tile_span  # noqa: E402
+from mock_naver import MockNaverServer  # noqa: E402
+
+# 지표 이름 → 클수록 좋은지 여부 (기준 비교 방향)
+HIGHER_IS_BETTER = {
+    "listings_per_sec": True,
+    "p50_ms": False,
+    "p99_ms": False,
+    "rows_per_sec": True,
+    "seconds": False,
+    "peak_rss_mb": False,
+    "list_requests": False,
+    "detail_requests": False,
+    "groups": None,
+    # 정보용 (비교하지 않음)
+    "listings": None,
+    "aborted": None,
+    "throttled": None,
+    "final_rps": None,
+}
+
+
+def percentiles(latencies):
+    values = np.asarray(latencies) * 1000
+    return {"p50_ms": float(np.percentile(values, 50)), "p99_ms": float(np.percentile(values, 99))}
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # Linux는 KB, macOS는 바이트 단위
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+
+def tiled_extent(tiles):
+    """줌 15 타일 tiles개 정도로 나뉘는 정사각형 검색 범위 (btm, lft, top, rgt)"""
+    side = math.ceil(math.sqrt(tiles)) * tile_span(BASE_ZOOM)
+    return 37.5, 127.0, 37.5 + side, 127.0 + side
+
+
+def bench_crawl(server, listings, concurrent_mode, max_workers, requests_per_second=0, pacer=None,
+                max_tiles=1, cluster_first=False, group_duplicates=True):
+    """한 검색 조건을 끝까지 수집 - (레코드, 지표)"""
+    records = []
+    page_latencies = []
+    errors = []
+    throttled = server.counts["429"]
+    list_requests = server.counts["list"] + server.counts["cluster"]
+    detail_requests = server.counts["detail"]
+    start = last = time.perf_counter()
+    for page_results in iter_property_pages(
+        "1168010500", "APT", "A1", max_pages=listings // 20 + 1, delay_time=0,
+        concurrent_mode=concurrent_mode, max_workers=max_workers, requests_per_second=requests_per_second,
+        max_tiles=max_tiles, extent=tiled_extent(max_tiles) if max_tiles > 1 else None,
+        on_error=errors.append, pacer=pacer, cluster_first=cluster_first,
+        group_duplicates=group_duplicates,
+    ):
+        now = time.perf_counter()
+        page_latencies.append(now - last)
+        last = now
+        records.extend(page_results)
+    elapsed = time.perf_counter() - start
+    metrics = {"listings": len(records), "listings_per_sec": len(records) / elapsed, **percentiles(page_latencies),
+               "aborted": len(errors), "throttled": server.counts["429"] - throttled,
+               "list_requests": server.counts["list"] + server.counts["cluster"] - list_requests,
+               "detail_requests": server.counts["detail"] - detail_requests,
+               "groups": len({record["중복그룹"] for record in records})}
+    if pacer is not None:
+        metrics["final_rps"] = pacer.rate
+    return records, metrics
+
+
+def bench_detail(atclNos):
+    latencies = []
+    for atclNo in atclNos:
+        start = time.perf_counter()
+        scrape_property_details(atclNo, HEADERS)
+        latencies.append(time.perf_counter() - start)
+    return {"listings_per_sec": len(atclNos) / sum(latencies), **percentiles(latencies)}
+
+
+def bench_filter(records, rows):
+    results = (records * (rows // len(records) + 1))[:rows]
+    start = time.perf_counter()
+    filter_by_conditions(results, True, 30, 100, True, 10000, 200000)
+    elapsed = time.perf_counter() - start
+    return {"rows_per_sec": rows / elapsed, "seconds": elapsed}
+
+
+def bench_export(records, rows):
+    results = (records * (rows // len(records) + 1))[:rows]
+    start = time.perf_counter()
+    dataframe_to_excel_bytes(normalize_results(pd.DataFrame(results)))
+    elapsed = time.perf_counter() - start
+    return {"rows_per_sec": rows / elapsed, "seconds": elapsed}
+
+
+def compare(metrics, baseline, tolerance):
+    """기준 대비 변화 출력, 허용 범위를 넘게 나빠진 지표 수 반환"""
+    regressions = 0
+    print(f"\n기준 비교 (허용 범위 {tolerance:.0%})")
+    for stage, values in metrics.items():
+        for name, value in values.items():
+            base = baseline.get(stage, {}).get(name)
+            if base is None or value is None or not base or HIGHER_IS_BETTER[name] is None:
+                continue
+            change = value / base - 1
+            worse = -change if HIGHER_IS_BETTER[name] else change
+            flag = "⚠️ 악화" if worse > tolerance else ""
+            regressions += bool(flag)
+            print(f"  {stage:<12} {name:<18} {base:>12.2f} → {value:>12.2f} ({change:+.1%}) {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 수집 파이프라인 벤치마크")
+    parser.add_argument("--listings", type=int, default=200, help="검색 조건당 매물 수")
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--capacity-rps", type=float, default=0.0, help="모의 서버 초당 처리 한도 (0이면 제한 없음)")
+    parser.add_argument("--workers", type=int, default=8, help="동시 모드 작업 수")
+    parser.add_argument("--rps", type=float, default=0.0, help="고정 모드 동시 수집의 초당 요청 수 (0이면 제한 없음)")
+    parser.add_argument("--max-rps", type=float, default=200.0, help="자동 간격 조절의 최대 초당 요청 수")
+    parser.add_argument("--tiles", type=int, default=4, help="타일 분할 검색 비교 단계의 최대 타일 수")
+    parser.add_argument("--duplicate-rate", type=float, default=0.3, help="중복 매물 비교 단계에서 복제 매물 비율")
+    parser.add_argument("--rows", type=int, default=20000, help="필터/내보내기 단계 레코드 수")
+    parser.add_argument("--save-baseline", help="결과를 기준 파일(JSON)로 저장")
+    parser.add_argument("--baseline", help="비교할 기준 파일(JSON)")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="허용 악화 비율")
+    args = parser.parse_args()
+
+    server = MockNaverServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                             rate_429=args.rate_429, listings_per_query=args.listings,
+                             capacity_rps=args.capacity_rps).start()
+    crawler.BASE_URL = server.base_url
+    print(f"모의 서버 {server.base_url}: 매물 {args.listings}개, 지연 {args.latency_ms}±{args.jitter_ms}ms, "
+          f"오류 {args.error_rate:.0%}, 429 {args.rate_429:.0%}, 처리 한도 {args.capacity_rps or '없음'}")
+
+    metrics = {}
+    records, metrics["crawl_seq"] = bench_crawl(server, args.listings, False, 1)
+    _, metrics[f"crawl_conc{args.workers}"] = bench_crawl(server, args.listings, True, args.workers, args.rps)
+    _, metrics[f"crawl_aimd{args.workers}"] = bench_crawl(
+        server, args.listings, True, args.workers, pacer=AdaptivePacer(min_rps=1.0, max_rps=args.max_rps, start_rps=10.0, increase=5.0)
+    )
+    tiled_records, metrics[f"crawl_tiles{args.tiles}"] = bench_crawl(server, args.listings, True, args.workers,
+                                                                      max_tiles=args.tiles)
+    cluster_records, metrics[f"crawl_cluster{args.tiles}"] = bench_crawl(server, args.listings, True, args.workers,
+                                                                         max_tiles=args.tiles, cluster_first=True)
+    server.duplicate_rate = args.duplicate_rate
+    plain_records, metrics["crawl_dup_plain"] = bench_crawl(server, args.listings, True, args.workers,
+                                                            group_duplicates=False)
+    grouped_records, metrics["crawl_dup_grouped"] = bench_crawl(server, args.listings, True, args.workers)
+    server.duplicate_rate = 0.0
+    assert records, "수집 결과가 없습니다."
+    assert len(grouped_records) == len(plain_records), "중복 매물 묶기의 수집 매물 수가 다릅니다."
+    assert len(cluster_records) == len(tiled_records), "클러스터 기반 계획의 수집 매물 수가 다릅니다."
+    metrics["detail"] = bench_detail([record["매물번호"] for record in records[:100]])
+    metrics["filter"] = bench_filter(records, args.rows)
+    metrics["export"] = bench_export(records, args.rows)
+    metrics["process"] = {"peak_rss_mb": peak_rss_mb()}
+    server.shutdown()
+
+    print(f"\n요청 수: {server.counts}")
+    for stage, values in metrics.items():
+        print(f"[{stage}] " + ", ".join(f"{name}={value:,.2f}" for name, value in values.items() if value is not None))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(metrics, f, indent=2)
+        print(f"\n기준 저장: {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(metrics, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{regressions}개 지표가 허용 범위를 넘게 나빠졌습니다.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
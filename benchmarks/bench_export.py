@@ -0,0 +1,93 @@
+"""엑셀 내보내기 벤치마크: 기존 경로(pandas ExcelWriter + 셀 순회 열 너비) vs write-only 경로
+
+실행: python benchmarks/bench_export.py [행 수]
+"""
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from export import dataframe_to_excel_bytes, dataframe_to_csv_bytes, EXPORT_FORMATS  # noqa: E402
+
+
+def make_records(n):
+    """build_property_record 결과와 같은 모양의 가짜 레코드"""
+    return [
+        {
+            "매물번호": str(2400000000 + i),
+            "층수": f"{i % 25}/25",
+            "전용면적(㎡)": f"{59 + i % 60}.{i % 10}",
+            "임대면적(㎡)": f"{80 + i % 70}",
+            "연면적(㎡)": "",
+            "대지면적(㎡)": "",
+            "보증금/매매가": f"{i % 30 + 1}억 {i % 9000:,}",
+            "월세": "",
+            "전세금": "",
+            "건물명": f"래미안{i % 300}차",
+            "방향": ["남향", "동향", "서향", "북향"][i % 4],
+            "매물타입": "아파트",
+            "거래타입": "매매",
+            "주소지": "서울특별시 강남구 삼성동",
+            "법정동코드": "1168010500",
+            "상세주소": f"서울 강남구 삼성동 {i % 200}-{i % 30}",
+            "용도": "공동주택",
+            "지역지구": "제2종일반주거지역",
+            "관리비": f"{i % 40}만원",
+            "매물 링크": f"https://m.land.naver.com/article/info/{2400000000 + i}",
+            "중복그룹": str(2400000000 + i),
+            "수집일시": "2026-10-18 09:00:00",
+        }
+        for i in range(n)
+    ]
+
+
+def legacy_excel_bytes(df):
+    """기존 app.py 내보내기 경로"""
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='매물정보')
+        worksheet = writer.sheets['매물정보']
+        for column in worksheet.columns:
+            max_length = 0
+            column_letter = column[0].column_letter
+            for cell in column:
+                if len(str(cell.value)) > max_length:
+                    max_length = len(str(cell.value))
+            worksheet.column_dimensions[column_letter].width = min(max_length + 2, 50)
+    return output.getvalue()
+
+
+def measure(func, df):
+    """실행 시간과 (tracemalloc으로 따로 잰) 최대 메모리, 결과 크기"""
+    start = time.perf_counter()
+    data = func(df)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func(df)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(data)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    df = pd.DataFrame(make_records(rows))
+    print(f"{rows:,}행 x {len(df.columns)}열")
+    print(f"{'경로':<24} {'시간(s)':>8} {'최대 메모리(MB)':>16} {'크기(KB)':>10}")
+    paths = [("기존 (ExcelWriter)", legacy_excel_bytes), ("write-only xlsx", dataframe_to_excel_bytes),
+             ("CSV", dataframe_to_csv_bytes)]
+    if "Parquet (.parquet)" in EXPORT_FORMATS:
+        paths.append(("Parquet", EXPORT_FORMATS["Parquet (.parquet)"][2]))
+    for name, func in paths:
+        elapsed, peak, size = measure(func, df)
+        print(f"{name:<24} {elapsed:>8.2f} {peak / 1e6:>16.1f} {size / 1e3:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
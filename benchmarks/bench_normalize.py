@@ -0,0 +1,94 @@
+"""가격/면적 정규화 벤치마크: 기존 행 단위 re.search 필터 vs 벡터화 정규화
+
+실행: python benchmarks/bench_normalize.py [행 수]
+특이 형식("1억 2,500", "3.5억", "85.5㎡" 등)의 변환 결과는 tests/test_normalize.py에서 확인한다.
+"""
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from normalize import parse_price_series, parse_area_series, condition_mask, normalize_results  # noqa: E402
+
+def legacy_filter(results, min_area, max_area, min_price, max_price):
+    """기존 filter_by_conditions (행 단위 re.search)"""
+    filtered = []
+    for result in results:
+        area_str = result.get("전용면적(㎡)", "") or result.get("임대면적(㎡)", "")
+        if area_str:
+            area_match = re.search(r'[\d,]+\.?\d*', str(area_str).replace(',', ''))
+            if not area_match or not (min_area <= float(area_match.group()) <= max_area):
+                continue
+        price_str = result.get("보증금/매매가", "")
+        if price_str:
+            price_text = str(price_str).replace(',', '')
+            if '억' in price_text:
+                eok_match = re.search(r'(\d+(?:\.\d+)?)억', price_text)
+                man_match = re.search(r'(\d+(?:\.\d+)?)만', price_text)
+                price = (float(eok_match.group(1)) * 10000 if eok_match else 0) + (float(man_match.group(1)) if man_match else 0)
+            elif '만' in price_text:
+                man_match = re.search(r'(\d+(?:\.\d+)?)만', price_text)
+                price = float(man_match.group(1)) if man_match else 0
+            else:
+                num_match = re.search(r'(\d+(?:\.\d+)?)', price_text)
+                price = float(num_match.group(1)) if num_match else 0
+            if not (min_price <= price <= max_price):
+                continue
+        filtered.append(result)
+    return filtered
+
+
+def make_records(n):
+    prices = ["1억 2,500", "3.5억", "9,000", "12억", "5억 5,000", "2억"]
+    return [
+        {
+            "전용면적(㎡)": f"{40 + i % 120}.{i % 10}",
+            "임대면적(㎡)": f"{60 + i % 150}",
+            "보증금/매매가": prices[i % len(prices)],
+            "월세": str(i % 200) if i % 3 else "",
+        }
+        for i in range(n)
+    ]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    records = make_records(rows)
+    df = pd.DataFrame(records)
+    print(f"{rows:,}행")
+
+    legacy_time, legacy = timed(lambda: legacy_filter(records, 60, 120, 10000, 60000))
+    mask_time, mask = timed(lambda: condition_mask(
+        df["전용면적(㎡)"].where(df["전용면적(㎡)"] != "", df["임대면적(㎡)"]), df["보증금/매매가"],
+        True, 60, 120, True, 10000, 60000))
+    normalize_time, normalized = timed(lambda: normalize_results(df))
+    stats_time, _ = timed(lambda: normalized[(normalized["가격(만원)"].between(10000, 60000))
+                                             & (normalized["전용면적(㎡)"].between(60, 120))]["가격(만원)"].describe())
+
+    print(f"기존 행 단위 필터:        {legacy_time:.3f}s ({len(legacy):,}건 통과)")
+    print(f"벡터화 조건 마스크:        {mask_time:.3f}s ({int(mask.sum()):,}건 통과)")
+    print(f"정규화(숫자 컬럼 생성):    {normalize_time:.3f}s")
+    print(f"정규화 후 필터+통계:       {stats_time:.4f}s")
+
+    # 최악의 경우: 모든 값이 서로 다름
+    unique_prices = [f"{i // 10000}억 {i % 10000:,}" for i in range(rows)]
+    unique_areas = [f"{i / 100:.2f}㎡" for i in range(rows)]
+    unique_records = [{"전용면적(㎡)": a, "보증금/매매가": p} for a, p in zip(unique_areas, unique_prices)]
+    legacy_time, _ = timed(lambda: legacy_filter(unique_records, 60, 120, 10000, 60000))
+    mask_time, _ = timed(lambda: condition_mask(unique_areas, unique_prices, True, 60, 120, True, 10000, 60000))
+    print(f"(고유값만) 기존 / 벡터화:  {legacy_time:.3f}s / {mask_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
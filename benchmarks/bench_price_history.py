@@ -0,0 +1,79 @@
+"""가격 이력 저장소 벤치마크: 반복 수집 스냅샷 추가와 이력/하락 매물 조회
+
+실행: python benchmarks/bench_price_history.py [매물 수] [일 수] [일별 변경 비율]
+매일 같은 매물을 수집하고 그중 일부만 가격이 바뀌는 상황을 만들어 스냅샷을 쌓는다.
+변경분만 저장되는지, 이력/하락 조회 결과가 맞는지는 tests/test_price_history.py에서 확인한다.
+"""
+import os
+import sys
+import time
+import tempfile
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from price_history import PriceHistory  # noqa: E402
+
+
+def make_frame(atclNos, prices):
+    """normalize_results 결과와 같은 모양의 최소 DataFrame"""
+    return pd.DataFrame({
+        "매물번호": atclNos,
+        "매물타입": "아파트",
+        "거래타입": "매매",
+        "주소지": "서울특별시 강남구 삼성동",
+        "건물명": "래미안",
+        "전용면적(㎡)": 84.9,
+        "가격(만원)": prices,
+        "월세(만원)": np.nan,
+    })
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    change_rate = float(sys.argv[3]) if len(sys.argv) > 3 else 0.15
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.sqlite3")
+        history = PriceHistory(path)
+        rng = np.random.default_rng(0)
+        atclNos = [str(2400000000 + i) for i in range(n)]
+        prices = rng.integers(10000, 300000, n).astype(float)
+        start_day = date(2025, 1, 1)
+
+        append_times = []
+        for day_no in range(days):
+            if day_no:
+                changed = rng.random(n) < change_rate
+                prices[changed] += rng.choice([-1000.0, -500.0, 500.0, 1000.0], changed.sum())
+            frame = make_frame(atclNos, prices)
+            start = time.perf_counter()
+            history.append(frame, start_day + timedelta(days=day_no))
+            append_times.append(time.perf_counter() - start)
+
+        rows = len(history)
+        size = os.path.getsize(path) / 1024 / 1024
+        print(f"\n매물 {n:,}개 × {days}일 (일별 변경 {change_rate:.0%}) → 스냅샷 {rows:,}행, 파일 {size:.1f}MB")
+        print(f"  일별 추가: 평균 {np.mean(append_times):.2f}s, 최대 {max(append_times):.2f}s")
+
+        sample = rng.choice(atclNos, 1000)
+        start = time.perf_counter()
+        for atclNo in sample:
+            history.history(atclNo)
+        elapsed = time.perf_counter() - start
+        print(f"  매물별 이력 조회: {elapsed / len(sample) * 1000:.3f}ms/건")
+
+        since = start_day + timedelta(days=days - 8)
+        start = time.perf_counter()
+        drops = history.price_drops(since=since)
+        elapsed = time.perf_counter() - start
+        print(f"  {since} 이후 하락 매물 조회: {len(drops):,}건, {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""수집 결과 메모리 벤치마크: 레코드 dict 리스트 + DataFrame vs 컬럼 배열(RecordColumns) + DataFrame
+
+실행: python benchmarks/bench_records.py [매물 수]
+모의 서버와 같은 목록 항목으로 build_property_record 레코드를 만든 뒤, 수집이 끝났을 때 들고 있는
+메모리(파이썬 객체는 tracemalloc, pandas 문자열 컬럼의 Arrow 버퍼는 pyarrow 할당량)를 매물당 바이트로 비교한다.
+두 방식의 DataFrame 값이 같은지, 범주형 컬럼이 RecordColumns의 코드 버퍼를 복사 없이 공유하는지도 확인한다.
+"""
+import os
+import sys
+import gc
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from crawler import build_property_record  # noqa: E402
+from record_columns import RecordColumns  # noqa: E402
+from mock_naver import list_item  # noqa: E402
+
+PAGE_SIZE = 20
+DETAILS = ("제2종일반주거지역", "공동주택", "15만원", "서울 강남구 삼성동 123-4")
+
+
+def pages(n):
+    """목록 페이지 단위 레코드 묶음 (실제 수집처럼 페이지마다 새로 만듦)"""
+    for start in range(0, n, PAGE_SIZE):
+        yield [
+            build_property_record(list_item(f"{2400000000 + index}", index, "APT", "A1"), DETAILS,
+                                  "1168010500", "APT", "A1", "서울특별시", "강남구", "삼성동")
+            for index in range(start, min(start + PAGE_SIZE, n))
+        ]
+
+
+def arrow_bytes():
+    return pyarrow.total_allocated_bytes() if pyarrow is not None else 0
+
+
+def measure(n, build):
+    """build(n)이 만든 객체들을 들고 있는 동안의 메모리 (파이썬 객체 바이트, Arrow 바이트, 초, 결과)"""
+    gc.collect()
+    arrow_start = arrow_bytes()
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = build(n)
+    elapsed = time.perf_counter() - start
+    python_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return python_bytes, arrow_bytes() - arrow_start, elapsed, kept
+
+
+def build_dicts(n):
+    """이전 방식: 레코드 dict 리스트를 들고 있으면서 DataFrame을 한 벌 더 만듦"""
+    records = []
+    for page_results in pages(n):
+        records.extend(page_results)
+    return records, pd.DataFrame(records)
+
+
+def build_columns(n):
+    """컬럼 배열에 모은 뒤 DataFrame 생성 (레코드 dict는 페이지마다 버려짐)"""
+    columns = RecordColumns()
+    for page_results in pages(n):
+        columns.append(page_results)
+    return columns, columns.to_frame()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    results = {}
+    for name, build in (("dict 리스트 + DataFrame", build_dicts), ("컬럼 배열 + DataFrame", build_columns)):
+        python_bytes, arrow, elapsed, kept = measure(n, build)
+        results[name] = kept[1]
+        if isinstance(kept[0], RecordColumns):
+            store, frame = kept
+            copied = [column for column in frame.columns if frame[column].dtype == "category"
+                      and not np.shares_memory(frame[column].array.codes, store.codes(column))]
+            assert not copied, f"코드 배열이 복사된 범주형 컬럼: {copied}"
+        total = python_bytes + arrow
+        print(f"{name:<24} 매물당 {total / n:8.0f}B (파이썬 {python_bytes / n:6.0f}B + Arrow {arrow / n:5.0f}B), "
+              f"전체 {total / 1024 / 1024:7.1f}MB, {elapsed:.2f}s")
+        del kept
+        gc.collect()
+
+    before, after = results.values()
+    assert list(before.columns) == list(after.columns)
+    # 수집일시는 두 번 만드는 사이 시각이 달라질 수 있으므로 비교에서 제외
+    compared = [column for column in before.columns if column != "수집일시"]
+    assert before[compared].astype(object).equals(after[compared].astype(object)), "두 방식의 DataFrame 값이 다릅니다."
+    print(f"DataFrame 값 일치 ({n:,}행), 범주형 컬럼: {[c for c in after.columns if after[c].dtype == 'category']}")
+
+
+if __name__ == "__main__":
+    main()
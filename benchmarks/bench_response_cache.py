@@ -0,0 +1,126 @@
+"""공유 응답 캐시 벤치마크: 여러 세션이 같은 조건을 동시에 검색할 때의 upstream 요청 수
+
+실행: python benchmarks/bench_response_cache.py [--sessions 4] [--listings 100] [--latency-ms 50]
+모의 서버에 sessions개의 스레드가 같은 검색(iter_property_pages, 동시 수집 모드)을 동시에 보내고,
+캐시 없이 / 공유 ResponseCache로 각각 실행해 서버가 받은 요청 수와 소요 시간을 비교한다.
+시작 전에 LRU 제거, TTL 만료, 실패 전달, 같은 요청 합치기 동작을 확인한다.
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import crawler  # noqa: E402
+from crawler import search_properties  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from mock_naver import MockNaverServer  # noqa: E402
+
+
+def check_behavior():
+    """LRU/TTL/실패 전달/합치기 확인"""
+    cache = ResponseCache(max_entries=2, max_bytes=100, ttl_seconds=60)
+    assert cache.get_or_fetch("a", lambda: b"1") == (b"1", "miss")
+    assert cache.get_or_fetch("a", lambda: b"x") == (b"1", "hit")
+    cache.get_or_fetch("b", lambda: b"2")
+    cache.get_or_fetch("a", lambda: b"x")  # a를 최근 사용으로
+    cache.get_or_fetch("c", lambda: b"3")  # 항목 수 초과 → b 제거
+    assert cache.get_or_fetch("b", lambda: b"new")[1] == "miss" and cache.evictions >= 1
+    cache.get_or_fetch("big", lambda: b"x" * 90)  # 크기 초과 → 오래된 항목 제거
+    assert cache.stats()["bytes"] <= 100
+
+    cache = ResponseCache(ttl_seconds=0.05)
+    cache.get_or_fetch("a", lambda: b"1")
+    time.sleep(0.1)
+    assert cache.get_or_fetch("a", lambda: b"2") == (b"2", "miss") and cache.expirations == 1
+
+    cache = ResponseCache()
+    assert cache.get_or_fetch("skip", lambda: b"500", cacheable=lambda value: False)[1] == "miss"
+    assert len(cache) == 0
+
+    # 진행 중인 요청에 합류하고 실패도 함께 받음
+    calls = []
+    started = threading.Event()
+
+    def slow_fail():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("upstream")
+
+    errors = []
+
+    def waiter():
+        try:
+            cache.get_or_fetch("err", slow_fail)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=waiter) for _ in range(5)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1 and len(errors) == 5 and cache.coalesced == 4, (calls, errors, cache.stats())
+    print("동작 확인 통과: LRU/크기 제한, TTL, 보관 제외, 같은 요청 합치기와 실패 전달")
+
+
+def run_sessions(server, sessions, listings, response_cache):
+    """같은 검색을 sessions개 스레드에서 동시에 실행 - (서버 요청 수, 초, 세션별 매물 수)"""
+    before = dict(server.counts)
+    counts = [0] * sessions
+    barrier = threading.Barrier(sessions)
+
+    def session(index):
+        barrier.wait()
+        counts[index] = len(search_properties(
+            "1168010500", "APT", "A1", listings // 20 + 1, 0, concurrent_mode=True, max_workers=4,
+            requests_per_second=0, max_tiles=1, response_cache=response_cache,
+        ))
+
+    threads = [threading.Thread(target=session, args=(index,)) for index in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    requests_made = {kind: server.counts[kind] - before[kind] for kind in ("list", "detail")}
+    return requests_made, elapsed, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공유 응답 캐시 벤치마크")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--listings", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    check_behavior()
+    server = MockNaverServer(latency_ms=args.latency_ms, listings_per_query=args.listings).start()
+    crawler.BASE_URL = server.base_url
+
+    baseline, baseline_seconds, counts = run_sessions(server, args.sessions, args.listings, None)
+    cache = ResponseCache()
+    shared, shared_seconds, shared_counts = run_sessions(server, args.sessions, args.listings, cache)
+    server.shutdown()
+
+    assert counts == shared_counts, (counts, shared_counts)
+    # 캐시를 쓰면 세션 수와 관계없이 한 세션 분량만 upstream으로 나감
+    assert shared["detail"] == args.listings, shared
+    print(f"\n{args.sessions}개 세션이 같은 검색 (세션당 매물 {counts[0]}건, 지연 {args.latency_ms}ms)")
+    print(f"  캐시 없음: 요청 {baseline}, {baseline_seconds:.2f}s")
+    print(f"  공유 캐시: 요청 {shared}, {shared_seconds:.2f}s")
+    stats = cache.stats()
+    print(f"  캐시 지표: 적중 {stats['hits']}, 합류 {stats['coalesced']}, 미스 {stats['misses']}, "
+          f"적중률 {stats['hit_rate']:.0%}, 보관 {stats['entries']}개 / {stats['bytes'] / 1024:.0f}KB")
+
+
+if __name__ == "__main__":
+    main()
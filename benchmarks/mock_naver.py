@@ -0,0 +1,227 @@
+"""네이버 부동산 목록/상세 API를 흉내 내는 로컬 HTTP 서버 (오프라인 벤치마크용)
+
+실행: python benchmarks/mock_naver.py [--port 8765] [--latency-ms 50] [--error-rate 0.01] [--rate-429 0.02]
+수집기를 이 서버로 돌리려면 NAVER_LAND_BASE_URL=http://127.0.0.1:8765 을 설정한다.
+
+- /cluster/ajax/articleList: 실제 응답과 같은 모양({"body": [...], "more": bool})의 목록 JSON.
+  (itemId, rletTpCd, tradTpCd)마다 listings_per_query개의 매물을 page_size개씩 나눠 준다.
+  lgeo 파라미터가 있으면 그 클러스터에 속한 매물만 준다.
+- /cluster/clusterList: {"data": {"ARTICLE": [{"lgeo", "count", "z", "lat", "lon"}, ...]}} 형식의 클러스터 목록.
+  매물을 clusters개 묶음으로 나눈 매물 수를 알려 준다 (cortarNo, rletTpCd, tradTpCd 기준).
+- /article/info/{atclNo}: fixtures/detail/*.html 상세 페이지를 매물번호에 따라 돌려가며 응답.
+- latency_ms(+jitter_ms) 지연, error_rate 비율의 500 응답, rate_429 비율의 429(Retry-After) 응답을 넣을 수 있다.
+- capacity_rps를 주면 최근 1초 동안 받은 요청이 그보다 많을 때 429로 응답한다 (서버 측 요청 제한 흉내).
+- duplicate_rate 비율의 매물은 바로 앞 매물과 건물명/층/면적/가격/방향이 같다 (여러 중개사가 올린 같은 매물 흉내).
+"""
+import os
+import glob
+import json
+import time
+import random
+import argparse
+import threading
+import zlib
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "detail")
+
+
+def load_detail_pages():
+    """상세 페이지 픽스처 (내용이 있는 페이지만, 이름순)"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        if os.path.basename(path) == "empty.html":
+            continue
+        with open(path, encoding="utf-8") as f:
+            pages.append(f.read().encode("utf-8"))
+    return pages
+
+
+def list_item(atclNo, index, rletTpCd, tradTpCd, source=None):
+    """목록 API 항목 하나 (가격/면적/층은 매물번호로 정해지는 값, source를 주면 그 매물번호의 값을 그대로 씀)"""
+    seed = zlib.crc32((source or atclNo).encode())
+    return {
+        "atclNo": atclNo,
+        "atclNm": ["삼성동 아파트", "역삼동 오피스텔", "대치동 상가", "서울 강남구 삼성동 12-3"][index % 4],
+        "rletTpCd": rletTpCd,
+        "tradTpCd": tradTpCd,
+        "hanPrc": f"{seed % 30 + 1}억 {seed % 9000:,}" if tradTpCd != "B2" else f"{seed % 5000:,}",
+        "rentPrc": f"{seed % 300}" if tradTpCd == "B2" else "",
+        "spc1": f"{seed % 150 + 40}",
+        "spc2": f"{seed % 120 + 20}.{seed % 10}",
+        "flrInfo": f"{seed % 25 + 1}/25",
+        "bildNm": f"래미안{seed % 50}차",
+        "direction": ["남향", "동향", "서향", "북향"][seed % 4],
+    }
+
+
+class MockNaverServer(ThreadingHTTPServer):
+    """응답 지연/오류 비율을 설정할 수 있는 모의 서버 (요청 수는 counts에 기록)"""
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, rate_429=0.0,
+                 listings_per_query=200, page_size=20, seed=0, capacity_rps=0.0, clusters=3,
+                 duplicate_rate=0.0):
+        super().__init__(address, MockNaverHandler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.listings_per_query = listings_per_query
+        self.page_size = page_size
+        self.capacity_rps = capacity_rps
+        self.clusters = clusters
+        self.duplicate_rate = duplicate_rate
+        self._recent = deque()
+        self.detail_pages = load_detail_pages()
+        self.counts = {"list": 0, "cluster": 0, "detail": 0, "error": 0, "429": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def draw(self, kind):
+        """요청 종류를 기록하고 (지연 초, 응답 코드) 결정"""
+        with self._lock:
+            self.counts[kind] += 1
+            delay = max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            roll = self._random.random()
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 1.0:
+                self._recent.popleft()
+            self._recent.append(now)
+            if roll < self.rate_429 or (self.capacity_rps and len(self._recent) > self.capacity_rps):
+                self.counts["429"] += 1
+                return delay, 429
+            if roll < self.rate_429 + self.error_rate:
+                self.counts["error"] += 1
+                return delay, 500
+        return delay, 200
+
+    def cluster_ranges(self):
+        """클러스터별 매물 순번 범위 [(lgeo, 시작, 끝)] - 매물을 고르게 나눔"""
+        n, k = self.listings_per_query, max(self.clusters, 1)
+        bounds = [n * i // k for i in range(k + 1)]
+        return [(f"21200{i:05d}", bounds[i], bounds[i + 1]) for i in range(k) if bounds[i + 1] > bounds[i]]
+
+    def duplicate_source(self, index):
+        """index번째 매물이 같은 매물로 복제할 원본 순번 (복제하지 않으면 None)
+
+        연속된 복제는 같은 원본을 가리키고, 매물 순번만으로 정해지므로 요청마다 같은 결과가 나온다.
+        """
+        source = index
+        while source > 0 and zlib.crc32(f"dup{source}".encode()) % 1000 < self.duplicate_rate * 1000:
+            source -= 1
+        return source if source != index else None
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작 후 self 반환"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class MockNaverHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/cluster/ajax/articleList":
+            kind = "list"
+        elif url.path == "/cluster/clusterList":
+            kind = "cluster"
+        elif url.path.startswith("/article/info/"):
+            kind = "detail"
+        else:
+            self._send(404, b"not found", "text/plain")
+            return
+
+        delay, status = self.server.draw(kind)
+        if delay:
+            time.sleep(delay)
+        if status != 200:
+            self._send(status, b"error", "text/plain")
+            return
+
+        if kind == "list":
+            self._send(200, self._list_body(parse_qs(url.query)), "application/json; charset=utf-8")
+        elif kind == "cluster":
+            self._send(200, self._cluster_body(parse_qs(url.query)), "application/json; charset=utf-8")
+        else:
+            atclNo = url.path.rsplit("/", 1)[-1]
+            pages = self.server.detail_pages
+            self._send(200, pages[zlib.crc32(atclNo.encode()) % len(pages)], "text/html; charset=utf-8")
+
+    def _list_body(self, query):
+        item_id = query.get("itemId", ["0"])[0]
+        rletTpCd = query.get("rletTpCd", ["APT"])[0]
+        tradTpCd = query.get("tradTpCd", ["A1"])[0]
+        page = int(query.get("page", ["1"])[0])
+        server = self.server
+        first, total = 0, server.listings_per_query
+        if "lgeo" in query:
+            ranges = {lgeo: (start, end) for lgeo, start, end in server.cluster_ranges()}
+            first, total = ranges.get(query["lgeo"][0], (0, 0))
+        start = first + (page - 1) * server.page_size
+        end = min(start + server.page_size, total)
+        prefix = zlib.crc32(f"{item_id}{rletTpCd}{tradTpCd}".encode()) % 90000 + 10000
+        body = []
+        for index in range(start, end):
+            source = server.duplicate_source(index)
+            body.append(list_item(f"{prefix}{index:05d}", index, rletTpCd, tradTpCd,
+                                  f"{prefix}{source:05d}" if source is not None else None))
+        return json.dumps({"body": body, "more": end < total}, ensure_ascii=False).encode("utf-8")
+
+    def _cluster_body(self, query):
+        lat = float(query.get("lat", ["37.5"])[0])
+        lon = float(query.get("lon", ["127.0"])[0])
+        z = int(query.get("z", ["15"])[0])
+        article = [
+            {"lgeo": lgeo, "count": end - start, "z": z + 1, "lat": lat, "lon": lon}
+            for lgeo, start, end in self.server.cluster_ranges()
+        ]
+        return json.dumps({"code": "success", "data": {"ARTICLE": article}}).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네이버 부동산 모의 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--listings", type=int, default=200, help="검색 조건별 매물 수")
+    parser.add_argument("--capacity-rps", type=float, default=0.0, help="초당 처리 한도 (넘으면 429, 0이면 제한 없음)")
+    parser.add_argument("--clusters", type=int, default=3, help="검색 조건별 클러스터 수")
+    parser.add_argument("--duplicate-rate", type=float, default=0.0, help="앞 매물과 같은 매물로 복제할 비율")
+    args = parser.parse_args()
+
+    server = MockNaverServer(("127.0.0.1", args.port), args.latency_ms, args.jitter_ms, args.error_rate,
+                             args.rate_429, args.listings, capacity_rps=args.capacity_rps, clusters=args.clusters,
+                             duplicate_rate=args.duplicate_rate)
+    print(f"모의 서버 실행 중: {server.base_url} (NAVER_LAND_BASE_URL로 지정)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
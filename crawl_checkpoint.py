@@ -0,0 +1,148 @@
+import sqlite3
+import threading
+import time
+import json
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def checkpoint_key(params):
+    """수집 조건 dict로 만든 작업 키 (같은 조건으로 다시 검색하면 같은 키)"""
+    raw = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class CrawlCheckpoint:
+    """수집 중인 작업의 완료 페이지와 부분 결과를 페이지마다 저장하는 SQLite 체크포인트
+
+    - 작업은 수집 조건(checkpoint_key)으로 구분하며, 끝까지 수집하면 complete()로 지운다.
+    - 페이지는 (검색 단위 번호, 페이지)로 저장하고, 검색 단위 목록(계획)도 함께 저장해 이어받을 때 그대로 쓴다.
+    - 상세 정보 요청이 실패한 매물은 페이지의 failed 목록에 남겨, 이어받을 때 그 매물만 다시 요청한다.
+    - 오류나 새로고침으로 중단된 작업은 같은 조건으로 다시 수집할 때 완료된 페이지를 요청 없이 재사용한다.
+    - max_age_seconds가 지난 체크포인트는 매물 정보가 오래됐으므로 열 때 삭제한다.
+    - 여러 스레드/프로세스에서 함께 사용할 수 있다.
+    """
+
+    def __init__(self, path="crawl_checkpoint.sqlite3", max_age_seconds=3 * 24 * 3600):
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_key TEXT PRIMARY KEY, "
+            "params TEXT NOT NULL, "
+            "plan TEXT, "
+            "started_at REAL NOT NULL, "
+            "updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "job_key TEXT NOT NULL, "
+            "tile_no INTEGER NOT NULL, "
+            "page INTEGER NOT NULL, "
+            "atclNos TEXT NOT NULL, "
+            "records TEXT NOT NULL, "
+            "last INTEGER NOT NULL, "
+            "failed TEXT NOT NULL DEFAULT '[]', "
+            "PRIMARY KEY (job_key, tile_no, page)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+        self._purge()
+
+    def _purge(self):
+        """오래된 작업 삭제"""
+        with self._lock:
+            expired = [row[0] for row in self._conn.execute(
+                "SELECT job_key FROM jobs WHERE updated_at < ?", (time.time() - self.max_age_seconds,)
+            )]
+            for job_key in expired:
+                self._delete(job_key)
+            self._conn.commit()
+        if expired:
+            logger.info(f"오래된 수집 체크포인트 {len(expired)}개 삭제")
+
+    def _delete(self, job_key):
+        """작업과 페이지 삭제 (호출 시 _lock 보유)"""
+        self._conn.execute("DELETE FROM pages WHERE job_key = ?", (job_key,))
+        self._conn.execute("DELETE FROM jobs WHERE job_key = ?", (job_key,))
+
+    def load(self, job_key):
+        """{(검색 단위 번호, 페이지): (매물번호 리스트, 레코드 리스트, 마지막 페이지 여부, 상세 정보 실패 매물번호 리스트)}
+
+        저장된 페이지가 없으면 빈 dict
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT tile_no, page, atclNos, records, last, failed FROM pages WHERE job_key = ?", (job_key,)
+            ).fetchall()
+        return {
+            (tile_no, page): (json.loads(atclNos), json.loads(records), bool(last), json.loads(failed))
+            for tile_no, page, atclNos, records, last, failed in rows
+        }
+
+    def _touch_job(self, job_key, params, now):
+        """작업 행 추가 또는 갱신 시각 변경 (호출 시 _lock 보유)"""
+        self._conn.execute(
+            "INSERT INTO jobs (job_key, params, started_at, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(job_key) DO UPDATE SET updated_at = excluded.updated_at",
+            (job_key, json.dumps(params, ensure_ascii=False, default=str), now, now),
+        )
+
+    def save_plan(self, job_key, params, units):
+        """검색 단위 목록 저장 (JSON으로 저장 가능한 튜플 리스트)"""
+        with self._lock:
+            self._touch_job(job_key, params, time.time())
+            self._conn.execute("UPDATE jobs SET plan = ? WHERE job_key = ?",
+                               (json.dumps([list(unit) for unit in units], ensure_ascii=False), job_key))
+            self._conn.commit()
+
+    def load_plan(self, job_key):
+        """저장된 검색 단위 목록 (리스트의 리스트), 없으면 None"""
+        with self._lock:
+            row = self._conn.execute("SELECT plan FROM jobs WHERE job_key = ?", (job_key,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def save_page(self, job_key, params, unit_no, page, atclNos, records, last=False, failed=()):
+        """완료된 페이지 하나 저장 - 목록에서 본 매물번호(중복 제거용)와 그 페이지의 레코드
+
+        last는 이 페이지에서 검색 단위의 매물이 끝났는지(빈 페이지 또는 more가 거짓) 여부다.
+        failed는 상세 정보 요청이 실패해 상세 컬럼이 비어 있는 매물번호 목록이다 (이어받을 때 다시 요청).
+        """
+        now = time.time()
+        with self._lock:
+            self._touch_job(job_key, params, now)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (job_key, tile_no, page, atclNos, records, last, failed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_key, unit_no, page, json.dumps(list(atclNos)),
+                 json.dumps(records, ensure_ascii=False), int(last), json.dumps(sorted(failed))),
+            )
+            self._conn.commit()
+
+    def complete(self, job_key):
+        """끝까지 수집한 작업의 체크포인트 삭제"""
+        with self._lock:
+            self._delete(job_key)
+            self._conn.commit()
+
+    def pending(self):
+        """중단된 작업 목록 [(작업 키, 수집 조건 dict, 저장된 페이지 수, 레코드 수, 마지막 저장 시각)] - 계획만 있는 작업은 제외"""
+        with self._lock:
+            jobs = self._conn.execute(
+                "SELECT job_key, params, updated_at FROM jobs ORDER BY updated_at DESC"
+            ).fetchall()
+            pages = {
+                job_key: (count, records)
+                for job_key, count, records in self._conn.execute(
+                    "SELECT job_key, COUNT(*), SUM(json_array_length(records)) FROM pages GROUP BY job_key"
+                )
+            }
+        return [
+            (job_key, json.loads(params), *pages[job_key], updated_at)
+            for job_key, params, updated_at in jobs
+            if job_key in pages
+        ]
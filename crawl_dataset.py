@@ -0,0 +1,135 @@
+import uuid
+import logging
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from crawler import PROPERTY_TYPES, TRADE_TYPES
+
+logger = logging.getLogger(__name__)
+
+# 파티션 컬럼 (디렉터리 이름: cortarNo=.../rletTpCd=.../crawl_date=YYYY-MM-DD)
+PARTITION_COLUMNS = ["cortarNo", "rletTpCd", "crawl_date"]
+PARTITIONING = ds.partitioning(pa.schema([(column, pa.string()) for column in PARTITION_COLUMNS]), flavor="hive")
+
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+# 데이터셋 스키마 - 숫자 가격/면적은 float64, 값 종류가 적은 컬럼은 dictionary, 수집일시는 timestamp
+DATASET_SCHEMA = pa.schema([
+    ("매물번호", pa.string()),
+    ("층수", _CATEGORY),
+    ("전용면적(㎡)", pa.float64()),
+    ("임대면적(㎡)", pa.float64()),
+    ("연면적(㎡)", pa.float64()),
+    ("대지면적(㎡)", pa.float64()),
+    ("보증금/매매가", pa.string()),
+    ("월세", pa.string()),
+    ("전세금", pa.string()),
+    ("가격(만원)", pa.float64()),
+    ("월세(만원)", pa.float64()),
+    ("건물명", pa.string()),
+    ("방향", _CATEGORY),
+    ("매물타입", _CATEGORY),
+    ("거래타입", _CATEGORY),
+    ("tradTpCd", _CATEGORY),
+    ("주소지", _CATEGORY),
+    ("상세주소", pa.string()),
+    ("용도", _CATEGORY),
+    ("지역지구", _CATEGORY),
+    ("관리비", pa.string()),
+    ("매물 링크", pa.string()),
+    ("중복그룹", pa.string()),
+    ("중복수", pa.int32()),
+    ("수집일시", pa.timestamp("s")),
+    *[(column, pa.string()) for column in PARTITION_COLUMNS],
+])
+
+# 결과의 표시 이름 → 코드 (표에 없는 값은 그대로)
+_PROPERTY_CODES = {name: code for code, name in PROPERTY_TYPES.items()}
+_TRADE_CODES = {name: code for code, name in TRADE_TYPES.items()}
+
+
+def _strings(values):
+    """문자열 배열 (결측값은 null)"""
+    return pa.array(values.astype("string"), type=pa.string(), from_pandas=True)
+
+
+def _codes(values, mapping):
+    """표시 이름 Series를 코드 문자열 Series로"""
+    values = values.astype(object)
+    return values.map(lambda value: mapping.get(value, value), na_action="ignore")
+
+
+def dataset_table(df):
+    """정규화된 수집 결과(normalize_results)를 DATASET_SCHEMA 형식의 pyarrow Table로 변환
+
+    파티션 컬럼은 법정동코드, 매물타입(코드로 변환), 수집일시의 날짜로 만든다. 결과에 없는 컬럼은 null.
+    """
+    if "수집일시" in df.columns:
+        collected = pd.to_datetime(df["수집일시"].astype(object), format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    else:
+        collected = pd.Series(pd.NaT, index=df.index, dtype="datetime64[s]")
+    frame = pd.DataFrame(index=df.index)
+    frame["수집일시"] = collected
+    frame["cortarNo"] = df["법정동코드"].astype(object) if "법정동코드" in df.columns else None
+    frame["rletTpCd"] = _codes(df["매물타입"], _PROPERTY_CODES) if "매물타입" in df.columns else None
+    frame["tradTpCd"] = _codes(df["거래타입"], _TRADE_CODES) if "거래타입" in df.columns else None
+    frame["crawl_date"] = collected.dt.strftime("%Y-%m-%d")
+
+    arrays = []
+    for field in DATASET_SCHEMA:
+        values = frame[field.name] if field.name in frame.columns else df.get(field.name)
+        if values is None:
+            arrays.append(pa.nulls(len(df), field.type))
+        elif pa.types.is_dictionary(field.type):
+            arrays.append(_strings(values.astype(object)).dictionary_encode())
+        elif pa.types.is_string(field.type):
+            arrays.append(_strings(values.astype(object)))
+        elif pa.types.is_timestamp(field.type):
+            arrays.append(pa.array(values, type=field.type, from_pandas=True))
+        else:
+            arrays.append(pa.array(pd.to_numeric(values, errors="coerce"), type=field.type, from_pandas=True))
+    return pa.Table.from_arrays(arrays, schema=DATASET_SCHEMA)
+
+
+class CrawlDataset:
+    """수집 결과를 쌓는 파티션 Parquet 데이터셋 (분석 작업용, pyarrow 필요)
+
+    - root 아래에 cortarNo/rletTpCd/crawl_date 순서의 hive 형식 디렉터리로 나눠 저장한다.
+      pandas(read_parquet)나 Arrow에서 필요한 파티션과 컬럼만 읽을 수 있다.
+    - append()는 기존 파일을 건드리지 않고 새 파일만 추가한다. 같은 날 같은 매물을 다시 수집하면
+      행이 두 번 들어가므로, 중복이 문제라면 읽을 때 (매물번호, 수집일시) 기준으로 정리한다.
+    """
+
+    def __init__(self, root="crawl_dataset"):
+        self.root = root
+
+    def append(self, df):
+        """정규화된 수집 결과 추가, 기록한 행 수 반환"""
+        if df.empty:
+            return 0
+        table = dataset_table(df)
+        ds.write_dataset(
+            table, self.root, format="parquet", partitioning=PARTITIONING,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        logger.info(f"데이터셋에 {table.num_rows}행 추가: {self.root}")
+        return table.num_rows
+
+    def dataset(self):
+        """pyarrow Dataset (Arrow에서 직접 필터/스캔할 때)"""
+        return ds.dataset(self.root, format="parquet", partitioning=PARTITIONING, schema=DATASET_SCHEMA)
+
+    def read(self, columns=None, where=None):
+        """DataFrame으로 읽기 - columns는 읽을 컬럼 목록, where는 {컬럼: 값 또는 값 목록} 조건
+
+        파티션 컬럼 조건은 해당 디렉터리만, columns는 해당 컬럼만 읽는다.
+        """
+        condition = None
+        for column, values in (where or {}).items():
+            values = list(values) if isinstance(values, (list, tuple, set)) else [values]
+            expression = ds.field(column).isin(values)
+            condition = expression if condition is None else condition & expression
+        return self.dataset().to_table(columns=columns, filter=condition).to_pandas()
@@ -0,0 +1,806 @@
+import os
+import time
+import logging
+import math
+import threading
+import multiprocessing
+from collections import namedtuple
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from crawl_checkpoint import checkpoint_key
+from detail_parser import extract_property_details
+from listing_groups import DuplicateGrouper, duplicate_group_key
+from listing_store import listing_fingerprint
+from normalize import condition_mask
+from region_geo import DEFAULT_EXTENT, search_tiles
+from run_metrics import RunMetrics
+
+logger = logging.getLogger(__name__)
+
+# 네이버 부동산 매물 유형 코드
+PROPERTY_TYPES = {
+    "APT": "아파트",
+    "OPST": "오피스텔",
+    "VL": "빌라/연립/다세대",
+    "ABYG": "아파트분양권",
+    "OBYG": "오피스텔분양권",
+    "SG": "상가",
+    "SMS": "사무실",
+    "GJCG": "공장/창고",
+    "TJ": "토지",
+    "JGC": "재개발/재건축"
+}
+TRADE_TYPES = {"A1": "매매", "B1": "전세", "B2": "월세"}
+
+# 요청 대상 주소 (오프라인 벤치마크에서는 NAVER_LAND_BASE_URL로 로컬 모의 서버를 지정)
+BASE_URL = os.environ.get("NAVER_LAND_BASE_URL", "https://m.land.naver.com").rstrip("/")
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
+    "Referer": "https://m.land.naver.com/",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Connection": "keep-alive",
+    "Cache-Control": "no-cache"
+}
+
+# 일시적 오류 재시도 (연결 오류, 시간 초과, 아래 HTTP 상태)
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_MAX_WAIT = 30.0
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# 체크포인트가 있을 때 오류 메시지에 덧붙이는 안내
+RESUME_HINT = " (같은 조건으로 다시 검색하면 중단된 페이지부터 이어서 수집합니다)"
+RETRY_HINT = "같은 조건으로 다시 검색하면 실패한 매물만 다시 요청합니다"
+
+
+def _retry_wait(response, attempt):
+    """재시도 전 대기 시간 - Retry-After 헤더가 있으면 따르고, 없으면 지수 백오프"""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.strip().isdigit():
+        return min(float(retry_after), RETRY_MAX_WAIT)
+    return min(RETRY_BACKOFF * 2 ** attempt, RETRY_MAX_WAIT)
+
+
+def fetch_with_retry(url, headers, kind, timeout, metrics, limiter=None, retries=MAX_RETRIES, pacer=None):
+    """GET 요청 - 일시적 오류는 retries번까지 다시 시도하고 마지막 응답 반환 (상태 확인은 호출하는 쪽에서)
+
+    시도마다 limiter와 pacer(AdaptivePacer)를 거치고 {kind}_fetch 단계 시간과 응답을 metrics에 기록하며,
+    재시도 횟수는 metrics.retry(kind)로 남는다. 재시도 후에도 연결 오류면 예외를 그대로 올린다.
+    pacer가 있으면 응답마다 결과를 알려 주고, 재시도 전 대기도 pacer의 간격 조절에 맡긴다.
+    """
+    for attempt in range(retries + 1):
+        if limiter:
+            with metrics.stage("rate_limit_wait"):
+                limiter.acquire()
+        if pacer:
+            with metrics.stage("rate_limit_wait"):
+                pacer.acquire()
+        response = None
+        start = time.perf_counter()
+        try:
+            with metrics.stage(f"{kind}_fetch"):
+                response = requests.get(url, headers=headers, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == retries:
+                raise
+            logger.warning(f"요청 실패, 재시도 {attempt + 1}/{retries}: {url} ({e})")
+        finally:
+            metrics.record_response(kind, response)
+            if pacer:
+                pacer.observe(response, time.perf_counter() - start)
+        if response is not None:
+            if response.status_code not in RETRYABLE_STATUS or attempt == retries:
+                return response
+            logger.warning(f"HTTP {response.status_code}, 재시도 {attempt + 1}/{retries}: {url}")
+        metrics.retry(kind)
+        if pacer is None:
+            with metrics.stage("retry_wait"):
+                time.sleep(_retry_wait(response, attempt))
+
+
+def fetch_shared(url, headers, kind, timeout, metrics, limiter=None, pacer=None, response_cache=None):
+    """fetch_with_retry와 같되, response_cache(ResponseCache)가 있으면 같은 URL의 200 응답을 재사용
+
+    다른 세션이 같은 URL을 이미 요청 중이면 그 응답을 기다린다. 캐시에서 얻은 응답은 요청 제한기를 거치지 않고
+    metrics에 {kind}_cache_hit / {kind}_cache_coalesced 카운터로만 기록된다.
+    """
+    if response_cache is None:
+        return fetch_with_retry(url, headers, kind, timeout, metrics, limiter, pacer=pacer)
+    response, source = response_cache.get_or_fetch(
+        url,
+        lambda: fetch_with_retry(url, headers, kind, timeout, metrics, limiter, pacer=pacer),
+        size=lambda response: len(response.content) + len(url),
+        cacheable=lambda response: response.status_code == 200,
+    )
+    if source != "miss":
+        metrics.count(f"{kind}_cache_{source}")
+    return response
+
+
+def fetch_property_details(atclNo, headers, metrics=None, limiter=None, pacer=None, response_cache=None):
+    """매물 상세 정보를 요청해 파싱하는 함수 - 재시도 후에도 실패하면 requests.RequestException 등 예외를 그대로 올림
+
+    response_cache가 주어지면 fetch_shared로 다른 세션과 응답을 나눠 쓴다.
+    """
+    metrics = metrics if metrics is not None else RunMetrics()
+    detail_url = f"{BASE_URL}/article/info/{atclNo}"
+    response = fetch_shared(detail_url, headers, "detail", 15, metrics, limiter, pacer, response_cache)
+    response.raise_for_status()
+    
+    with metrics.stage("detail_parse"):
+        return extract_property_details(response.text)
+
+
+def scrape_property_details(atclNo, headers, metrics=None, limiter=None, pacer=None, response_cache=None):
+    """매물 상세 정보를 스크래핑하는 함수 (metrics가 주어지면 요청/파싱 시간과 응답을 기록)
+
+    일시적 오류는 fetch_with_retry로 다시 시도하고, 그래도 실패하면 빈 상세 정보를 반환한다.
+    response_cache가 주어지면 fetch_shared로 다른 세션과 응답을 나눠 쓴다.
+    """
+    try:
+        return fetch_property_details(atclNo, headers, metrics, limiter, pacer, response_cache)
+    except requests.RequestException as e:
+        logger.error(f"매물 상세 정보 요청 오류 (ID: {atclNo}): {e}")
+        return "", "", "", ""
+    except Exception as e:
+        logger.error(f"매물 상세 정보 파싱 오류 (ID: {atclNo}): {e}")
+        return "", "", "", ""
+
+
+def filter_by_conditions(results, area_filter_enabled, min_area, max_area, price_filter_enabled, min_price, max_price):
+    """수집된 데이터를 조건에 따라 필터링하는 함수"""
+    if not results:
+        return results
+    
+    mask = condition_mask(
+        [result.get("전용면적(㎡)", "") or result.get("임대면적(㎡)", "") for result in results],
+        [result.get("보증금/매매가", "") for result in results],
+        area_filter_enabled, min_area, max_area,
+        price_filter_enabled, min_price, max_price
+    )
+    return [result for result, keep in zip(results, mask) if keep]
+
+
+def filter_list_items(items, area_filter_enabled, min_area, max_area, price_filter_enabled, min_price, max_price):
+    """목록 API 항목을 상세 수집 전에 조건으로 거르는 함수 (filter_by_conditions와 같은 기준)"""
+    if not items:
+        return items
+    
+    mask = condition_mask(
+        [item.get("spc2", "") or item.get("spc1", "") for item in items],
+        [item.get("hanPrc", "") for item in items],
+        area_filter_enabled, min_area, max_area,
+        price_filter_enabled, min_price, max_price
+    )
+    return [item for item, keep in zip(items, mask) if keep]
+
+
+class RateLimiter:
+    """여러 스레드가 공유하는 초당 요청 수 제한기"""
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def acquire(self):
+        """다음 요청 슬롯이 올 때까지 대기"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class ProcessRateLimiter:
+    """여러 프로세스가 공유하는 초당 요청 수 제한기 (RateLimiter와 같은 acquire 인터페이스)
+
+    다음 요청 슬롯 시각을 공유 메모리 값 하나로 관리하므로 프로세스 풀의 초기화 인자로
+    넘기면 모든 작업자가 하나의 요청 예산을 나눠 쓴다.
+    """
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_time = multiprocessing.Value("d", 0.0)
+
+    def acquire(self):
+        """다음 요청 슬롯이 올 때까지 대기"""
+        with self._next_time.get_lock():
+            now = time.time()
+            wait = self._next_time.value - now
+            self._next_time.value = max(now, self._next_time.value) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class AdaptivePacer:
+    """응답 상태를 보고 초당 요청 수를 조절하는 AIMD 요청 간격 조절기 (RateLimiter와 같은 acquire 인터페이스)
+
+    정상 응답이 오면 초당 요청 수를 조금씩 늘리고(가산 증가, 초당 약 increase만큼),
+    429/5xx, 연결 오류, latency_target초를 넘는 응답이 오면 decrease 배로 줄인다(승산 감소).
+    Retry-After 헤더가 있으면 그 시간 동안 다음 요청을 보내지 않는다.
+    동시에 도착한 여러 실패 응답으로 한꺼번에 여러 번 줄지 않도록 감소는 cooldown초에 한 번만 적용한다.
+    초당 요청 수는 항상 [min_rps, max_rps] 범위를 지킨다.
+    """
+
+    def __init__(self, min_rps=0.5, max_rps=10.0, start_rps=None, increase=0.5, decrease=0.5,
+                 latency_target=2.0, cooldown=1.0):
+        self.min_rps = min_rps
+        self.max_rps = max_rps
+        self.rate = min(max(start_rps if start_rps is not None else min_rps, min_rps), max_rps)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.cuts = 0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+        self._last_cut = 0.0
+
+    def acquire(self):
+        """다음 요청 슬롯이 올 때까지 대기"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + 1.0 / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+    def observe(self, response, seconds):
+        """요청 하나의 결과 반영 (response가 None이면 연결 오류, seconds는 응답 시간)"""
+        status = response.status_code if response is not None else None
+        backpressure = status is None or status == 429 or status >= 500 or seconds > self.latency_target
+        with self._lock:
+            now = time.monotonic()
+            if not backpressure:
+                self.rate = min(self.max_rps, self.rate + self.increase / self.rate)
+                return
+            if now - self._last_cut >= self.cooldown:
+                self.rate = max(self.min_rps, self.rate * self.decrease)
+                self._last_cut = now
+                self.cuts += 1
+            retry_after = response.headers.get("Retry-After") if response is not None else None
+            if retry_after and retry_after.strip().isdigit():
+                self._next_time = max(self._next_time, now + min(float(retry_after), RETRY_MAX_WAIT))
+
+
+# 상세 정보 튜플 (scrape_property_details 결과) 순서대로의 레코드 컬럼
+DETAIL_COLUMNS = ["지역지구", "용도", "관리비", "상세주소"]
+EMPTY_DETAILS = ("", "", "", "")
+
+
+def pick_detailed_address(candidates):
+    """주소 후보 중 실제 주소(도로명, 지번 등)로 보이는 첫 번째 값 (없으면 빈 문자열)"""
+    for addr in candidates:
+        if addr and addr.strip():
+            addr_clean = addr.strip()
+            # "일반상가", "상가", "오피스텔" 등의 일반적인 단어만 있는 경우 제외
+            if not any(only_word in addr_clean for only_word in ["일반상가", "상가", "오피스텔", "아파트", "빌라"]):
+                # 실제 주소가 포함된 경우 (도로명, 지번 등)
+                if any(addr_keyword in addr_clean for addr_keyword in ["로", "길", "동", "가", "번지", "번", "-"]):
+                    return addr_clean
+    return ""
+
+
+# 수집일시 문자열 (같은 초 안에서는 다시 포맷하지 않음)
+_collected_at = [0, ""]
+
+
+def collected_at():
+    """현재 시각의 수집일시 문자열 ("%Y-%m-%d %H:%M:%S", 초가 바뀔 때만 새로 만듦)"""
+    now = int(time.time())
+    if _collected_at[0] != now:
+        _collected_at[:] = [now, datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S")]
+    return _collected_at[1]
+
+
+def build_property_record(item, details, cortarNo, rletTpCd, tradTpCd, sido="", sigungu="", eupmyeondong="",
+                          group=None):
+    """목록 API 항목과 상세 정보로 매물 레코드를 만드는 함수
+
+    컬럼 순서: 매물번호, 층수, 면적 4종, 가격 3종, 건물명, 방향, 매물타입, 거래타입, 주소, 법정동코드, 상세 정보, 링크, 중복그룹, 수집일시
+    group은 중복 매물 묶음 ID이며, 없으면 자기 매물번호다.
+    """
+    atclNo = item.get("atclNo")
+    zoning, purpose, management_fee, scraped_address = details
+    get = item.get
+    
+    # 주소 정보 - 입력된 지역 정보로 기본 주소 (읍면동이 없으면 시군구까지), 없으면 법정동 코드
+    if sido and sigungu and eupmyeondong:
+        base_address = f"{sido} {sigungu} {eupmyeondong}"
+    elif sido and sigungu:
+        base_address = f"{sido} {sigungu}"
+    else:
+        base_address = f"법정동코드: {cortarNo}"
+    
+    # API에서 제공되는 주소 정보들과 상세 페이지 주소 중 실제 주소로 보이는 값
+    detailed_address = pick_detailed_address(
+        (get("atclNm", ""), get("addr1", ""), get("addr2", ""), get("bildNm", ""), scraped_address)
+    )
+    
+    rent = get("rentPrc", "")
+    return {
+        "매물번호": atclNo,
+        "층수": get("flrInfo", ""),
+        # 면적 정보 - 다양한 형식 처리
+        "전용면적(㎡)": get("spc2", ""),
+        "임대면적(㎡)": get("spc1", ""),
+        "연면적(㎡)": get("spc3", ""),
+        "대지면적(㎡)": get("spc4", ""),
+        # 가격 정보
+        "보증금/매매가": get("hanPrc", ""),
+        "월세": rent,
+        "전세금": rent if tradTpCd == "B1" else "",
+        "건물명": get("bildNm", ""),
+        "방향": get("direction", ""),
+        "매물타입": PROPERTY_TYPES.get(rletTpCd, rletTpCd),
+        "거래타입": TRADE_TYPES.get(tradTpCd, tradTpCd),
+        "주소지": base_address,
+        "법정동코드": str(cortarNo),
+        "상세주소": detailed_address,
+        "용도": purpose,
+        "지역지구": zoning,
+        "관리비": management_fee,
+        "매물 링크": f"https://m.land.naver.com/article/info/{atclNo}",
+        "중복그룹": str(group or atclNo),
+        "수집일시": collected_at(),
+    }
+
+
+# 목록 API 한 페이지의 매물 수
+LIST_PAGE_SIZE = 20
+
+# 검색 단위 - 안내 문구, 목록 API 위치 파라미터, 요청할 페이지 수, 계획보다 매물이 늘었을 때 페이지를 더 볼지 여부
+CrawlUnit = namedtuple("CrawlUnit", ["label", "query", "pages", "extendable"])
+
+
+def tile_query(tile):
+    """타일의 줌/중심/범위 쿼리 문자열"""
+    return f"z={tile.z}&lat={tile.lat}&lon={tile.lon}&btm={tile.btm}&lft={tile.lft}&top={tile.top}&rgt={tile.rgt}"
+
+
+def fetch_clusters(cortarNo, rletTpCd, tradTpCd, tile, range_params="", headers=HEADERS, metrics=None,
+                   limiter=None, pacer=None, response_cache=None):
+    """클러스터 목록 API로 타일 안의 매물 묶음 조회 - [(lgeo, 매물 수, z, lat, lon)] (매물이 없는 묶음은 제외)"""
+    metrics = metrics if metrics is not None else RunMetrics()
+    url = (
+        f"{BASE_URL}/cluster/clusterList?view=atcl&"
+        f"cortarNo={cortarNo}&rletTpCd={rletTpCd}&tradTpCd={tradTpCd}&{tile_query(tile)}{range_params}"
+    )
+    response = fetch_shared(url, headers, "cluster", 10, metrics, limiter, pacer, response_cache)
+    response.raise_for_status()
+    clusters = (response.json().get("data") or {}).get("ARTICLE") or []
+    return [
+        (str(cluster["lgeo"]), int(cluster.get("count", 0)),
+         cluster.get("z", tile.z), cluster.get("lat", tile.lat), cluster.get("lon", tile.lon))
+        for cluster in clusters
+        if cluster.get("lgeo") and int(cluster.get("count", 0)) > 0
+    ]
+
+
+def plan_crawl_units(cortarNo, rletTpCd, tradTpCd, tiles, max_pages, range_params="", cluster_first=False,
+                     headers=HEADERS, metrics=None, limiter=None, pacer=None, response_cache=None):
+    """타일 목록으로 검색 단위(CrawlUnit) 목록 만들기
+
+    cluster_first가 꺼져 있으면 타일마다 max_pages까지 페이지를 넘기는 단위 하나씩.
+    켜져 있으면 타일마다 클러스터 목록을 먼저 조회해 매물이 있는 클러스터만, 매물 수에 필요한 페이지 수만큼 요청한다.
+    여러 타일에 걸친 클러스터(lgeo)는 한 번만 넣고, 클러스터 조회에 실패한 타일은 max_pages 방식으로 대신한다.
+    """
+    if not cluster_first:
+        return [CrawlUnit(f"타일 {tile_no}/{len(tiles)}", tile_query(tile), max_pages, False)
+                for tile_no, tile in enumerate(tiles, start=1)]
+    units = []
+    seen_lgeos = set()
+    for tile_no, tile in enumerate(tiles, start=1):
+        try:
+            clusters = fetch_clusters(cortarNo, rletTpCd, tradTpCd, tile, range_params, headers, metrics,
+                                      limiter, pacer, response_cache)
+        except (requests.RequestException, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"클러스터 조회 실패, 타일 {tile_no}은 페이지 순회로 검색: {e}")
+            units.append(CrawlUnit(f"타일 {tile_no}/{len(tiles)}", tile_query(tile), max_pages, False))
+            continue
+        for lgeo, count, z, lat, lon in clusters:
+            if lgeo in seen_lgeos:
+                continue
+            seen_lgeos.add(lgeo)
+            query = (f"z={z}&lat={lat}&lon={lon}&btm={tile.btm}&lft={tile.lft}&top={tile.top}&rgt={tile.rgt}"
+                     f"&lgeo={lgeo}&totCnt={count}")
+            units.append(CrawlUnit(f"타일 {tile_no}/{len(tiles)} · 클러스터 {count}건", query,
+                                   math.ceil(count / LIST_PAGE_SIZE), True))
+    return units
+
+
+def iter_property_pages(cortarNo, rletTpCd, tradTpCd, max_pages, delay_time, sido="", sigungu="", eupmyeondong="",
+                      concurrent_mode=False, max_workers=4, requests_per_second=2.0,
+                      detail_cache=None, bypass_cache=False, max_tiles=16, listing_store=None,
+                      area_range=None, price_range=None, extent=None, limiter=None, stats=None,
+                      on_status=None, on_progress=None, on_error=None, metrics=None, checkpoint=None, pacer=None,
+                      lazy_details=False, response_cache=None, cluster_first=False, group_duplicates=True,
+                      extent_precision="읍면동"):
+    """매물을 검색해 목록 페이지 단위로 레코드 리스트를 내보내는 제너레이터
+    
+    Streamlit에 의존하지 않으며 진행 상황은 콜백으로 알린다.
+    on_status(문자열), on_progress(0~1 진행률), on_error(오류 메시지)는 없으면 생략/로그만 남긴다.
+    
+    concurrent_mode가 켜지면 페이지별 상세 정보를 스레드 풀에서 병렬로 수집하고,
+    항목별 sleep 대신 공유 RateLimiter로 전체 초당 요청 수를 제한한다.
+    결과 순서는 순차 모드와 동일하게 페이지/목록 순서를 유지한다.
+    
+    detail_cache가 주어지면 캐시에 있는 매물은 상세 페이지를 요청하지 않는다.
+    bypass_cache가 켜지면 캐시를 읽지 않고 새로 수집한 값으로 갱신만 한다 (상세 요청은 response_cache도 거치지 않음).
+    캐시 적중/미스 수는 stats dict(주어진 경우)에 기록된다.
+    
+    검색 범위는 법정동 코드의 범위 extent(btm, lft, top, rgt, 없으면 기본 범위)를 최대 max_tiles개 타일로 나눈 것이며
+    (번들 범위표의 지역은 모두 한 타일이므로 여러 타일은 더 넓은 extent를 직접 넘길 때만 생김),
+    max_pages는 타일마다 적용된다. 여러 타일에 나온 매물은 매물번호로 중복 제거한다.
+    extent_precision은 RegionGeoIndex.lookup()의 범위 정밀도이며, "읍면동"이 아니면(시군구/기본 범위)
+    타일을 COARSE_MAX_TILES개로 제한하고 레코드 주소지도 시군구까지만 적는다 (검색 범위가 읍면동이 아니므로).
+    목록 응답의 more가 거짓이면 빈 페이지를 요청하지 않고 그 타일을 끝낸다.
+    
+    cluster_first가 켜지면 타일마다 클러스터 목록을 먼저 조회해(plan_crawl_units) 매물이 있는 클러스터만
+    매물 수에 맞는 페이지 수만큼 요청하므로 max_pages를 짐작할 필요가 없다. 클러스터의 마지막 페이지에서도
+    more가 참이면(계획 후 매물 증가) max_pages 페이지까지 더 요청한다.
+    
+    listing_store가 주어지면 증분 수집: 이전 수집 때와 목록 필드 지문이 같은 매물은
+    저장된 상세 정보를 쓰고, 새 매물이나 지문이 바뀐 매물만 상세 페이지를 새로 요청한다.
+    
+    area_range(㎡)/price_range(만원)가 (최소, 최대)로 주어지면 목록 조회 파라미터로 보내고,
+    응답 항목도 상세 수집 전에 filter_by_conditions와 같은 기준으로 거른다.
+    걸러진 매물 수는 stats["filtered_out"]에 기록된다.
+    
+    limiter가 주어지면 (예: 여러 프로세스가 공유하는 ProcessRateLimiter) 동시 수집 모드가
+    아니어도 모든 목록/상세 요청이 그 제한기를 거친다.
+    
+    pacer(AdaptivePacer)가 주어지면 고정 대기(delay_time) 대신 응답 상태에 따라 요청 간격을 자동 조절하며,
+    동시 수집 모드에서도 requests_per_second 제한기 대신 pacer를 쓴다 (limiter와 함께 주면 둘 다 거친다).
+    
+    lazy_details가 켜지면 상세 페이지를 요청하지 않고 목록 정보만으로 레코드를 바로 만든다.
+    증분 저장소나 캐시에 있는 상세 정보는 채우고, 나머지 매물의 상세 컬럼(DETAIL_COLUMNS)은 비워 두며
+    그 수는 stats["deferred"]에 기록된다. 빈 컬럼은 DetailEnricher로 나중에 채울 수 있다.
+    listing_store가 함께 주어지면 나중에 채울 매물도 목록 필드와 지문을 저장해 두고(upsert(pending=True)),
+    상세 정보는 DetailEnricher가 채운 뒤 저장한다.
+    
+    group_duplicates가 켜지면 건물명/층/면적/가격/방향이 같은 매물(여러 중개사가 올린 같은 매물)을 한 묶음으로 보고
+    묶음의 첫 매물(대표)만 상세 정보를 요청해 나머지에 그대로 복사한다. 레코드의 "중복그룹"은 대표의 매물번호이며,
+    복사로 생략한 상세 요청 수는 stats["grouped"]에 기록된다. 대표의 상세 정보가 비어 있으면(나중에 채우거나
+    요청이 실패한 경우) 복사하지 않고 그 매물도 따로 처리한다.
+    
+    response_cache(ResponseCache)가 주어지면 목록/상세 응답을 프로세스 전체에서 재사용하고,
+    다른 세션이 같은 요청을 진행 중이면 새로 요청하지 않고 그 결과를 기다린다.
+    
+    metrics(RunMetrics)가 주어지면 목록/상세 요청, 파싱, 대기, 필터링 단계의 시간과
+    요청 수, 응답 바이트, HTTP 상태 분포를 기록한다.
+    
+    목록/상세 요청의 일시적 오류(연결 오류, 시간 초과, 429/5xx)는 요청마다 fetch_with_retry로 다시 시도한다.
+    checkpoint(CrawlCheckpoint)가 주어지면 페이지마다 완료 상태와 부분 결과를 저장하고,
+    같은 조건으로 중단됐던 작업은 저장된 페이지를 요청 없이 그대로 내보낸 뒤 멈춘 곳부터 이어서 수집한다.
+    끝까지 수집하면 체크포인트를 지운다. 재사용한 페이지 수는 stats["resumed_pages"]에 기록된다.
+    상세 정보 요청이 (재시도 후에도) 실패한 매물은 상세 컬럼을 비운 채 내보내고 stats["failed_details"]에 센다.
+    체크포인트가 있으면 그 매물번호를 페이지와 함께 저장하고 체크포인트를 지우지 않으므로, 같은 조건으로 다시
+    수집하면 저장된 페이지를 재사용하면서 실패한 매물의 상세 정보만 다시 요청한다.
+    """
+    headers = HEADERS
+    metrics = metrics if metrics is not None else RunMetrics()
+    on_status = on_status or (lambda text: None)
+    on_progress = on_progress or (lambda fraction: None)
+    
+    # 법정동 코드의 범위를 줌에 맞는 타일로 나눠 검색
+    tiles = search_tiles(extent or DEFAULT_EXTENT, extent_precision, max_tiles=max_tiles)
+    # 주소지에 적을 읍면동 (범위가 읍면동 단위가 아니면 생략)
+    record_dong = eupmyeondong if extent_precision == "읍면동" else ""
+    
+    # 목록 API가 지원하는 면적/가격 범위 파라미터
+    range_params = ""
+    if area_range is not None:
+        range_params += f"&spcMin={area_range[0]}&spcMax={area_range[1]}"
+    if price_range is not None:
+        range_params += f"&dprcMin={price_range[0]}&dprcMax={price_range[1]}"
+    
+    seen_atclNos = set()
+    grouper = DuplicateGrouper()
+    
+    if pacer is not None:
+        delay_time = 0
+    elif limiter is None and concurrent_mode:
+        limiter = RateLimiter(requests_per_second)
+    executor = ThreadPoolExecutor(max_workers=max_workers) if concurrent_mode else None
+    
+    crawl_stats = stats if stats is not None else {}
+    crawl_stats.update({"hits": 0, "misses": 0, "unchanged": 0, "filtered_out": 0, "resumed_pages": 0, "deferred": 0,
+                        "grouped": 0, "failed_details": 0})
+    stats_lock = threading.Lock()
+    # 현재 페이지에서 상세 정보 요청이 실패한 매물번호 (체크포인트에 남겨 이어받을 때 다시 요청)
+    failed_atclNos = set()
+    
+    # 체크포인트 작업 키 - 결과에 영향을 주는 조건만 포함 (요청 간격/동시 수집 설정은 제외)
+    job_params = {
+        "cortarNo": cortarNo, "rletTpCd": rletTpCd, "tradTpCd": tradTpCd, "max_pages": max_pages, "cluster_first": cluster_first,
+        "group_duplicates": group_duplicates, "lazy_details": lazy_details,
+        "tiles": [tuple(tile) for tile in tiles], "area_range": area_range, "price_range": price_range,
+        "sido": sido, "sigungu": sigungu, "eupmyeondong": eupmyeondong, "extent_precision": extent_precision,
+    }
+    job_key = checkpoint_key(job_params)
+    saved_pages = checkpoint.load(job_key) if checkpoint is not None else {}
+    if saved_pages:
+        logger.info(f"중단된 수집 이어받기: 저장된 페이지 {len(saved_pages)}개")
+    crawl_stats.update({"planned_pages": 0, "units": 0})
+    
+    def fetch_details(atclNo, force_refresh=False):
+        """캐시 확인 후 상세 정보 수집, (상세 정보, 캐시 적중 여부) 반환"""
+        if detail_cache is not None and not bypass_cache and not force_refresh:
+            with metrics.stage("detail_cache"):
+                cached = detail_cache.get(atclNo)
+            if cached is not None:
+                with stats_lock:
+                    crawl_stats["hits"] += 1
+                return cached, True
+        with stats_lock:
+            crawl_stats["misses"] += 1
+        # 캐시를 쓰지 않거나 목록 필드가 바뀐 매물은 다른 세션이 받아 둔 상세 응답도 재사용하지 않음
+        shared = None if bypass_cache or force_refresh else response_cache
+        try:
+            details = fetch_property_details(atclNo, headers, metrics, limiter, pacer, shared)
+        except Exception as e:
+            logger.error(f"매물 상세 정보 수집 실패 (ID: {atclNo}): {e}")
+            with stats_lock:
+                failed_atclNos.add(str(atclNo))
+            return EMPTY_DETAILS, False
+        if detail_cache is not None:
+            with metrics.stage("detail_cache"):
+                detail_cache.put(atclNo, details)
+        return details, False
+    
+    def retry_failed(page_results, failed):
+        """체크포인트 페이지에서 상세 정보 요청이 실패했던 매물만 다시 요청해 레코드를 채우고, 여전히 실패한 매물번호 반환"""
+        failed_atclNos.clear()
+        for record in page_results:
+            if str(record["매물번호"]) not in failed:
+                continue
+            details, _ = fetch_details(record["매물번호"])
+            if any(details):
+                record["지역지구"], record["용도"], record["관리비"] = details[:3]
+                record["상세주소"] = record["상세주소"] or pick_detailed_address([details[3]])
+        return sorted(failed_atclNos)
+    
+    try:
+        # 검색 계획 - 이어받는 작업이면 처음 세운 계획을 그대로 사용 (페이지 번호가 같은 단위를 가리키도록)
+        units = checkpoint.load_plan(job_key) if checkpoint is not None and saved_pages else None
+        if units is None:
+            on_status("검색 계획 세우는 중..." if cluster_first else "검색 준비 중...")
+            with metrics.stage("cluster_plan"):
+                units = plan_crawl_units(cortarNo, rletTpCd, tradTpCd, tiles, max_pages, range_params, cluster_first,
+                                         headers, metrics, limiter, pacer, response_cache)
+            if checkpoint is not None:
+                checkpoint.save_plan(job_key, job_params, units)
+        units = [CrawlUnit(*unit) for unit in units]
+        crawl_stats["units"] = len(units)
+        crawl_stats["planned_pages"] = sum(unit.pages for unit in units)
+        if not units:
+            on_status("검색 범위에 매물이 없습니다.")
+        
+        for unit_no, unit in enumerate(units, start=1):
+            page_limit = unit.pages
+            page = 0
+            while page < page_limit:
+                page += 1
+                location = f"{unit.label} · 페이지 {page}/{page_limit}"
+                on_status(f"{location} 검색 중...")
+                on_progress(((unit_no - 1) + page / page_limit) / len(units))
+                
+                # 이전 실행에서 끝낸 페이지는 저장된 결과를 그대로 사용
+                if (unit_no, page) in saved_pages:
+                    page_atclNos, page_results, last, failed = saved_pages[(unit_no, page)]
+                    if failed:
+                        on_status(f"{location} 상세 정보 실패 매물 {len(failed)}건 다시 요청 중...")
+                        still_failed = retry_failed(page_results, set(failed))
+                        checkpoint.save_page(job_key, job_params, unit_no, page, page_atclNos, page_results, last,
+                                             failed=still_failed)
+                        crawl_stats["failed_details"] += len(still_failed)
+                    seen_atclNos.update(page_atclNos)
+                    if group_duplicates:
+                        for record in page_results:
+                            grouper.restore(record)
+                    crawl_stats["resumed_pages"] += 1
+                    metrics.count("resumed_pages")
+                    if page_results:
+                        yield page_results
+                    if last:
+                        break
+                    if unit.extendable and page == page_limit and page_limit < unit.pages + max_pages:
+                        page_limit += 1
+                    continue
+                
+                list_url = (
+                    f"{BASE_URL}/cluster/ajax/articleList?"
+                    f"itemId={cortarNo}&rletTpCd={rletTpCd}&tradTpCd={tradTpCd}&{unit.query}{range_params}&page={page}"
+                )
+                
+                response = fetch_shared(list_url, headers, "list", 10, metrics, limiter, pacer, response_cache)
+                response.raise_for_status()
+                
+                with metrics.stage("list_parse"):
+                    data = response.json()
+                items = data.get("body", [])
+                more = bool(data.get("more", True))
+                metrics.count("listed", len(items))
+                
+                if not items:
+                    on_status(f"{unit.label} · 페이지 {page}에서 더 이상 매물이 없습니다.")
+                    if checkpoint is not None:
+                        checkpoint.save_page(job_key, job_params, unit_no, page, [], [], last=True)
+                    break
+                
+                # 타일 경계에 걸쳐 여러 번 나온 매물은 한 번만 수집
+                items = [item for item in items if item.get("atclNo") and item["atclNo"] not in seen_atclNos]
+                failed_atclNos.clear()
+                seen_atclNos.update(item["atclNo"] for item in items)
+                page_atclNos = [item["atclNo"] for item in items]
+                
+                # 조건에 맞지 않는 매물은 상세 수집 전에 제외
+                if area_range is not None or price_range is not None:
+                    with metrics.stage("filter"):
+                        matched = filter_list_items(
+                            items,
+                            area_range is not None, *(area_range or (0, 0)),
+                            price_range is not None, *(price_range or (0, 0))
+                        )
+                    crawl_stats["filtered_out"] += len(items) - len(matched)
+                    items = matched
+                
+                # 증분 수집: 지문이 그대로인 매물은 저장된 상세 정보로 채움
+                stored_details = {}
+                changed_atclNos = set()
+                if listing_store is not None:
+                    with metrics.stage("detail_cache"):
+                        known = listing_store.get_many(item["atclNo"] for item in items)
+                    for item in items:
+                        atclNo = str(item["atclNo"])
+                        if atclNo not in known:
+                            continue
+                        fingerprint, details = known[atclNo]
+                        if fingerprint == listing_fingerprint(item):
+                            stored_details[atclNo] = details
+                        else:
+                            changed_atclNos.add(atclNo)
+                    listing_store.touch(stored_details)
+                    crawl_stats["unchanged"] += len(stored_details)
+                
+                def collect(item):
+                    """저장소/캐시/상세 페이지 순으로 상세 정보를 얻고 (상세 정보, 요청 생략 여부) 반환"""
+                    atclNo = str(item["atclNo"])
+                    if atclNo in stored_details:
+                        return stored_details[atclNo], True
+                    if lazy_details:
+                        # 요청 없이 얻을 수 있는 캐시 값만 사용
+                        cached = None
+                        if detail_cache is not None and not bypass_cache and atclNo not in changed_atclNos:
+                            with metrics.stage("detail_cache"):
+                                cached = detail_cache.get(atclNo)
+                        with stats_lock:
+                            crawl_stats["hits" if cached is not None else "deferred"] += 1
+                        details = cached if cached is not None else EMPTY_DETAILS
+                        if listing_store is not None:
+                            # 상세 정보는 DetailEnricher가 채운 뒤 set_details()로 저장
+                            listing_store.upsert(item, details, pending=True)
+                        return details, True
+                    details, cache_hit = fetch_details(item["atclNo"], force_refresh=atclNo in changed_atclNos)
+                    if listing_store is not None:
+                        listing_store.upsert(item, details)
+                    return details, cache_hit
+                
+                # 중복 매물 묶기: 묶음마다 처음 본 매물(대표)만 상세 정보를 얻음
+                groups = {
+                    str(item["atclNo"]): (grouper.assign(item["atclNo"], duplicate_group_key(item))
+                                          if group_duplicates else str(item["atclNo"]))
+                    for item in items
+                }
+                
+                def shared_details(item):
+                    """대표가 아닌 매물의 상세 정보 (증분 저장소의 자기 값 또는 대표의 값)
+
+                    대표이거나 대표의 상세 정보가 아직 없으면(나중에 채우거나 요청이 실패해 비어 있어도) None이다.
+                    """
+                    atclNo = str(item["atclNo"])
+                    if groups[atclNo] == atclNo:
+                        return None
+                    if atclNo in stored_details:
+                        return stored_details[atclNo]
+                    details = grouper.details.get(groups[atclNo])
+                    if details is None or not any(details):
+                        return None
+                    with stats_lock:
+                        crawl_stats["grouped"] += 1
+                    return details
+                
+                def keep_group_details(group, details):
+                    """묶음의 상세 정보 보관 (이미 있는 값이 비어 있을 때만 바꿈)"""
+                    if not any(grouper.details.get(group, EMPTY_DETAILS)):
+                        grouper.details[group] = details
+                
+                if concurrent_mode:
+                    # 페이지 단위로 대표 매물만 병렬 수집 후 목록 순서대로 결과 조립
+                    futures = {
+                        str(item["atclNo"]): executor.submit(collect, item)
+                        for item in items if groups[str(item["atclNo"])] == str(item["atclNo"])
+                    }
+                    for done, _ in enumerate(as_completed(futures.values()), start=1):
+                        on_status(f"{location} - 매물 {done}/{len(futures)} 상세정보 수집 완료 (병렬)")
+                    for atclNo, future in futures.items():
+                        grouper.details[atclNo] = future.result()[0]
+                    page_results = []
+                    for item in items:
+                        atclNo = str(item["atclNo"])
+                        details = grouper.details[atclNo] if atclNo in futures else shared_details(item)
+                        if details is None:
+                            details = collect(item)[0]
+                            keep_group_details(groups[atclNo], details)
+                        page_results.append(build_property_record(
+                            item, details, cortarNo, rletTpCd, tradTpCd, sido, sigungu, record_dong, groups[atclNo]
+                        ))
+                else:
+                    page_results = []
+                    for i, item in enumerate(items):
+                        on_status(f"{location} - 매물 {i+1}/{len(items)} 상세정보 수집 중...")
+                        
+                        # 상세 정보 수집 (웹 스크래핑) - 중복 묶음의 대표가 아니면 대표의 값을 복사
+                        atclNo = str(item["atclNo"])
+                        details = shared_details(item)
+                        cache_hit = details is not None
+                        if details is None:
+                            details, cache_hit = collect(item)
+                            keep_group_details(groups[atclNo], details)
+                        page_results.append(build_property_record(
+                            item, details, cortarNo, rletTpCd, tradTpCd, sido, sigungu, record_dong, groups[atclNo]
+                        ))
+                        if not cache_hit and delay_time:
+                            with metrics.stage("sleep"):
+                                time.sleep(delay_time)
+                
+                crawl_stats["failed_details"] += len(failed_atclNos)
+                if checkpoint is not None:
+                    checkpoint.save_page(job_key, job_params, unit_no, page, page_atclNos, page_results, last=not more,
+                                         failed=failed_atclNos)
+                yield page_results
+                
+                # 응답이 마지막 페이지라고 알려 주면 빈 페이지를 요청하지 않음
+                if not more:
+                    break
+                # 클러스터 계획 이후 매물이 늘어난 경우 max_pages까지 더 요청
+                if unit.extendable and page == page_limit and page_limit < unit.pages + max_pages:
+                    page_limit += 1
+                
+                # 페이지 간 딜레이 (순차 모드)
+                if not concurrent_mode and page < page_limit and delay_time:
+                    with metrics.stage("sleep"):
+                        time.sleep(delay_time * 2)
+        
+        if checkpoint is not None:
+            if crawl_stats["failed_details"]:
+                # 상세 정보가 빠진 매물이 남아 있으면 다시 요청할 수 있도록 체크포인트를 남겨 둠
+                on_status(f"상세 정보 수집 실패 {crawl_stats['failed_details']}건 - {RETRY_HINT}")
+            else:
+                checkpoint.complete(job_key)
+                    
+    except requests.RequestException as e:
+        logger.error(f"네이버 접속 오류: {e}")
+        if on_error:
+            on_error(f"네이버 접속 오류: {str(e)}{RESUME_HINT if checkpoint is not None else ''}")
+    except Exception as e:
+        logger.error(f"예상치 못한 오류: {e}")
+        if on_error:
+            on_error(f"예상치 못한 오류: {str(e)}{RESUME_HINT if checkpoint is not None else ''}")
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def search_properties(*args, **kwargs):
+    """매물을 검색하는 함수 (iter_property_pages와 같은 인자, 전체 결과를 리스트로 반환)"""
+    return [record for page_results in iter_property_pages(*args, **kwargs) for record in page_results]
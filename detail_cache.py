@@ -0,0 +1,84 @@
+import sqlite3
+import threading
+import time
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DetailCache:
+    """매물 상세 정보(scrape_property_details 결과)를 매물번호 기준으로 저장하는 SQLite 캐시
+
+    - ttl_seconds가 지난 항목은 조회되지 않는다.
+    - 항목 수가 max_entries를 넘으면 가장 오래 전에 수집된 항목부터 삭제한다.
+    - 여러 스레드(동시 수집 모드)에서 함께 사용할 수 있다. 같은 파일을 여러 인스턴스/프로세스가 열 수 있으므로
+      항목 수는 따로 세지 않고 매번 테이블에서 센다 (COUNT(*)는 5만 개에서도 0.1ms 미만).
+    """
+
+    def __init__(self, path="detail_cache.sqlite3", ttl_seconds=24 * 3600, max_entries=50000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS details ("
+            "atclNo TEXT PRIMARY KEY, "
+            "payload TEXT NOT NULL, "
+            "fetched_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_details_fetched_at ON details(fetched_at)")
+        self._conn.commit()
+
+    def get(self, atclNo):
+        """유효한 캐시 항목이 있으면 (용도지역, 건물용도, 관리비, 상세주소) 튜플을, 없으면 None 반환"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at FROM details WHERE atclNo = ?", (str(atclNo),)
+            ).fetchone()
+        if row is None:
+            return None
+        payload, fetched_at = row
+        if time.time() - fetched_at > self.ttl_seconds:
+            return None
+        return tuple(json.loads(payload))
+
+    def put(self, atclNo, details):
+        """상세 정보 저장 (모든 값이 비어 있으면 요청 실패로 보고 저장하지 않음)"""
+        if not any(details):
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO details (atclNo, payload, fetched_at) VALUES (?, ?, ?)",
+                (str(atclNo), json.dumps(list(details), ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+            if self._conn.execute("SELECT COUNT(*) FROM details").fetchone()[0] > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        """만료 항목과 초과 항목 삭제 (호출 시 _lock 보유)"""
+        self._conn.execute("DELETE FROM details WHERE fetched_at < ?", (time.time() - self.ttl_seconds,))
+        count = self._conn.execute("SELECT COUNT(*) FROM details").fetchone()[0]
+        # 매번 정리하지 않도록 상한의 90%까지 줄임
+        target = int(self.max_entries * 0.9)
+        if count > target:
+            self._conn.execute(
+                "DELETE FROM details WHERE atclNo IN "
+                "(SELECT atclNo FROM details ORDER BY fetched_at ASC LIMIT ?)",
+                (count - target,),
+            )
+            count = target
+        self._conn.commit()
+        logger.info(f"상세 정보 캐시 정리 완료: {count}개 항목 유지")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM details").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM details")
+            self._conn.commit()
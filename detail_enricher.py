@@ -0,0 +1,161 @@
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from crawler import HEADERS, DETAIL_COLUMNS, fetch_property_details, pick_detailed_address
+from listing_groups import GROUP_COLUMN
+
+logger = logging.getLogger(__name__)
+
+# 상세 페이지에서만 얻는 컬럼 (상세주소는 목록 필드로도 채워지므로 수집 여부 판단에 쓰지 않음)
+SCRAPED_COLUMNS = DETAIL_COLUMNS[:3]
+
+
+class DetailEnricher:
+    """목록만으로 만든 레코드의 상세 정보를 백그라운드 스레드에서 채우는 작업자
+
+    submit()으로 매물번호를 넣으면 캐시 확인 후 상세 페이지를 요청하고, 끝난 결과는 take()로 가져간다.
+    같은 매물번호는 한 번만 요청한다. 요청이 실패한 매물은 캐시에 넣지 않고 예약 목록에서 빼므로
+    다시 submit()할 수 있다 (실패 수는 failed).
+    watch()로 상세 정보가 비어 있는 매물번호를 등록해 두면 수집에 성공한 매물(상세 페이지에 값이 없었어도)은
+    blank에서 빠지므로, 화면을 갱신할 때마다 결과 전체에서 빈 행을 다시 찾지 않아도 된다.
+    limiter/pacer/response_cache는 iter_property_pages와 같은 방식으로 쓴다. bypass_cache가 켜지면 detail_cache를
+    읽지 않고(갱신만 함) response_cache도 거치지 않는다.
+    listing_store(ListingStore)가 주어지면 얻은 상세 정보를 증분 저장소에도 저장한다. groups({대표 매물번호:
+    [같은 묶음의 매물번호, ...]}, group_members(df))가 주어지면 대표의 상세 정보를 묶음의 매물 모두에 저장한다.
+    """
+
+    def __init__(self, detail_cache=None, max_workers=4, limiter=None, pacer=None, metrics=None, headers=HEADERS,
+                 response_cache=None, bypass_cache=False, listing_store=None, groups=None):
+        self.detail_cache = detail_cache
+        self.listing_store = listing_store
+        self.groups = groups or {}
+        self.bypass_cache = bypass_cache
+        self.response_cache = None if bypass_cache else response_cache
+        self.limiter = limiter
+        self.pacer = pacer
+        self.metrics = metrics
+        self.headers = headers
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self._blank = {}
+        self._lock = threading.Lock()
+        self._requested = set()
+        self._ready = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="detail-enricher")
+
+    def submit(self, atclNos):
+        """매물번호들의 상세 수집 예약 (이미 예약한 매물은 제외), 새로 예약한 수 반환"""
+        with self._lock:
+            new = [str(atclNo) for atclNo in dict.fromkeys(atclNos) if str(atclNo) not in self._requested]
+            self._requested.update(new)
+            self.submitted += len(new)
+        for atclNo in new:
+            self._executor.submit(self._fetch, atclNo)
+        return len(new)
+
+    def watch(self, atclNos):
+        """상세 정보가 비어 있는 매물번호 등록 (pending_detail_atclNos 결과)"""
+        with self._lock:
+            self._blank.update(dict.fromkeys(str(atclNo) for atclNo in atclNos))
+
+    @property
+    def blank(self):
+        """아직 상세 정보를 얻지 못한 매물번호 리스트 (등록 순서)"""
+        with self._lock:
+            return list(self._blank)
+
+    def _fetch(self, atclNo):
+        details = self.detail_cache.get(atclNo) if self.detail_cache is not None and not self.bypass_cache else None
+        if details is None:
+            try:
+                details = fetch_property_details(atclNo, self.headers, self.metrics, self.limiter, self.pacer,
+                                                 self.response_cache)
+            except Exception as e:
+                logger.error(f"매물 상세 정보 수집 실패 (ID: {atclNo}): {e}")
+                with self._lock:
+                    self._requested.discard(atclNo)
+                    self.failed += 1
+                return
+            if self.detail_cache is not None:
+                self.detail_cache.put(atclNo, details)
+        if self.listing_store is not None:
+            self.listing_store.set_details(self.groups.get(atclNo, [atclNo]), details)
+        with self._lock:
+            self._ready[atclNo] = details
+            self._blank.pop(atclNo, None)
+            self.completed += 1
+
+    def take(self):
+        """지난 take() 이후 끝난 {매물번호: 상세 정보 튜플}"""
+        with self._lock:
+            ready, self._ready = self._ready, {}
+        return ready
+
+    @property
+    def pending(self):
+        return self.submitted - self.completed - self.failed
+
+    def shutdown(self):
+        """아직 시작하지 않은 요청 취소"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _group_ids(df):
+    """행별 상세 정보 요청 대상 매물번호 (중복 묶음이면 대표의 매물번호) 문자열 Series"""
+    return df[GROUP_COLUMN if GROUP_COLUMN in df.columns else "매물번호"].astype(str)
+
+
+def group_members(df):
+    """{상세 정보 요청 대상 매물번호: [같은 묶음의 매물번호, ...]}"""
+    members = {}
+    for group, atclNo in zip(_group_ids(df), df["매물번호"].astype(str)):
+        members.setdefault(group, []).append(atclNo)
+    return members
+
+
+def detail_targets(df, rows):
+    """행 위치 목록의 상세 정보 요청 대상 매물번호 리스트 (같은 묶음은 한 번만)"""
+    return list(dict.fromkeys(_group_ids(df).iloc[rows]))
+
+
+def pending_detail_atclNos(df):
+    """상세 페이지 컬럼(SCRAPED_COLUMNS)이 모두 비어 있는 행의 매물번호 리스트 (중복 묶음은 대표 하나만)"""
+    if df.empty:
+        return []
+    blank = df[SCRAPED_COLUMNS].astype(object).fillna("").eq("").all(axis=1)
+    return list(dict.fromkeys(_group_ids(df)[blank]))
+
+
+def _assign(df, mask, column, values):
+    """df.loc[mask, column] = values (범주형 컬럼이면 새 값을 범주에 먼저 추가)"""
+    if isinstance(df[column].dtype, pd.CategoricalDtype):
+        new = pd.Index(values).unique().difference(df[column].cat.categories)
+        if len(new):
+            df[column] = df[column].cat.add_categories(new)
+    df.loc[mask, column] = values
+
+
+def apply_details(df, details):
+    """{매물번호: 상세 정보 튜플}을 상세 컬럼에 반영한 새 DataFrame (해당 매물이 없으면 df 그대로)
+
+    중복 묶음 대표의 상세 정보는 같은 묶음의 매물 모두에 반영한다.
+    상세주소는 비어 있는 행에만, 레코드를 만들 때와 같은 기준(pick_detailed_address)을 통과한 값으로 채운다.
+    """
+    if not details or df.empty:
+        return df
+    rows = _group_ids(df)
+    matched = rows.isin(details.keys()).to_numpy()
+    if not matched.any():
+        return df
+    filled = pd.DataFrame([details[atclNo] for atclNo in rows[matched]], columns=DETAIL_COLUMNS)
+    filled["상세주소"] = [pick_detailed_address([address]) for address in filled["상세주소"]]
+    df = df.copy()
+    for column in SCRAPED_COLUMNS:
+        _assign(df, matched, column, filled[column].to_numpy())
+    address_blank = df["상세주소"].astype(object).fillna("").eq("").to_numpy()
+    _assign(df, matched & address_blank, "상세주소", filled["상세주소"].to_numpy()[address_blank[matched]])
+    return df
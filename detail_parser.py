@@ -0,0 +1,182 @@
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# 상세 주소 후보 셀렉터 (순서대로 검사, 같은 길이면 먼저 나온 것 유지)
+ADDRESS_SELECTORS = [
+    "div.article_header",
+    "div.article_info",
+    "div.location_info",
+    "div.addr_info",
+    "h1",
+    "h2",
+    ".article_title"
+]
+ADDRESS_KEYWORDS = ["동", "로", "길", "가", "번지"]
+# 상세 정보 박스 div 클래스
+DETAIL_CLASSES = ["detail_box", "info_detail", "article_detail", "detail_info", "item_detail"]
+DETAIL_KEYWORDS = ["용도지역", "건물용도", "관리비"]
+FACTORY_KEYWORDS = ["공장", "창고", "물류", "제조", "생산"]
+
+
+def _value_after(text, keyword):
+    """줄 단위 텍스트에서 keyword가 있는 첫 줄의 다음 줄"""
+    lines = text.split("\n")
+    for i, line in enumerate(lines):
+        if keyword in line and i + 1 < len(lines):
+            return lines[i + 1].strip()
+    return ""
+
+
+def _fill_fields(fields, text):
+    """아직 비어 있는 용도지역/건물용도/관리비 값을 text에서 채움"""
+    for keyword in DETAIL_KEYWORDS:
+        if keyword in text and not fields[keyword]:
+            fields[keyword] = _value_after(text, keyword)
+
+
+def _pick_address(texts):
+    """주소 키워드가 있는 100자 미만 텍스트 중 가장 긴 것"""
+    detailed_address = ""
+    for text in texts:
+        if text and any(keyword in text for keyword in ADDRESS_KEYWORDS):
+            if len(text) > len(detailed_address) and len(text) < 100:  # 너무 긴 텍스트 제외
+                detailed_address = text
+    return detailed_address
+
+
+def _factory_purpose(title_text):
+    """공장/창고의 경우 특별 처리 - 제목에서 용도 추출"""
+    if any(keyword in title_text for keyword in FACTORY_KEYWORDS):
+        return "공장/창고"
+    return ""
+
+
+def extract_details_soup(html):
+    """BeautifulSoup(html.parser) 기반 상세 정보 추출 - (용도지역, 건물용도, 관리비, 상세주소)"""
+    soup = BeautifulSoup(html, "html.parser")
+
+    # 상세 주소 정보 추출
+    detailed_address = _pick_address(
+        elem.get_text(strip=True) for selector in ADDRESS_SELECTORS for elem in soup.select(selector)
+    )
+
+    # 다양한 클래스로 정보 추출 시도
+    detail_boxes = []
+    for class_name in DETAIL_CLASSES:
+        detail_boxes.extend(soup.find_all("div", class_=class_name))
+
+    # 추가로 모든 div 태그에서 키워드 검색
+    if not detail_boxes:
+        all_divs = soup.find_all("div")
+        detail_boxes = [div for div in all_divs if div.get_text() and any(keyword in div.get_text() for keyword in DETAIL_KEYWORDS)]
+
+    fields = dict.fromkeys(DETAIL_KEYWORDS, "")
+    for box in detail_boxes:
+        _fill_fields(fields, box.get_text(strip=True, separator="\n"))
+
+    purpose = fields["건물용도"]
+    if not purpose:
+        title_elem = soup.find("h1") or soup.find("title")
+        if title_elem:
+            purpose = _factory_purpose(title_elem.get_text())
+
+    return fields["용도지역"], purpose, fields["관리비"], detailed_address
+
+
+# BeautifulSoup get_text()와 같이 텍스트로 보지 않는 태그
+_NON_TEXT_TAGS = {"script", "style", "template"}
+
+
+def _strings(element):
+    """element 하위의 텍스트 조각 (주석, script/style/template 내용 제외, 문서 순서)"""
+    if element.tag in _NON_TEXT_TAGS:
+        return
+    if element.text:
+        yield element.text
+    for child in element:
+        if isinstance(child.tag, str):
+            yield from _strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _text(element, strip=False, separator=""):
+    if strip:
+        return separator.join(piece for piece in (s.strip() for s in _strings(element)) if piece)
+    return separator.join(_strings(element))
+
+
+def extract_details_lxml(html):
+    """lxml 기반 상세 정보 추출 - extract_details_soup과 같은 결과
+
+    문서를 lxml로 파싱한 뒤 요소를 한 번만 순회하며 주소 후보, 상세 박스, 제목 요소를
+    분류하고, 텍스트는 분류된 요소의 하위 트리에서만 만든다. 상세 박스가 없을 때의
+    div 전체 검색도 문서 순서로 진행하다가 세 값을 모두 찾으면 멈춘다.
+    """
+    if not html or not html.strip():
+        return "", "", "", ""
+    root = etree.fromstring(html.encode("utf-8"), etree.HTMLParser(encoding="utf-8"))
+    if root is None:
+        return "", "", "", ""
+
+    address_elements = [[] for _ in ADDRESS_SELECTORS]
+    detail_elements = [[] for _ in DETAIL_CLASSES]
+    divs = []
+    first_h1 = first_title = None
+    for element in root.iter():
+        tag = element.tag
+        if not isinstance(tag, str):
+            continue
+        classes = element.get("class", "").split()
+        if tag == "div":
+            divs.append(element)
+            for i, class_name in enumerate(ADDRESS_SELECTORS[:4]):
+                if class_name[4:] in classes:
+                    address_elements[i].append(element)
+            for i, class_name in enumerate(DETAIL_CLASSES):
+                if class_name in classes:
+                    detail_elements[i].append(element)
+        elif tag == "h1":
+            address_elements[4].append(element)
+            if first_h1 is None:
+                first_h1 = element
+        elif tag == "h2":
+            address_elements[5].append(element)
+        elif tag == "title" and first_title is None:
+            first_title = element
+        if "article_title" in classes:
+            address_elements[6].append(element)
+
+    detailed_address = _pick_address(
+        _text(element, strip=True) for elements in address_elements for element in elements
+    )
+
+    fields = dict.fromkeys(DETAIL_KEYWORDS, "")
+    detail_boxes = [element for elements in detail_elements for element in elements]
+    if detail_boxes:
+        for box in detail_boxes:
+            _fill_fields(fields, _text(box, strip=True, separator="\n"))
+    else:
+        for div in divs:
+            if all(fields.values()):
+                break
+            raw_text = _text(div)
+            if raw_text and any(keyword in raw_text for keyword in DETAIL_KEYWORDS):
+                _fill_fields(fields, _text(div, strip=True, separator="\n"))
+
+    purpose = fields["건물용도"]
+    if not purpose:
+        title_elem = first_h1 if first_h1 is not None else first_title
+        if title_elem is not None:
+            purpose = _factory_purpose(_text(title_elem))
+
+    return fields["용도지역"], purpose, fields["관리비"], detailed_address
+
+
+# lxml이 없으면 기존 html.parser 경로 사용
+extract_property_details = extract_details_lxml if LXML_AVAILABLE else extract_details_soup
@@ -0,0 +1,95 @@
+import io
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+EXCEL_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def column_widths(df, max_width=50):
+    """DataFrame 열별 엑셀 너비 (헤더와 값의 최대 문자열 길이 + 2, 최대 max_width)
+
+    열마다 벡터화된 문자열 길이 계산 한 번으로 구하므로 셀 단위로 순회하지 않는다.
+    """
+    widths = []
+    for column in df.columns:
+        # 범주형 열은 ""가 범주에 없어 fillna가 실패하므로 object로 바꾼 뒤 채움
+        lengths = df[column].astype(object).fillna("").astype(str).str.len()
+        max_length = max(len(str(column)), int(lengths.max()) if len(lengths) else 0)
+        widths.append(min(max_length + 2, max_width))
+    return widths
+
+
+# 엑셀로 기록할 때 한 번에 object 값으로 바꾸는 행 수
+EXCEL_CHUNK_ROWS = 5000
+
+
+class ExcelStreamWriter:
+    """DataFrame 묶음(정규화된 결과의 일부 행)을 도착하는 대로 write-only 워크북에 기록하는 엑셀 작성기
+
+    openpyxl write-only 모드는 행을 임시 파일로 바로 내보내므로 전체 결과를 워크시트 객체로
+    메모리에 들고 있지 않고, 셀 값 변환도 묶음 단위로만 한다. 열 너비는 첫 행을 쓰기 전에 정해야 하므로
+    widths가 없으면 첫 번째 묶음으로 계산한다.
+    """
+
+    def __init__(self, sheet_name='매물정보', max_width=50, widths=None):
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet(sheet_name)
+        self.max_width = max_width
+        self.widths = widths
+        self.columns = None
+        self.row_count = 0
+
+    def append(self, chunk):
+        """DataFrame 묶음을 시트에 추가 (첫 묶음의 컬럼으로 헤더 기록, 빈 묶음이면 헤더만)"""
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            widths = self.widths if self.widths is not None else column_widths(chunk, self.max_width)
+            for index, width in enumerate(widths, start=1):
+                self.sheet.column_dimensions[get_column_letter(index)].width = width
+            self.sheet.append([str(column) for column in self.columns])
+        chunk = chunk[self.columns]
+        for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+            self.sheet.append(row)
+        self.row_count += len(chunk)
+
+    def to_bytes(self):
+        """워크북을 저장한 xlsx 바이트 (한 번만 호출 가능)"""
+        output = io.BytesIO()
+        self.workbook.save(output)
+        return output.getvalue()
+
+
+def dataframe_to_excel_bytes(df, sheet_name='매물정보', max_width=50, chunk_rows=EXCEL_CHUNK_ROWS):
+    """DataFrame을 chunk_rows행씩 ExcelStreamWriter로 기록한 xlsx 바이트 (열 너비는 전체 결과 기준)"""
+    writer = ExcelStreamWriter(sheet_name, max_width, widths=column_widths(df, max_width))
+    for start in range(0, max(len(df), 1), chunk_rows):
+        writer.append(df.iloc[start:start + chunk_rows])
+    return writer.to_bytes()
+
+
+def dataframe_to_csv_bytes(df):
+    """엑셀에서 한글이 깨지지 않도록 BOM을 붙인 UTF-8 CSV 바이트"""
+    return df.to_csv(index=False).encode('utf-8-sig')
+
+
+def dataframe_to_parquet_bytes(df):
+    """Parquet 바이트 (pyarrow 필요)"""
+    output = io.BytesIO()
+    df.to_parquet(output, index=False, engine='pyarrow')
+    return output.getvalue()
+
+
+# 형식 이름 → (확장자, MIME, 변환 함수)
+EXPORT_FORMATS = {
+    "Excel (.xlsx)": ("xlsx", EXCEL_MIME, dataframe_to_excel_bytes),
+    "CSV (.csv)": ("csv", "text/csv", dataframe_to_csv_bytes),
+}
+if PARQUET_AVAILABLE:
+    EXPORT_FORMATS["Parquet (.parquet)"] = ("parquet", "application/vnd.apache.parquet", dataframe_to_parquet_bytes)
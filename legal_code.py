@@ -0,0 +1,296 @@
+import os
+import heapq
+import logging
+
+import pandas as pd
+
+from region_geo import RegionGeoIndex
+
+logger = logging.getLogger(__name__)
+
+LEGAL_CODE_COLUMNS = ['법정동코드', '시도', '시군구', '읍면동']
+
+
+def read_legal_code_csv(path="법정동코드.csv"):
+    """법정동코드 CSV를 읽어 표준 컬럼명(법정동코드/시도/시군구/읍면동)의 DataFrame으로 반환"""
+    # 여러 인코딩으로 시도
+    encodings = ['utf-8', 'utf-8-sig', 'cp949', 'euc-kr']
+    law_df = None
+
+    for encoding in encodings:
+        try:
+            law_df = pd.read_csv(path, dtype=str, encoding=encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+
+    if law_df is None:
+        raise ValueError(f"{os.path.basename(path)} 파일 읽기 실패 (인코딩 문제)")
+
+    # 다양한 컬럼명 패턴 지원
+    columns = law_df.columns.tolist()
+    column_mapping = {}
+    for col in columns:
+        col_lower = col.strip().lower()
+        if '법정동' in col or 'code' in col_lower or '코드' in col:
+            column_mapping['법정동코드'] = col
+        elif '시도' in col or 'sido' in col_lower:
+            column_mapping['시도'] = col
+        elif '시군구' in col or 'sigungu' in col_lower or '구군' in col:
+            column_mapping['시군구'] = col
+        elif '읍면동' in col or 'dong' in col_lower or '동' in col:
+            column_mapping['읍면동'] = col
+
+    # 필수 컬럼 확인
+    missing_cols = [col for col in LEGAL_CODE_COLUMNS if col not in column_mapping]
+    if missing_cols:
+        raise ValueError(f"CSV 파일에 필요한 컬럼이 없습니다: {missing_cols}. 현재 컬럼: {columns}")
+
+    law_df = law_df.rename(columns={v: k for k, v in column_mapping.items()})
+
+    # 공백 제거 및 정규화
+    for col in ['시도', '시군구', '읍면동']:
+        law_df[col] = law_df[col].astype(str).str.strip()
+
+    return law_df[LEGAL_CODE_COLUMNS]
+
+
+class LegalCodeIndex:
+    """시도 → 시군구 → 읍면동 → 법정동코드 계층 인덱스
+
+    CSV를 한 번만 파싱해 메모리에 보관한다. 정확한 일치는 dict 조회(O(1))로,
+    부분 일치는 자동완성 인덱스(RegionAutocomplete)의 단계별 n-gram 포스팅 교집합으로 후보를 구해 찾으며
+    결과는 메모이즈한다.
+    """
+
+    def __init__(self, law_df):
+        self.df = law_df
+        self.tree = {}
+        for code, sido, sigungu, dong in law_df[LEGAL_CODE_COLUMNS].itertuples(index=False):
+            # 같은 지역명이 중복되면 파일에서 먼저 나온 코드를 사용
+            self.tree.setdefault(sido, {}).setdefault(sigungu, {}).setdefault(dong, code)
+        self._partial_cache = {}
+        self.autocomplete = RegionAutocomplete(law_df)
+        self.geo = RegionGeoIndex(law_df)
+        # 자동완성 entry id → 계층 인덱스 순회 순서 (부분 일치가 여럿이면 이 순서로 첫 번째를 고름)
+        tree_order = {
+            names: rank for rank, names in enumerate(
+                (sido, sigungu, dong)
+                for sido, sigungus in self.tree.items()
+                for sigungu, dongs in sigungus.items()
+                for dong in dongs
+            )
+        }
+        self._entry_rank = [tree_order[entry[1:]] for entry in self.autocomplete.entries]
+
+    @classmethod
+    def from_csv(cls, path="법정동코드.csv"):
+        index = cls(read_legal_code_csv(path))
+        logger.info(f"법정동코드 인덱스 생성 완료: {len(index.df)}행")
+        return index
+
+    def find_exact(self, sido, sigungu, eupmyeondong):
+        """정확히 일치하는 법정동코드, 없으면 None"""
+        return self.tree.get(sido, {}).get(sigungu, {}).get(eupmyeondong)
+
+    def _matching_areas(self, sido, sigungu):
+        """시도/시군구 이름에 입력값이 포함되는 (시도, 시군구, 읍면동 dict) 후보"""
+        return [
+            (sido_name, sigungu_name, dongs)
+            for sido_name, sigungus in self.tree.items() if sido in sido_name
+            for sigungu_name, dongs in sigungus.items() if sigungu in sigungu_name
+        ]
+
+    def find_partial(self, sido, sigungu, eupmyeondong):
+        """세 단계 모두 부분 일치하는 첫 번째(계층 인덱스 순서) 법정동코드, 없으면 None"""
+        key = (sido, sigungu, eupmyeondong)
+        if key not in self._partial_cache:
+            if len(self._partial_cache) > 10000:
+                self._partial_cache.clear()
+            matches = self.autocomplete.level_matches((eupmyeondong, sigungu, sido))
+            best = min(matches, key=self._entry_rank.__getitem__, default=None)
+            self._partial_cache[key] = None if best is None else self.autocomplete.entries[best][0]
+        return self._partial_cache[key]
+
+    def dongs_in_area(self, sido, sigungu, limit=10):
+        """시도/시군구가 부분 일치하는 지역의 읍면동 이름 (최대 limit개)"""
+        names = []
+        for _, _, dongs in self._matching_areas(sido, sigungu):
+            for dong_name in dongs:
+                if dong_name not in names:
+                    names.append(dong_name)
+                    if len(names) >= limit:
+                        return names
+        return names
+
+
+CHOSUNG_LIST = [
+    'ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ',
+    'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ',
+]
+CHOSUNG_SET = set(CHOSUNG_LIST)
+
+
+def to_chosung(text):
+    """한글 음절을 초성으로 바꾼 문자열 (그 외 문자는 그대로, 길이 유지)"""
+    return "".join(
+        CHOSUNG_LIST[(ord(ch) - 0xAC00) // 588] if '가' <= ch <= '힣' else ch
+        for ch in text
+    )
+
+
+def _ngrams(text, sizes=(1, 2)):
+    return {text[i:i + n] for n in sizes for i in range(len(text) - n + 1)}
+
+
+class RegionAutocomplete:
+    """법정동코드 표 기반 지역명 자동완성 인덱스
+
+    "시도 시군구 읍면동" 문자열의 문자 1/2-gram 인덱스와, 같은 문자열을 초성으로
+    바꾼 뒤의 1/2-gram 인덱스를 미리 만들어 둔다. 공백으로 나뉜 검색어 토큰마다
+    포스팅 목록의 교집합으로 후보를 좁힌 뒤 실제 일치 여부를 확인하고 순위를 매긴다.
+    초성만 입력("ㅅㅅㄷ")하거나 음절과 초성을 섞어("삼ㅅ") 입력해도 된다.
+
+    순위는 토큰마다 읍면동 > 시군구 > 시도 순, 같은 단계에서는 접두 일치가 우선이며
+    동점이면 짧은 지역명, 법정동코드 순이다.
+    """
+
+    def __init__(self, law_df):
+        rows = law_df[LEGAL_CODE_COLUMNS].drop_duplicates(subset=['시도', '시군구', '읍면동'])
+        # entry id 순서 자체가 동점 처리 순서(짧은 지역명, 코드 순)가 되도록 정렬
+        self.entries = sorted(
+            rows.itertuples(index=False, name=None),
+            key=lambda entry: (len(" ".join(entry[1:])), entry[0]),
+        )
+
+        self._texts = []
+        self._chosung_texts = []
+        self._fields = []
+        self._ngram_index = {}
+        self._chosung_index = {}
+        # (단계, n-gram) / (단계, 접두어) → entry id 집합, 단계 0=읍면동, 1=시군구, 2=시도
+        self._level_index = {}
+        self._level_prefix = {}
+        for entry_id, (_, sido, sigungu, dong) in enumerate(self.entries):
+            text = f"{sido} {sigungu} {dong}"
+            chosung_text = to_chosung(text)
+            self._texts.append(text)
+            self._chosung_texts.append(chosung_text)
+            self._fields.append(tuple((name, to_chosung(name)) for name in (dong, sigungu, sido)))
+            for gram in _ngrams(text):
+                self._ngram_index.setdefault(gram, set()).add(entry_id)
+            for gram in _ngrams(chosung_text):
+                self._chosung_index.setdefault(gram, set()).add(entry_id)
+            for level, (name, name_chosung) in enumerate(self._fields[-1]):
+                for form in (name, name_chosung):
+                    for gram in _ngrams(form):
+                        self._level_index.setdefault((level, gram), set()).add(entry_id)
+                    for size in (1, 2):
+                        self._level_prefix.setdefault((level, form[:size]), set()).add(entry_id)
+        self._query_cache = {}
+
+    @staticmethod
+    def _find(token, text, chosung_text):
+        """토큰이 text에 처음 나오는 위치, 없으면 -1 (토큰 안의 초성은 해당 위치의 초성과 비교)"""
+        if not any(ch in CHOSUNG_SET for ch in token):
+            return text.find(token)
+        token_chosung = to_chosung(token)
+        start = chosung_text.find(token_chosung)
+        while start != -1:
+            if all(ch in CHOSUNG_SET or text[start + i] == ch for i, ch in enumerate(token)):
+                return start
+            start = chosung_text.find(token_chosung, start + 1)
+        return -1
+
+    @staticmethod
+    def _needs_verify(token):
+        """n-gram 교집합만으로 일치가 보장되지 않는 토큰인지 여부"""
+        has_chosung = any(ch in CHOSUNG_SET for ch in token)
+        return len(token) > 2 or (has_chosung and not all(ch in CHOSUNG_SET for ch in token))
+
+    def _candidates(self, token):
+        """n-gram 포스팅 교집합으로 토큰의 후보 entry id 집합을 구함"""
+        if any(ch in CHOSUNG_SET for ch in token):
+            grams = _ngrams(to_chosung(token), sizes=(2,)) or {to_chosung(token)}
+            postings = [self._chosung_index.get(gram, set()) for gram in grams]
+            # 음절이 섞인 토큰은 음절 자체의 1-gram 포스팅으로도 좁힘
+            postings += [self._ngram_index.get(ch, set()) for ch in token if ch not in CHOSUNG_SET]
+        else:
+            grams = _ngrams(token, sizes=(2,)) or {token}
+            postings = [self._ngram_index.get(gram, set()) for gram in grams]
+        postings.sort(key=len)
+        return set.intersection(*postings) if postings else set()
+
+    def level_matches(self, parts):
+        """(읍면동, 시군구, 시도) 문자열이 각 단계 이름에 모두 포함되는 entry id 집합 (빈 문자열은 조건 없음)
+
+        단계별 n-gram 포스팅의 교집합으로 후보를 구한 뒤 실제 포함 여부만 확인한다.
+        """
+        postings = []
+        for level, part in enumerate(parts):
+            grams = _ngrams(part, sizes=(2,)) or ({part} if part else set())
+            postings += [self._level_index.get((level, gram), set()) for gram in grams]
+        if not postings:
+            return set(range(len(self.entries)))
+        postings.sort(key=len)
+        candidates = set.intersection(*postings)
+        return {
+            entry_id for entry_id in candidates
+            if all(part in name for part, (name, _) in zip(parts, self._fields[entry_id]))
+        }
+
+    def _token_scores(self, token, candidates):
+        """후보별 토큰 점수 (단계 * 2 + 접두 불일치 여부, 어느 단계에도 온전히 없으면 6)"""
+        scores = dict.fromkeys(candidates, 6)
+        if not self._needs_verify(token):
+            # 짧은 토큰은 단계별 포스팅 집합만으로 점수 계산
+            remaining = set(candidates)
+            for level in range(3):
+                prefix = remaining & self._level_prefix.get((level, token), set())
+                contains = (remaining & self._level_index.get((level, token), set())) - prefix
+                scores.update(dict.fromkeys(prefix, level * 2))
+                scores.update(dict.fromkeys(contains, level * 2 + 1))
+                remaining -= prefix | contains
+            return scores
+        for entry_id in candidates:
+            for level, (name, name_chosung) in enumerate(self._fields[entry_id]):
+                position = self._find(token, name, name_chosung)
+                if position != -1:
+                    scores[entry_id] = level * 2 + (0 if position == 0 else 1)
+                    break
+        return scores
+
+    def search(self, query, limit=10):
+        """검색어에 맞는 (법정동코드, 시도, 시군구, 읍면동) 목록을 순위대로 반환"""
+        tokens = tuple(query.split())
+        if not tokens:
+            return []
+        key = (tokens, limit)
+        if key in self._query_cache:
+            return self._query_cache[key]
+
+        candidates = None
+        for token in sorted(tokens, key=len, reverse=True):
+            token_candidates = self._candidates(token)
+            candidates = token_candidates if candidates is None else candidates & token_candidates
+            if not candidates:
+                break
+        verify_tokens = [token for token in tokens if self._needs_verify(token)]
+        if verify_tokens:
+            candidates = [
+                entry_id for entry_id in candidates
+                if all(self._find(token, self._texts[entry_id], self._chosung_texts[entry_id]) != -1
+                       for token in verify_tokens)
+            ]
+
+        totals = dict.fromkeys(candidates, 0)
+        for token in tokens:
+            for entry_id, score in self._token_scores(token, totals).items():
+                totals[entry_id] += score
+        top = heapq.nsmallest(limit, totals, key=lambda entry_id: (totals[entry_id], entry_id))
+        results = [self.entries[entry_id] for entry_id in top]
+
+        if len(self._query_cache) > 10000:
+            self._query_cache.clear()
+        self._query_cache[key] = results
+        return results
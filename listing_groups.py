@@ -0,0 +1,73 @@
+import pandas as pd
+
+# 중복 매물 판단에 쓰는 목록 API 필드 → 레코드 컬럼
+# (같은 매물을 여러 중개사가 각자 올리면 매물번호만 다르고 이 값들은 같음)
+DUPLICATE_FIELDS = {
+    "bildNm": "건물명",
+    "flrInfo": "층수",
+    "spc1": "임대면적(㎡)",
+    "spc2": "전용면적(㎡)",
+    "hanPrc": "보증금/매매가",
+    "rentPrc": "월세",
+    "direction": "방향",
+}
+
+GROUP_COLUMN = "중복그룹"
+GROUP_SIZE_COLUMN = "중복수"
+
+
+def _group_key(values):
+    """비교 값 튜플 (건물명이나 가격이 비어 있으면 같은 매물로 보기 어려우므로 None)"""
+    values = tuple(str(value or "").strip() for value in values)
+    building, price = values[0], values[4]
+    return values if building and price else None
+
+
+def duplicate_group_key(item):
+    """목록 API 항목의 중복 판단 키 (묶지 않을 항목은 None)"""
+    return _group_key(item.get(field, "") for field in DUPLICATE_FIELDS)
+
+
+def record_group_key(record):
+    """매물 레코드(dict)의 중복 판단 키 - duplicate_group_key와 같은 값"""
+    return _group_key(record.get(column, "") for column in DUPLICATE_FIELDS.values())
+
+
+class DuplicateGrouper:
+    """수집 중에 본 매물을 중복 묶음으로 나누고 묶음별 상세 정보를 보관
+
+    묶음 ID는 그 묶음에서 처음 본 매물(대표)의 매물번호다. 대표의 상세 정보만 요청하고
+    나머지 매물은 같은 상세 정보를 쓴다.
+    """
+
+    def __init__(self):
+        self._leaders = {}
+        self.details = {}
+
+    def assign(self, atclNo, key):
+        """매물의 묶음 ID (처음 보는 키면 이 매물이 대표)"""
+        atclNo = str(atclNo)
+        return self._leaders.setdefault(key, atclNo) if key is not None else atclNo
+
+    def restore(self, record):
+        """체크포인트에서 재사용한 레코드의 묶음과 상세 정보 복원"""
+        group = str(record.get(GROUP_COLUMN) or record["매물번호"])
+        key = record_group_key(record)
+        if key is not None:
+            self._leaders.setdefault(key, group)
+        self.details.setdefault(group, (record["지역지구"], record["용도"], record["관리비"], record["상세주소"]))
+
+
+def add_group_sizes(df):
+    """묶음별 매물 수 컬럼(중복수) 추가 - 묶음 ID 컬럼이 없으면 그대로"""
+    if GROUP_COLUMN not in df.columns:
+        return df
+    df[GROUP_SIZE_COLUMN] = df.groupby(GROUP_COLUMN, sort=False, observed=True)[GROUP_COLUMN].transform("size")
+    return df
+
+
+def collapse_duplicates(df):
+    """묶음마다 대표 한 행만 남긴 DataFrame (중복수 컬럼으로 묶인 매물 수를 알 수 있음)"""
+    if GROUP_COLUMN not in df.columns or df.empty:
+        return df
+    return df.drop_duplicates(GROUP_COLUMN, keep="first").reset_index(drop=True)
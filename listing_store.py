@@ -0,0 +1,107 @@
+import sqlite3
+import threading
+import time
+import json
+import hashlib
+
+# 목록 API에서 변경 여부 판단에 쓰는 필드
+FINGERPRINT_FIELDS = ["hanPrc", "rentPrc", "spc1", "spc2", "flrInfo"]
+
+
+def listing_fingerprint(item):
+    """목록 API 항목의 가격/면적/층 필드로 만든 지문"""
+    raw = "\x1f".join(str(item.get(field, "") or "") for field in FINGERPRINT_FIELDS)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ListingStore:
+    """이전에 수집한 매물의 목록 필드, 지문, 상세 정보를 보관하는 SQLite 저장소
+
+    반복 수집 시 지문이 같은 매물은 상세 페이지를 다시 요청하지 않고 저장된 상세 정보를 쓴다.
+    """
+
+    def __init__(self, path="listing_store.sqlite3"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS listings ("
+            "atclNo TEXT PRIMARY KEY, "
+            "hanPrc TEXT, rentPrc TEXT, spc1 TEXT, spc2 TEXT, flrInfo TEXT, "
+            "fingerprint TEXT NOT NULL, "
+            "details TEXT NOT NULL, "
+            "first_seen REAL NOT NULL, "
+            "last_seen REAL NOT NULL, "
+            "updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, atclNos):
+        """{매물번호: (지문, 상세 정보 튜플)} - 저장되지 않았거나 상세 수집 대기 중인 매물은 빠짐"""
+        atclNos = [str(atclNo) for atclNo in atclNos]
+        if not atclNos:
+            return {}
+        placeholders = ",".join("?" * len(atclNos))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT atclNo, fingerprint, details FROM listings WHERE atclNo IN ({placeholders})",
+                atclNos,
+            ).fetchall()
+        # 상세 수집 대기 중인(상세 정보가 비어 있는) 매물은 저장되지 않은 것으로 봄
+        return {
+            atclNo: (fingerprint, details)
+            for atclNo, fingerprint, details in ((atclNo, fingerprint, tuple(json.loads(details)))
+                                                 for atclNo, fingerprint, details in rows)
+            if any(details)
+        }
+
+    def upsert(self, item, details, pending=False):
+        """목록 항목과 상세 정보를 저장 (기존 항목이면 갱신, first_seen 유지)
+
+        상세 정보가 모두 비어 있으면 요청 실패로 보고 저장하지 않아 다음 수집 때 다시 요청한다.
+        pending이 켜지면(상세 정보를 나중에 채우는 수집) 비어 있어도 목록 필드와 지문을 저장해 두고,
+        상세 정보는 set_details()로 채운다. 채우기 전까지 get_many()는 이 매물을 돌려주지 않는다.
+        """
+        if not any(details) and not pending:
+            return
+        now = time.time()
+        values = [str(item["atclNo"])] + [str(item.get(field, "") or "") for field in FINGERPRINT_FIELDS]
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO listings (atclNo, hanPrc, rentPrc, spc1, spc2, flrInfo, fingerprint, details, "
+                "first_seen, last_seen, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(atclNo) DO UPDATE SET "
+                "hanPrc = excluded.hanPrc, rentPrc = excluded.rentPrc, spc1 = excluded.spc1, "
+                "spc2 = excluded.spc2, flrInfo = excluded.flrInfo, fingerprint = excluded.fingerprint, "
+                "details = excluded.details, last_seen = excluded.last_seen, updated_at = excluded.updated_at",
+                values + [listing_fingerprint(item), json.dumps(list(details), ensure_ascii=False), now, now, now],
+            )
+            self._conn.commit()
+
+    def set_details(self, atclNos, details):
+        """이미 저장된 매물들의 상세 정보 채우기 (모두 비어 있으면 무시), 갱신한 매물 수 반환"""
+        if not any(details):
+            return 0
+        now = time.time()
+        encoded = json.dumps(list(details), ensure_ascii=False)
+        with self._lock:
+            updated = self._conn.executemany(
+                "UPDATE listings SET details = ?, updated_at = ? WHERE atclNo = ?",
+                [(encoded, now, str(atclNo)) for atclNo in atclNos],
+            ).rowcount
+            self._conn.commit()
+        return updated
+
+    def touch(self, atclNos):
+        """변경 없이 다시 확인된 매물의 last_seen 갱신"""
+        atclNos = [(time.time(), str(atclNo)) for atclNo in atclNos]
+        if not atclNos:
+            return
+        with self._lock:
+            self._conn.executemany("UPDATE listings SET last_seen = ? WHERE atclNo = ?", atclNos)
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
@@ -0,0 +1,106 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from listing_groups import add_group_sizes
+
+# "1억 2,500", "3.5억", "1억 2500만원", "5,000만", "2500", "1억 2천", "5천만" 형식의 가격 (쉼표 제거 후 적용, 단위: 만원)
+PRICE_PATTERN = re.compile(
+    r'^(?:(\d+(?:\.\d+)?)\s*억)?\s*(?:(\d+(?:\.\d+)?)\s*천)?\s*(\d+(?:\.\d+)?)?\s*(?:만\s*원?|원)?$'
+)
+# "85.5㎡", "84.97", "1,234.5m²" 형식의 면적 (쉼표 제거 후 첫 번째 숫자)
+AREA_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+
+# 원본 문자열 컬럼 → 숫자 컬럼 (면적은 같은 컬럼을 숫자로 변환)
+PRICE_COLUMNS = {
+    "보증금/매매가": "가격(만원)",
+    "월세": "월세(만원)",
+}
+AREA_COLUMNS = ["전용면적(㎡)", "임대면적(㎡)", "연면적(㎡)", "대지면적(㎡)"]
+
+
+def parse_price(text):
+    """쉼표를 뺀 가격 문자열 하나를 만원 단위 float로 (빈 값/해석 불가는 NaN)"""
+    match = PRICE_PATTERN.match(text)
+    if not text or not match or not any(match.groups()):
+        return np.nan
+    eok, cheon, man = match.groups()
+    return (float(eok) * 10000 if eok else 0.0) + (float(cheon) * 1000 if cheon else 0.0) + (float(man) if man else 0.0)
+
+
+def parse_area(text):
+    """쉼표를 뺀 면적 문자열 하나를 float로 (빈 값/해석 불가는 NaN)"""
+    match = AREA_PATTERN.search(text)
+    return float(match.group()) if match else np.nan
+
+
+def _factorize(values):
+    """값을 고유값 코드로 바꾸고, 고유값은 쉼표/공백을 뺀 문자열로 반환 (None/NaN 코드는 -1)"""
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    return codes, [str(value).replace(',', '').strip() for value in uniques]
+
+
+def _take(codes, per_unique, missing):
+    """고유값별 결과를 원래 위치로 펼침 (코드 -1은 missing)"""
+    return np.append(np.asarray(per_unique, dtype=type(missing)), missing)[codes]
+
+
+def parse_price_series(values):
+    """가격 값 목록을 만원 단위 float 배열로 변환 (빈 값/해석 불가는 NaN)
+
+    수집 결과의 가격/면적은 반복되는 값이 많으므로 고유값만 미리 컴파일한 패턴으로
+    해석한 뒤 코드 배열로 펼친다. 행 단위 re.search를 반복하지 않는다.
+    """
+    codes, texts = _factorize(values)
+    return _take(codes, [parse_price(text) for text in texts], np.nan)
+
+
+def parse_area_series(values):
+    """면적 값 목록을 float 배열로 변환 (빈 값/해석 불가는 NaN)"""
+    codes, texts = _factorize(values)
+    return _take(codes, [parse_area(text) for text in texts], np.nan)
+
+
+def _parse_with_blank(values, parse_one):
+    """(해석 결과 float 배열, 빈 값 여부 bool 배열) - 고유값 분해를 한 번만 수행"""
+    codes, texts = _factorize(values)
+    return (_take(codes, [parse_one(text) for text in texts], np.nan),
+            _take(codes, [text == "" for text in texts], True))
+
+
+def condition_mask(area_values, price_values, area_filter_enabled, min_area, max_area,
+                   price_filter_enabled, min_price, max_price):
+    """면적/가격 조건 통과 여부 bool 배열
+
+    값이 비어 있으면 해당 조건은 통과한다. 해석할 수 없는 면적은 제외하고, 해석할 수 없는 가격("협의" 등)은
+    0만원으로 보고 비교한다 (최소 가격이 0이면 통과).
+    """
+    mask = np.ones(len(area_values), dtype=bool)
+    if area_filter_enabled:
+        area, blank = _parse_with_blank(area_values, parse_area)
+        mask &= blank | ((area >= min_area) & (area <= max_area))
+    if price_filter_enabled:
+        price, blank = _parse_with_blank(price_values, parse_price)
+        price = np.nan_to_num(price, nan=0.0)
+        mask &= blank | ((price >= min_price) & (price <= max_price))
+    return mask
+
+
+def normalize_results(df, copy=True):
+    """수집 결과 DataFrame의 가격/면적을 숫자 컬럼으로 변환한 사본
+
+    면적 컬럼은 같은 이름의 float 컬럼으로 바꾸고, 가격 컬럼은 원본 문자열을 유지한 채
+    "가격(만원)", "월세(만원)" float 컬럼을 추가한다. 중복 매물 묶음 ID(중복그룹)가 있으면 묶음별 매물 수(중복수)도 추가한다.
+    copy=False면 사본을 만들지 않고 df에 바로 컬럼을 바꾸거나 추가해 돌려준다 (방금 만든 RecordColumns.to_frame()
+    결과처럼 다른 곳에서 쓰지 않는 DataFrame용 - 범주형 컬럼의 코드 버퍼 공유가 유지됨).
+    """
+    if copy:
+        df = df.copy()
+    for column in AREA_COLUMNS:
+        if column in df.columns:
+            df[column] = parse_area_series(df[column])
+    for column, numeric_column in PRICE_COLUMNS.items():
+        if column in df.columns:
+            df[numeric_column] = parse_price_series(df[column])
+    return add_group_sizes(df)
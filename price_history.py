@@ -0,0 +1,160 @@
+import sqlite3
+import threading
+import logging
+from datetime import date, timedelta
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 매물 메타데이터로 보관하는 결과 컬럼 → 테이블 컬럼
+META_COLUMNS = {
+    "매물타입": "property_type",
+    "거래타입": "trade_type",
+    "주소지": "address",
+    "건물명": "building",
+    "전용면적(㎡)": "area",
+}
+
+
+class PriceHistory:
+    """수집할 때마다 매물별 가격을 스냅샷으로 쌓는 SQLite 가격 이력 저장소
+
+    - snapshots: (매물번호, 날짜) 기본키의 WITHOUT ROWID 테이블에 가격/월세가 바뀐 행만 저장한다.
+      같은 매물의 이력이 기본키 순서로 붙어 있으므로 매물별 이력 조회는 인덱스 범위 조회 한 번이다.
+    - listings: 매물별 최신 가격, 마지막 변경일/확인일과 메타데이터. 추가 시 이 테이블과만 비교하므로
+      스냅샷이 수백만 행이어도 변경 감지 비용은 이번 수집 건수에 비례한다.
+    """
+
+    def __init__(self, path="price_history.sqlite3"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "atclNo TEXT NOT NULL, "
+            "snapshot_date TEXT NOT NULL, "
+            "price REAL, "
+            "rent REAL, "
+            "PRIMARY KEY (atclNo, snapshot_date)) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS listings ("
+            "atclNo TEXT PRIMARY KEY, "
+            "price REAL, rent REAL, "
+            "changed_date TEXT NOT NULL, "
+            "first_seen TEXT NOT NULL, "
+            "last_seen TEXT NOT NULL, "
+            "property_type TEXT, trade_type TEXT, address TEXT, building TEXT, area REAL) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_listings_changed_date ON listings(changed_date)")
+        self._conn.commit()
+
+    def append(self, df, snapshot_date=None):
+        """정규화된 수집 결과(normalize_results)를 snapshot_date(기본: 오늘) 스냅샷으로 추가
+
+        새 매물과 가격/월세가 바뀐 매물만 snapshots에 기록하고 저장된 행 수를 반환한다.
+        같은 날 다시 추가하면 그날 스냅샷을 최신 값으로 덮어쓴다.
+        """
+        if df.empty or "매물번호" not in df.columns:
+            return 0
+        snapshot_date = (snapshot_date or date.today()).isoformat()
+        columns = {"가격(만원)": None, "월세(만원)": None, **dict.fromkeys(META_COLUMNS)}
+        frame = df.reindex(columns=["매물번호", *columns]).drop_duplicates("매물번호", keep="last")
+        # 열 단위로 None 치환 후 목록으로 변환 (셀 단위 NaN 검사 없이)
+        values = frame[list(columns)].astype(object)
+        values = values.where(values.notna(), None)
+        rows = list(zip(frame["매물번호"].astype(str).tolist(), *(values[column].tolist() for column in columns)))
+
+        with self._lock:
+            conn = self._conn
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS incoming ("
+                "atclNo TEXT, price REAL, rent REAL, "
+                "property_type TEXT, trade_type TEXT, address TEXT, building TEXT, area REAL)"
+            )
+            conn.execute("DELETE FROM incoming")
+            conn.executemany("INSERT INTO incoming VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            before = conn.total_changes
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots (atclNo, snapshot_date, price, rent) "
+                "SELECT i.atclNo, ?, i.price, i.rent FROM incoming i LEFT JOIN listings l ON l.atclNo = i.atclNo "
+                "WHERE l.atclNo IS NULL OR l.price IS NOT i.price OR l.rent IS NOT i.rent",
+                (snapshot_date,),
+            )
+            stored = conn.total_changes - before
+            conn.execute(
+                "INSERT INTO listings (atclNo, price, rent, changed_date, first_seen, last_seen, "
+                "property_type, trade_type, address, building, area) "
+                "SELECT atclNo, price, rent, ?1, ?1, ?1, property_type, trade_type, address, building, area "
+                "FROM incoming WHERE true "
+                "ON CONFLICT(atclNo) DO UPDATE SET "
+                "changed_date = CASE WHEN price IS NOT excluded.price OR rent IS NOT excluded.rent "
+                "THEN excluded.changed_date ELSE changed_date END, "
+                "price = excluded.price, rent = excluded.rent, last_seen = excluded.last_seen, "
+                "property_type = excluded.property_type, trade_type = excluded.trade_type, "
+                "address = excluded.address, building = excluded.building, area = excluded.area",
+                (snapshot_date,),
+            )
+            conn.commit()
+        logger.info(f"가격 이력 추가: {len(rows)}건 중 {stored}건 변경 저장 ({snapshot_date})")
+        return stored
+
+    def history(self, atclNo):
+        """매물 하나의 가격 이력 DataFrame (날짜, 가격(만원), 월세(만원)) - 날짜 오름차순"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT snapshot_date, price, rent FROM snapshots WHERE atclNo = ? ORDER BY snapshot_date",
+                (str(atclNo),),
+            ).fetchall()
+        return pd.DataFrame(rows, columns=["날짜", "가격(만원)", "월세(만원)"])
+
+    def price_drops(self, since=None, min_drop=0):
+        """since(기본: 7일 전) 시점보다 현재 가격이 min_drop(만원) 넘게 내린 매물 DataFrame
+
+        since 시점 가격은 그날 또는 그 이전의 마지막 스냅샷이고, 그 이후에 처음 나온 매물은 제외한다.
+        since 이후 가격이 바뀐 매물만 listings의 changed_date 인덱스로 골라 비교하므로
+        전체 스냅샷을 훑지 않는다. 하락폭이 큰 순으로 정렬한다.
+        """
+        since = (since or date.today() - timedelta(days=7)).isoformat()
+        query = (
+            "SELECT l.atclNo, l.property_type, l.trade_type, l.address, l.building, l.area, "
+            "p.price, l.price, l.price - p.price, l.changed_date, l.last_seen "
+            "FROM listings l JOIN snapshots p ON p.atclNo = l.atclNo AND p.snapshot_date = ("
+            "SELECT MAX(s.snapshot_date) FROM snapshots s WHERE s.atclNo = l.atclNo AND s.snapshot_date <= ?1) "
+            "WHERE l.changed_date > ?1 AND l.price < p.price - ?2"
+        )
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY l.price - p.price", (since, min_drop)).fetchall()
+        drops = pd.DataFrame(rows, columns=[
+            "매물번호", "매물타입", "거래타입", "주소지", "건물명", "전용면적(㎡)",
+            "이전 가격(만원)", "현재 가격(만원)", "변동(만원)", "변경일", "마지막 확인일",
+        ])
+        drops["변동률(%)"] = (drops["변동(만원)"] / drops["이전 가격(만원)"] * 100).round(1)
+        return drops
+
+    def listings(self, since=None):
+        """매물별 최신 가격 DataFrame - since가 주어지면 그날 이후 확인된 매물만 (여러 지역 통계용)"""
+        query = (
+            "SELECT atclNo, property_type, trade_type, address, building, area, price, rent, last_seen FROM listings"
+        )
+        with self._lock:
+            if since is None:
+                rows = self._conn.execute(query).fetchall()
+            else:
+                rows = self._conn.execute(query + " WHERE last_seen >= ?", (since.isoformat(),)).fetchall()
+        return pd.DataFrame(rows, columns=[
+            "매물번호", "매물타입", "거래타입", "주소지", "건물명", "전용면적(㎡)", "가격(만원)", "월세(만원)", "마지막 확인일",
+        ])
+
+    def version(self):
+        """listings 내용이 바뀌면 달라지는 값 (행 수, 마지막 확인일, 가격 합) - 집계 결과 메모 키용"""
+        with self._lock:
+            return tuple(self._conn.execute(
+                "SELECT COUNT(*), MAX(last_seen), TOTAL(price), TOTAL(rent) FROM listings"
+            ).fetchone())
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
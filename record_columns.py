@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+# 값 종류가 적어 코드 배열 + 고유값 목록으로 보관하는 컬럼
+CATEGORICAL_COLUMNS = ["매물타입", "거래타입", "방향", "주소지", "법정동코드", "층수", "용도", "지역지구", "수집일시"]
+
+
+def _category_value(value):
+    """범주 값 (None은 빈 문자열로 - Categorical 범주에는 결측값을 넣을 수 없음)"""
+    return "" if value is None else value
+
+
+def _codes_dtype(n_categories):
+    """범주 수에 대해 pandas Categorical이 코드 배열에 쓰는 정수형 (이 형이어야 from_codes가 복사하지 않음)"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+class _CodeBuffer:
+    """용량을 두 배씩 늘리는 범주 코드 배열 (정수형은 범주 수에 맞춰 필요할 때만 넓힘)"""
+
+    def __init__(self, capacity=1024):
+        self.data = np.empty(capacity, dtype=np.int8)
+        self.length = 0
+
+    def extend(self, codes, n_categories):
+        dtype = _codes_dtype(n_categories)
+        end = self.length + len(codes)
+        if end > len(self.data) or dtype != self.data.dtype:
+            data = np.empty(max(end, len(self.data) * (2 if end > len(self.data) else 1)), dtype=dtype)
+            data[:self.length] = self.data[:self.length]
+            self.data = data
+        self.data[self.length:end] = codes
+        self.length = end
+
+    def view(self):
+        return self.data[:self.length]
+
+
+class RecordColumns:
+    """매물 레코드(dict)를 컬럼별 배열로 모아 두는 저장소
+
+    레코드마다 dict를 들고 있지 않고 컬럼별 리스트에 값만 쌓는다. CATEGORICAL_COLUMNS는
+    값마다 정수 코드와 고유값 목록으로 보관하고, to_frame()에서 pandas Categorical로 만든다.
+    코드 배열은 처음부터 pandas가 쓰는 정수형(범주 수에 따라 int8/int16/...)의 numpy 버퍼에 쌓으므로
+    to_frame()의 Categorical은 복사 없이 버퍼의 앞부분을 그대로 공유한다. 이후 append()는 공유된 구간
+    뒤에만 쓰거나(용량·정수형이 바뀌면) 새 버퍼로 옮기므로 이미 만든 DataFrame은 바뀌지 않는다.
+    반대로 반환된 DataFrame의 범주형 컬럼을 제자리에서 고치면 이 저장소도 바뀌므로, 고칠 때는 먼저 copy()한다.
+    컬럼 순서는 처음 추가한 레코드의 키 순서를 따른다.
+    """
+
+    def __init__(self, categorical_columns=CATEGORICAL_COLUMNS):
+        self.categorical_columns = set(categorical_columns)
+        self.columns = None
+        self._values = {}
+        self._codes = {}
+        self._categories = {}
+        self._length = 0
+
+    def append(self, records):
+        """레코드(dict) 묶음 추가 (처음 보는 키는 무시, 없는 키는 빈 문자열)"""
+        if not records:
+            return
+        if self.columns is None:
+            self.columns = list(records[0].keys())
+            for column in self.columns:
+                if column in self.categorical_columns:
+                    self._codes[column] = _CodeBuffer()
+                    self._categories[column] = {}
+                else:
+                    self._values[column] = []
+        for column, values in self._values.items():
+            values.extend(record.get(column, "") for record in records)
+        for column, codes in self._codes.items():
+            categories = self._categories[column]
+            batch = [categories.setdefault(_category_value(record.get(column)), len(categories)) for record in records]
+            codes.extend(batch, len(categories))
+        self._length += len(records)
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def to_frame(self):
+        """DataFrame (범주형 컬럼은 코드 버퍼를 복사 없이 공유하는 Categorical)"""
+        if self.columns is None:
+            return pd.DataFrame()
+        data = {}
+        for column in self.columns:
+            if column in self._codes:
+                # 코드는 append()에서 만든 0..범주 수-1 값뿐이므로 검사를 건너뜀 (정수형이 맞아 복사도 없음)
+                data[column] = pd.Categorical.from_codes(self._codes[column].view(),
+                                                         categories=list(self._categories[column]), validate=False)
+            else:
+                data[column] = self._values[column]
+        return pd.DataFrame(data, copy=False)
+
+    def codes(self, column):
+        """범주형 컬럼의 코드 버퍼 (to_frame() 결과와 메모리를 공유하는지 확인하는 데 씀)"""
+        return self._codes[column].view()
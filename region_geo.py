@@ -0,0 +1,205 @@
+import math
+import logging
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# 시군구별 대략적인 범위 (btm, lft, top, rgt) - 오프라인 번들 데이터, 행정구역 경계의 외접 사각형 근사값
+SIGUNGU_EXTENTS = {
+    # 서울특별시
+    ("서울특별시", "종로구"): (37.565, 126.955, 37.632, 127.023),
+    ("서울특별시", "중구"): (37.544, 126.964, 37.574, 127.026),
+    ("서울특별시", "용산구"): (37.512, 126.944, 37.556, 127.018),
+    ("서울특별시", "성동구"): (37.530, 127.010, 37.575, 127.075),
+    ("서울특별시", "광진구"): (37.525, 127.055, 37.570, 127.115),
+    ("서울특별시", "동대문구"): (37.560, 127.025, 37.610, 127.078),
+    ("서울특별시", "중랑구"): (37.575, 127.070, 37.620, 127.118),
+    ("서울특별시", "성북구"): (37.575, 126.985, 37.635, 127.075),
+    ("서울특별시", "강북구"): (37.610, 126.985, 37.665, 127.050),
+    ("서울특별시", "도봉구"): (37.630, 127.010, 37.695, 127.060),
+    ("서울특별시", "노원구"): (37.610, 127.045, 37.695, 127.115),
+    ("서울특별시", "은평구"): (37.580, 126.885, 37.660, 126.975),
+    ("서울특별시", "서대문구"): (37.555, 126.905, 37.605, 126.970),
+    ("서울특별시", "마포구"): (37.535, 126.855, 37.590, 126.960),
+    ("서울특별시", "양천구"): (37.505, 126.820, 37.550, 126.890),
+    ("서울특별시", "강서구"): (37.530, 126.765, 37.600, 126.880),
+    ("서울특별시", "구로구"): (37.475, 126.810, 37.515, 126.905),
+    ("서울특별시", "금천구"): (37.430, 126.880, 37.485, 126.930),
+    ("서울특별시", "영등포구"): (37.500, 126.880, 37.545, 126.950),
+    ("서울특별시", "동작구"): (37.475, 126.905, 37.515, 126.990),
+    ("서울특별시", "관악구"): (37.450, 126.900, 37.495, 126.990),
+    ("서울특별시", "서초구"): (37.425, 126.980, 37.525, 127.095),
+    ("서울특별시", "강남구"): (37.460, 127.015, 37.545, 127.125),
+    ("서울특별시", "송파구"): (37.465, 127.065, 37.545, 127.155),
+    ("서울특별시", "강동구"): (37.520, 127.110, 37.575, 127.185),
+    # 경기도
+    ("경기도", "수원시 장안구"): (37.285, 126.960, 37.335, 127.030),
+    ("경기도", "수원시 권선구"): (37.225, 126.935, 37.290, 127.030),
+    ("경기도", "수원시 팔달구"): (37.265, 126.990, 37.295, 127.040),
+    ("경기도", "수원시 영통구"): (37.230, 127.030, 37.290, 127.085),
+    ("경기도", "성남시 수정구"): (37.410, 127.085, 37.470, 127.175),
+    ("경기도", "성남시 중원구"): (37.410, 127.125, 37.450, 127.190),
+    ("경기도", "성남시 분당구"): (37.330, 127.060, 37.410, 127.170),
+    ("경기도", "고양시 덕양구"): (37.590, 126.800, 37.710, 126.960),
+    ("경기도", "고양시 일산동구"): (37.640, 126.750, 37.720, 126.830),
+    ("경기도", "고양시 일산서구"): (37.650, 126.690, 37.710, 126.780),
+    ("경기도", "용인시 처인구"): (37.080, 127.150, 37.320, 127.430),
+    ("경기도", "용인시 기흥구"): (37.220, 127.060, 37.305, 127.160),
+    ("경기도", "용인시 수지구"): (37.300, 127.040, 37.360, 127.130),
+    ("경기도", "부천시 원미구"): (37.480, 126.750, 37.530, 126.810),
+    ("경기도", "부천시 소사구"): (37.460, 126.770, 37.500, 126.830),
+    ("경기도", "부천시 오정구"): (37.510, 126.770, 37.555, 126.840),
+    ("경기도", "안산시 상록구"): (37.280, 126.810, 37.340, 126.910),
+    ("경기도", "안산시 단원구"): (37.280, 126.730, 37.345, 126.840),
+    ("경기도", "안양시 만안구"): (37.370, 126.880, 37.430, 126.950),
+    ("경기도", "안양시 동안구"): (37.370, 126.940, 37.420, 127.000),
+    ("경기도", "남양주시"): (37.560, 127.110, 37.780, 127.380),
+    ("경기도", "화성시"): (37.030, 126.630, 37.280, 127.140),
+    ("경기도", "평택시"): (36.900, 126.790, 37.150, 127.150),
+    ("경기도", "의정부시"): (37.700, 127.010, 37.775, 127.120),
+    ("경기도", "시흥시"): (37.320, 126.700, 37.470, 126.850),
+    ("경기도", "파주시"): (37.700, 126.670, 37.960, 127.000),
+    ("경기도", "광명시"): (37.400, 126.830, 37.495, 126.900),
+    ("경기도", "김포시"): (37.580, 126.530, 37.780, 126.800),
+    ("경기도", "군포시"): (37.320, 126.890, 37.380, 126.970),
+    ("경기도", "광주시"): (37.300, 127.150, 37.530, 127.430),
+    ("경기도", "이천시"): (37.100, 127.350, 37.340, 127.600),
+    ("경기도", "양주시"): (37.720, 126.900, 37.900, 127.120),
+    ("경기도", "오산시"): (37.130, 127.010, 37.190, 127.100),
+    ("경기도", "구리시"): (37.570, 127.110, 37.640, 127.170),
+    ("경기도", "안성시"): (36.900, 127.130, 37.130, 127.500),
+    ("경기도", "포천시"): (37.750, 127.100, 38.100, 127.450),
+    ("경기도", "의왕시"): (37.310, 126.930, 37.400, 127.030),
+    ("경기도", "하남시"): (37.490, 127.140, 37.580, 127.260),
+    ("경기도", "여주시"): (37.150, 127.480, 37.450, 127.800),
+    ("경기도", "과천시"): (37.410, 126.970, 37.460, 127.040),
+    ("경기도", "동두천시"): (37.870, 127.020, 37.960, 127.130),
+    ("경기도", "양평군"): (37.380, 127.330, 37.650, 127.850),
+    ("경기도", "가평군"): (37.680, 127.280, 38.050, 127.630),
+    ("경기도", "연천군"): (37.950, 126.850, 38.230, 127.250),
+}
+
+# 읍면동 단위 중심 좌표 (lat, lon) - 확인된 지역만, 범위는 DONG_HALF_SPAN으로 근사
+DONG_CENTROIDS = {
+    # 서울 강남구
+    ("강남구", "역삼동"): (37.5009, 127.0374),
+    ("강남구", "논현동"): (37.5139, 127.0379),
+    ("강남구", "압구정동"): (37.5271, 127.0276),
+    ("강남구", "신사동"): (37.5175, 127.0203),
+    ("강남구", "청담동"): (37.5197, 127.0486),
+    ("강남구", "삼성동"): (37.5089, 127.0637),
+    ("강남구", "대치동"): (37.4946, 127.0619),
+    ("강남구", "개포동"): (37.4782, 127.0761),
+    # 서울 서초구
+    ("서초구", "서초동"): (37.4833, 127.0327),
+    ("서초구", "잠원동"): (37.5229, 127.0114),
+    ("서초구", "반포동"): (37.5035, 127.0070),
+    ("서초구", "방배동"): (37.4817, 126.9965),
+    ("서초구", "양재동"): (37.4845, 127.0371),
+    # 서울 종로구
+    ("종로구", "종로1가"): (37.5701, 126.9835),
+    ("종로구", "종로2가"): (37.5658, 126.9859),
+    ("종로구", "종로3가"): (37.5700, 126.9910),
+}
+
+DONG_HALF_SPAN = 0.012
+# 읍면동 범위를 모르는 코드(시군구/기본 범위)의 최대 타일 수 - 시군구 전체를 여러 타일로 훑지 않고
+# 기존 검색과 같은 한 칸 요청량으로 제한 (그 결과의 위치는 시군구 단위까지만 정확함)
+COARSE_MAX_TILES = 1
+# 기본 좌표 (서울 시청 기준), 기존 검색 범위 ±0.02°
+DEFAULT_CENTER = (37.5665, 126.9780)
+DEFAULT_HALF_SPAN = 0.02
+
+# 줌 15에서 기존 ±0.02° 검색 범위 한 칸 크기, 줌이 1 줄면 두 배
+BASE_ZOOM = 15
+BASE_TILE_SPAN = 0.04
+
+Tile = namedtuple("Tile", ["z", "lat", "lon", "btm", "lft", "top", "rgt"])
+
+
+def _extent_around(lat, lon, half_span):
+    return (lat - half_span, lon - half_span, lat + half_span, lon + half_span)
+
+
+DEFAULT_EXTENT = _extent_around(*DEFAULT_CENTER, DEFAULT_HALF_SPAN)
+
+
+class RegionGeoIndex:
+    """법정동코드별 중심 좌표와 범위(btm, lft, top, rgt)
+
+    읍면동 좌표가 확인된 지역은 그 주변 범위를, 그 외에는 소속 시군구 범위를 사용한다.
+    어느 쪽에도 없는 코드는 서울 시청 기준 기본 범위를 사용한다.
+    시군구/기본 범위는 읍면동의 실제 위치가 아니므로 search_tiles()로 타일 수를 COARSE_MAX_TILES로 제한한다.
+    번들 표에는 읍면동 경계 데이터가 없어 대부분의 코드가 시군구 범위이며, 읍면동 범위(DONG_HALF_SPAN)도
+    한 타일보다 작으므로 조회되는 범위는 모두 한 타일로 검색된다.
+    """
+
+    def __init__(self, law_df):
+        self.regions = {}
+        missing = set()
+        for code, sido, sigungu, dong in law_df[['법정동코드', '시도', '시군구', '읍면동']].itertuples(index=False):
+            if (sigungu, dong) in DONG_CENTROIDS:
+                lat, lon = DONG_CENTROIDS[(sigungu, dong)]
+                self.regions[code] = (lat, lon, _extent_around(lat, lon, DONG_HALF_SPAN), "읍면동")
+            elif (sido, sigungu) in SIGUNGU_EXTENTS:
+                btm, lft, top, rgt = SIGUNGU_EXTENTS[(sido, sigungu)]
+                self.regions[code] = ((btm + top) / 2, (lft + rgt) / 2, (btm, lft, top, rgt), "시군구")
+            else:
+                missing.add((sido, sigungu))
+        if missing:
+            logger.warning(f"좌표 범위가 없는 시군구 {len(missing)}곳: {sorted(missing)[:5]}")
+
+    def lookup(self, code):
+        """(중심 위도, 중심 경도, 범위, 정밀도) 반환, 정밀도는 "읍면동"/"시군구"/"기본값" """
+        if code in self.regions:
+            return self.regions[code]
+        lat, lon = DEFAULT_CENTER
+        return lat, lon, DEFAULT_EXTENT, "기본값"
+
+
+def tile_span(z):
+    """줌 레벨 z에서 타일 한 변의 크기(도)"""
+    return BASE_TILE_SPAN * 2 ** (BASE_ZOOM - z)
+
+
+def plan_tiles(extent, max_tiles=16):
+    """범위를 줌에 맞는 타일로 나눔
+
+    기존과 같은 줌 15에서 시작해, 타일 수가 max_tiles(최소 1) 이하가 될 때까지 줌을 낮춰 타일을 키운다.
+    범위를 rows x cols로 균등 분할하므로 타일끼리 겹치거나 범위 밖으로 나가지 않는다.
+    """
+    btm, lft, top, rgt = extent
+    max_tiles = max(1, max_tiles)
+    z = BASE_ZOOM
+    while True:
+        span = tile_span(z)
+        rows = max(1, math.ceil((top - btm) / span - 1e-9))
+        cols = max(1, math.ceil((rgt - lft) / span - 1e-9))
+        if rows * cols <= max_tiles:
+            break
+        z -= 1
+
+    height = (top - btm) / rows
+    width = (rgt - lft) / cols
+    tiles = []
+    for row in range(rows):
+        for col in range(cols):
+            tile_btm = btm + row * height
+            tile_lft = lft + col * width
+            tiles.append(Tile(
+                z,
+                round(tile_btm + height / 2, 6),
+                round(tile_lft + width / 2, 6),
+                round(tile_btm, 6),
+                round(tile_lft, 6),
+                round(tile_btm + height, 6),
+                round(tile_lft + width, 6),
+            ))
+    return tiles
+
+
+def search_tiles(extent, precision, max_tiles=16):
+    """RegionGeoIndex.lookup()의 범위/정밀도로 검색 타일 계획 (읍면동 범위가 아니면 COARSE_MAX_TILES개까지)"""
+    if precision != "읍면동":
+        max_tiles = min(max_tiles, COARSE_MAX_TILES)
+    return plan_tiles(extent, max_tiles=max_tiles)
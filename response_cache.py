@@ -0,0 +1,146 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+
+class _Flight:
+    """진행 중인 요청 하나 (같은 키를 기다리는 스레드들이 결과를 나눠 받음)"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResponseCache:
+    """프로세스 전체가 함께 쓰는 메모리 응답 캐시 (LRU + TTL, 같은 요청 합치기)
+
+    - 키(요청 URL)마다 응답을 ttl_seconds 동안 보관하고, 항목 수가 max_entries를 넘거나
+      크기 합이 max_bytes를 넘으면 가장 오래 쓰지 않은 항목부터 버린다.
+    - 같은 키의 요청이 이미 진행 중이면 새로 요청하지 않고 그 결과를 기다린다 (single-flight).
+      진행 중인 요청이 실패하면 기다리던 쪽에도 같은 예외가 전달된다.
+    - 적중/미스/합쳐진 요청/제거 수와 보관 크기는 stats()로 볼 수 있다.
+    """
+
+    def __init__(self, max_entries=2000, max_bytes=64 * 1024 * 1024, ttl_seconds=300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_or_fetch(self, key, fetch, size=len, cacheable=None):
+        """캐시된 값 또는 fetch() 결과를 (값, 출처) 튜플로 반환 - 출처는 "hit", "coalesced", "miss"
+
+        size(값)는 보관 크기(바이트), cacheable(값)이 거짓이면 결과를 돌려주기만 하고 보관하지 않는다.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, entry_size, expires_at = entry
+                if time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value, "hit"
+                self._remove(key)
+                self.expirations += 1
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, "coalesced"
+
+        try:
+            flight.value = fetch()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+                if flight.error is None and (cacheable is None or cacheable(flight.value)):
+                    self._store(key, flight.value, size(flight.value))
+            flight.event.set()
+        return flight.value, "miss"
+
+    def _store(self, key, value, value_size):
+        """항목 저장 후 한도를 넘는 만큼 LRU 순서로 제거 (호출 시 _lock 보유)"""
+        if key in self._entries:
+            self._remove(key)
+        if value_size > self.max_bytes:
+            return
+        self._entries[key] = (value, value_size, time.monotonic() + self.ttl_seconds)
+        self._bytes += value_size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key):
+        """항목 하나 제거 (호출 시 _lock 보유)"""
+        _, value_size, _ = self._entries.pop(key)
+        self._bytes -= value_size
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """운영 지표 dict (항목 수, 보관 바이트, 적중/미스/합쳐진 요청/제거/만료 수, 적중률)"""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            }
+
+    def to_prometheus(self, prefix="naver_response_cache"):
+        """Prometheus 텍스트 형식 (RunMetrics.to_prometheus와 같은 textfile collector용)"""
+        stats = self.stats()
+        lines = []
+        for name, help_text, metric_type, value in [
+            ("entries", "Cached responses.", "gauge", stats["entries"]),
+            ("bytes", "Bytes held by cached responses.", "gauge", stats["bytes"]),
+            ("hits_total", "Lookups served from the cache.", "counter", stats["hits"]),
+            ("misses_total", "Lookups that fetched upstream.", "counter", stats["misses"]),
+            ("coalesced_total", "Lookups that waited on an in-flight fetch.", "counter", stats["coalesced"]),
+            ("evictions_total", "Entries evicted by the LRU size limits.", "counter", stats["evictions"]),
+            ("expirations_total", "Entries dropped after the TTL.", "counter", stats["expirations"]),
+        ]:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            lines.append(f"{prefix}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Prometheus 텍스트 파일로 저장 (임시 파일 후 교체)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
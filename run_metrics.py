@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+# 실행 프로파일 패널에 보여줄 단계 이름 (순서 유지)
+STAGE_LABELS = {
+    "cluster_plan": "검색 계획 (클러스터 조회)",
+    "list_fetch": "목록 요청",
+    "list_parse": "목록 JSON 해석",
+    "rate_limit_wait": "요청 제한 대기",
+    "detail_cache": "상세 캐시/저장소 조회",
+    "detail_fetch": "상세 페이지 요청",
+    "detail_parse": "상세 HTML 파싱",
+    "sleep": "요청 간격 대기 (delay_time)",
+    "retry_wait": "재시도 대기",
+    "filter": "조건 필터링",
+    "normalize": "숫자 컬럼 변환",
+    "export_xlsx": "엑셀 생성 (다운로드 시)",
+    "export_csv": "CSV 생성 (다운로드 시)",
+    "export_parquet": "Parquet 생성 (다운로드 시)",
+    "export_dataset": "Parquet 데이터셋 저장",
+}
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RunMetrics:
+    """수집 한 번의 단계별 소요 시간, 요청 수, 전송 바이트, HTTP 상태 분포, 재시도 수
+
+    여러 스레드(동시 수집 모드)에서 함께 기록할 수 있다. 단계 시간은 스레드별 시간을 합산하므로
+    병렬 구간에서는 전체 실행 시간(wall_seconds)보다 클 수 있다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self.started_at = time.time()
+        self.wall_seconds = None
+        self.stages = {}
+        self.requests = {}
+        self.bytes = {}
+        self.statuses = {}
+        self.retries = {}
+        self.counters = {}
+
+    @contextmanager
+    def stage(self, name):
+        """with 블록의 소요 시간을 name 단계에 더함"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name, seconds, calls=1):
+        with self._lock:
+            total, count = self.stages.get(name, (0.0, 0))
+            self.stages[name] = (total + seconds, count + calls)
+
+    def record_response(self, kind, response=None):
+        """요청 하나의 결과 기록 (response가 없으면 연결 오류로 기록)"""
+        status = str(response.status_code) if response is not None else "error"
+        size = len(response.content) if response is not None else 0
+        with self._lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+            self.bytes[kind] = self.bytes.get(kind, 0) + size
+            statuses = self.statuses.setdefault(kind, {})
+            statuses[status] = statuses.get(status, 0) + 1
+
+    def retry(self, kind):
+        with self._lock:
+            self.retries[kind] = self.retries.get(kind, 0) + 1
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def finish(self):
+        """전체 실행 시간 확정 후 self 반환"""
+        self.wall_seconds = time.perf_counter() - self._start
+        return self
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="seconds"),
+                "wall_seconds": self.wall_seconds if self.wall_seconds is not None else time.perf_counter() - self._start,
+                "stages": {name: {"seconds": total, "calls": count} for name, (total, count) in self.stages.items()},
+                "requests": dict(self.requests),
+                "bytes": dict(self.bytes),
+                "http_status": {kind: dict(statuses) for kind, statuses in self.statuses.items()},
+                "retries": dict(self.retries),
+                "counters": dict(self.counters),
+            }
+
+    def merge(self, data):
+        """다른 실행(예: 배치 작업자 프로세스)의 to_dict() 결과를 더함"""
+        for name, stage in data.get("stages", {}).items():
+            self.add_time(name, stage["seconds"], stage["calls"])
+        with self._lock:
+            for kind, count in data.get("requests", {}).items():
+                self.requests[kind] = self.requests.get(kind, 0) + count
+            for kind, size in data.get("bytes", {}).items():
+                self.bytes[kind] = self.bytes.get(kind, 0) + size
+            for kind, statuses in data.get("http_status", {}).items():
+                merged = self.statuses.setdefault(kind, {})
+                for status, count in statuses.items():
+                    merged[status] = merged.get(status, 0) + count
+            for kind, count in data.get("retries", {}).items():
+                self.retries[kind] = self.retries.get(kind, 0) + count
+            for name, count in data.get("counters", {}).items():
+                self.counters[name] = self.counters.get(name, 0) + count
+
+    def stage_rows(self):
+        """실행 프로파일 표 (단계, 소요 시간, 호출 수, 비율) - STAGE_LABELS 순서, 그 외 단계는 뒤에"""
+        data = self.to_dict()
+        stages = data["stages"]
+        total = sum(stage["seconds"] for stage in stages.values()) or 1.0
+        names = [name for name in STAGE_LABELS if name in stages] + [name for name in stages if name not in STAGE_LABELS]
+        return [
+            {
+                "단계": STAGE_LABELS.get(name, name),
+                "소요 시간(초)": round(stages[name]["seconds"], 3),
+                "호출 수": stages[name]["calls"],
+                "비율(%)": round(stages[name]["seconds"] / total * 100, 1),
+            }
+            for name in names
+        ]
+
+    def to_prometheus(self, prefix="naver_crawl"):
+        """Prometheus 텍스트 형식 (node_exporter textfile collector용)"""
+        data = self.to_dict()
+        lines = []
+
+        def metric(name, help_text, metric_type, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}" if label_text else f"{prefix}_{name} {value}")
+
+        metric("run_started_timestamp_seconds", "Run start time.", "gauge", [({}, self.started_at)])
+        metric("run_wall_seconds", "Run wall-clock duration.", "gauge", [({}, data["wall_seconds"])])
+        metric("stage_seconds_total", "Time spent per stage, summed over threads.", "counter",
+               [({"stage": name}, stage["seconds"]) for name, stage in data["stages"].items()])
+        metric("stage_calls_total", "Calls per stage.", "counter",
+               [({"stage": name}, stage["calls"]) for name, stage in data["stages"].items()])
+        metric("requests_total", "HTTP requests per endpoint.", "counter",
+               [({"kind": kind}, count) for kind, count in data["requests"].items()])
+        metric("response_bytes_total", "Response body bytes per endpoint.", "counter",
+               [({"kind": kind}, size) for kind, size in data["bytes"].items()])
+        metric("http_responses_total", "HTTP responses per endpoint and status.", "counter",
+               [({"kind": kind, "status": status}, count)
+                for kind, statuses in data["http_status"].items() for status, count in statuses.items()])
+        metric("retries_total", "Retried requests per endpoint.", "counter",
+               [({"kind": kind}, count) for kind, count in data["retries"].items()])
+        metric("events_total", "Other crawl counters.", "counter",
+               [({"name": name}, count) for name, count in data["counters"].items()])
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """확장자가 .prom이면 Prometheus 텍스트, 그 외에는 JSON으로 저장 (임시 파일 후 교체)"""
+        if path.endswith(".prom"):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 저장소 루트의 모듈(normalize 등)과 benchmarks/의 모의 서버(mock_naver)를 tests/에서 바로 import
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+
+@pytest.fixture
+def naver_server(monkeypatch):
+    """모의 네이버 서버를 띄우고 crawler.BASE_URL을 그 주소로 바꾸는 함수 (인자는 MockNaverServer 옵션)"""
+    import crawler
+    from mock_naver import MockNaverServer
+
+    servers = []
+
+    def start(**options):
+        server = MockNaverServer(**options).start()
+        servers.append(server)
+        monkeypatch.setattr(crawler, "BASE_URL", server.base_url)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
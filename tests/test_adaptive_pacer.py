@@ -0,0 +1,93 @@
+"""crawler.AdaptivePacer AIMD 간격 조절과 Retry-After 테스트"""
+from types import SimpleNamespace
+
+import pytest
+
+import crawler
+from crawler import HEADERS, AdaptivePacer, fetch_with_retry
+from run_metrics import RunMetrics
+
+
+class Clock:
+    """time.monotonic/time.sleep 대역 (sleep하면 시각이 그만큼 흐름)"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(crawler.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(crawler.time, "sleep", clock.sleep)
+    return clock
+
+
+def response(status=200, retry_after=None):
+    return SimpleNamespace(status_code=status, headers={"Retry-After": retry_after} if retry_after else {})
+
+
+def test_successes_increase_rate_additively_up_to_max(clock):
+    pacer = AdaptivePacer(min_rps=1, max_rps=3, start_rps=2, increase=0.5)
+    pacer.observe(response(), 0.1)
+    assert pacer.rate == pytest.approx(2.25)
+    for _ in range(100):
+        pacer.observe(response(), 0.1)
+    assert pacer.rate == 3
+
+
+@pytest.mark.parametrize("result, seconds", [(response(429), 0.1), (response(503), 0.1), (None, 0.1),
+                                             (response(), 5.0)])
+def test_backpressure_cuts_rate_multiplicatively(clock, result, seconds):
+    pacer = AdaptivePacer(min_rps=0.5, max_rps=10, start_rps=8, decrease=0.5, latency_target=2.0)
+    pacer.observe(result, seconds)
+    assert pacer.rate == 4
+    assert pacer.cuts == 1
+
+
+def test_cuts_are_applied_once_per_cooldown_and_respect_min(clock):
+    pacer = AdaptivePacer(min_rps=1, max_rps=10, start_rps=8, decrease=0.5, cooldown=1.0)
+    for _ in range(5):
+        pacer.observe(response(500), 0.1)
+    assert (pacer.rate, pacer.cuts) == (4, 1)
+    for _ in range(5):
+        clock.now += 1.0
+        pacer.observe(response(500), 0.1)
+    assert (pacer.rate, pacer.cuts) == (1, 6)
+
+
+def test_acquire_spaces_requests_by_rate(clock):
+    pacer = AdaptivePacer(min_rps=1, max_rps=10, start_rps=4)
+    for _ in range(3):
+        pacer.acquire()
+    assert clock.slept == [0.25, 0.25]
+
+
+def test_retry_after_blocks_the_next_request(clock):
+    pacer = AdaptivePacer(min_rps=1, max_rps=10, start_rps=4)
+    pacer.acquire()
+    pacer.observe(response(429, retry_after="3"), 0.1)
+    pacer.acquire()
+    assert clock.slept == [3.0]
+
+
+def test_pacer_backs_off_against_server_limit(naver_server, monkeypatch):
+    # 실제 시간으로 요청 (서버는 최근 1초에 5건을 넘으면 429)
+    server = naver_server(capacity_rps=5)
+    pacer = AdaptivePacer(min_rps=1, max_rps=20, start_rps=20, cooldown=0.2)
+    metrics = RunMetrics()
+    for i in range(15):
+        response = fetch_with_retry(f"{server.base_url}/article/info/{2400000000 + i}", HEADERS, "detail", 5, metrics,
+                                    retries=5, pacer=pacer)
+        assert response.status_code == 200
+    assert server.counts["429"] > 0
+    assert pacer.cuts > 0
+    assert pacer.rate < 20
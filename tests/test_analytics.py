@@ -0,0 +1,33 @@
+"""analytics.py 집계 테스트"""
+import pandas as pd
+
+from analytics import aggregate_results
+
+
+def results(groups):
+    return pd.DataFrame({
+        "매물번호": [str(2400000000 + i) for i in range(len(groups))],
+        "거래타입": "매매",
+        "건물명": "래미안",
+        "주소지": "서울특별시 강남구 삼성동",
+        "층수": "3/15",
+        "전용면적(㎡)": 84.0,
+        "가격(만원)": 120000.0,
+        "중복그룹": groups,
+    })
+
+
+def test_collapsed_only_when_duplicates_were_merged():
+    distinct = aggregate_results(results(["1", "2", "3"]))
+    assert distinct["rows"] == 3
+    assert not distinct["collapsed"]
+
+    merged = aggregate_results(results(["1", "1", "3"]))
+    assert merged["rows"] == 2
+    assert merged["collapsed"]
+
+
+def test_without_group_column_nothing_is_collapsed():
+    aggregates = aggregate_results(results(["1", "1", "3"]).drop(columns="중복그룹"))
+    assert aggregates["rows"] == 3
+    assert not aggregates["collapsed"]
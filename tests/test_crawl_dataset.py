@@ -0,0 +1,67 @@
+"""crawl_dataset.py 파티션 Parquet 데이터셋 테스트 (쓰기 → 다시 읽기)"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from bench_dataset import CORTAR_NOS, DATES, make_results  # noqa: E402
+from crawl_dataset import CrawlDataset, dataset_table  # noqa: E402
+
+
+@pytest.fixture
+def results():
+    return make_results(48)
+
+
+def test_round_trip_keeps_values_and_types(tmp_path, results):
+    dataset = CrawlDataset(str(tmp_path / "dataset"))
+    assert dataset.append(results) == len(results)
+    reloaded = dataset.read().sort_values("매물번호").reset_index(drop=True)
+    original = results.sort_values("매물번호").reset_index(drop=True)
+    assert reloaded["매물번호"].tolist() == original["매물번호"].astype(str).tolist()
+    for column in ("가격(만원)", "전용면적(㎡)"):
+        np.testing.assert_allclose(reloaded[column], original[column], equal_nan=True)
+    assert reloaded["주소지"].astype(str).tolist() == original["주소지"].astype(str).tolist()
+    assert str(reloaded["수집일시"].dtype).startswith("datetime64")
+    assert reloaded["중복수"].tolist() == original["중복수"].tolist()
+
+
+def test_partitions_follow_region_type_and_date(tmp_path, results):
+    root = tmp_path / "dataset"
+    CrawlDataset(str(root)).append(results)
+    assert sorted(os.listdir(root)) == sorted(f"cortarNo={code}" for code in CORTAR_NOS)
+    date_dirs = {
+        name
+        for dirpath, dirnames, _ in os.walk(root)
+        for name in dirnames if name.startswith("crawl_date=")
+    }
+    assert date_dirs == {f"crawl_date={day}" for day in DATES}
+    assert {"rletTpCd=APT", "rletTpCd=OPST"} <= {name for _, dirnames, _ in os.walk(root) for name in dirnames}
+
+
+def test_read_filters_partitions_and_columns(tmp_path, results):
+    dataset = CrawlDataset(str(tmp_path / "dataset"))
+    dataset.append(results)
+    part = dataset.read(columns=["매물번호", "가격(만원)"], where={"cortarNo": CORTAR_NOS[0], "crawl_date": [DATES[0]]})
+    expected = results[(results["법정동코드"] == CORTAR_NOS[0]) & results["수집일시"].astype(str).str.startswith(DATES[0])]
+    assert list(part.columns) == ["매물번호", "가격(만원)"]
+    assert sorted(part["매물번호"]) == sorted(expected["매물번호"].astype(str))
+
+
+def test_append_adds_files_without_touching_existing_ones(tmp_path, results):
+    dataset = CrawlDataset(str(tmp_path / "dataset"))
+    dataset.append(results)
+    dataset.append(results.head(4))
+    assert len(dataset.read()) == len(results) + 4
+    assert dataset.append(results.head(0)) == 0
+
+
+def test_missing_columns_become_nulls():
+    table = dataset_table(pd.DataFrame({"매물번호": ["1"], "법정동코드": ["1168010500"], "매물타입": ["아파트"],
+                                        "수집일시": ["2026-10-18 09:00:00"]}))
+    row = table.to_pylist()[0]
+    assert row["rletTpCd"] == "APT" and row["crawl_date"] == "2026-10-18"
+    assert row["가격(만원)"] is None and row["용도"] is None
@@ -0,0 +1,103 @@
+"""crawler.py 요청 재시도(fetch_with_retry)와 체크포인트 이어받기 테스트"""
+import pytest
+import requests
+
+import crawler
+from crawl_checkpoint import CrawlCheckpoint
+from crawler import HEADERS, fetch_with_retry, search_properties
+from run_metrics import RunMetrics
+
+QUERY = ("1168010500", "APT", "A1", 5, 0, "서울특별시", "강남구", "삼성동")
+
+
+@pytest.fixture
+def waits(monkeypatch):
+    """재시도 대기를 실제로 하지 않고 대기 시간만 기록"""
+    waits = []
+    monkeypatch.setattr(crawler.time, "sleep", waits.append)
+    return waits
+
+
+def detail_url(server, atclNo="2400000000"):
+    return f"{server.base_url}/article/info/{atclNo}"
+
+
+def test_server_errors_are_retried_until_success(naver_server, waits):
+    server = naver_server(error_rate=0.5, seed=3)
+    metrics = RunMetrics()
+    for i in range(20):
+        response = fetch_with_retry(detail_url(server, 2400000000 + i), HEADERS, "detail", 5, metrics, retries=10)
+        assert response.status_code == 200
+    assert server.counts["error"] > 0
+    assert metrics.retries["detail"] == server.counts["error"] == len(waits)
+
+
+def test_last_response_is_returned_when_retries_run_out(naver_server, waits):
+    server = naver_server(error_rate=1.0)
+    response = fetch_with_retry(detail_url(server), HEADERS, "detail", 5, RunMetrics(), retries=2)
+    assert response.status_code == 500
+    assert server.counts["detail"] == 3
+    # 지수 백오프
+    assert waits == [crawler.RETRY_BACKOFF, crawler.RETRY_BACKOFF * 2]
+
+
+def test_retry_after_header_sets_the_wait(naver_server, waits):
+    server = naver_server(rate_429=1.0)
+    response = fetch_with_retry(detail_url(server), HEADERS, "detail", 5, RunMetrics(), retries=1)
+    assert response.status_code == 429
+    assert waits == [1.0]
+
+
+def test_connection_errors_raise_after_retries(waits):
+    with pytest.raises(requests.ConnectionError):
+        fetch_with_retry("http://127.0.0.1:9/article/info/1", HEADERS, "detail", 1, RunMetrics(), retries=2)
+    assert len(waits) == 2
+
+
+def test_interrupted_crawl_resumes_from_checkpoint(naver_server, tmp_path):
+    server = naver_server(listings_per_query=60)
+    expected = search_properties(*QUERY)
+    checkpoint = CrawlCheckpoint(str(tmp_path / "checkpoint.sqlite3"))
+
+    pages = crawler.iter_property_pages(*QUERY, checkpoint=checkpoint)
+    first_page = next(pages)
+    pages.close()
+    assert len(checkpoint.pending()) == 1
+
+    before = dict(server.counts)
+    stats = {}
+    resumed = search_properties(*QUERY, checkpoint=checkpoint, stats=stats)
+    assert stats["resumed_pages"] == 1
+    assert server.counts["list"] - before["list"] == 2
+    assert server.counts["detail"] - before["detail"] == len(expected) - len(first_page)
+    assert [r["매물번호"] for r in resumed] == [r["매물번호"] for r in expected]
+    assert checkpoint.pending() == []
+
+
+def test_failed_details_stay_pending_and_are_retried_on_resume(naver_server, tmp_path, monkeypatch):
+    server = naver_server(listings_per_query=60)
+    checkpoint = CrawlCheckpoint(str(tmp_path / "checkpoint.sqlite3"))
+    fetch = crawler.fetch_property_details
+
+    def flaky(atclNo, *args, **kwargs):
+        if int(atclNo) % 7 == 0:
+            raise requests.ConnectionError("down")
+        return fetch(atclNo, *args, **kwargs)
+
+    monkeypatch.setattr(crawler, "fetch_property_details", flaky)
+    stats = {}
+    records = search_properties(*QUERY, checkpoint=checkpoint, stats=stats, group_duplicates=False)
+    failed = [r["매물번호"] for r in records if r["용도"] == ""]
+    assert stats["failed_details"] == len(failed) == sum(int(r["매물번호"]) % 7 == 0 for r in records) > 0
+    # 실패가 남아 있으면 체크포인트를 지우지 않음
+    assert len(checkpoint.pending()) == 1
+
+    monkeypatch.setattr(crawler, "fetch_property_details", fetch)
+    before = dict(server.counts)
+    stats = {}
+    records = search_properties(*QUERY, checkpoint=checkpoint, stats=stats, group_duplicates=False)
+    assert stats["failed_details"] == 0
+    assert server.counts["list"] == before["list"]
+    assert server.counts["detail"] - before["detail"] == len(failed)
+    assert all(r["용도"] for r in records)
+    assert checkpoint.pending() == []
@@ -0,0 +1,29 @@
+"""detail_cache.py 상세 정보 캐시 테스트"""
+from detail_cache import DetailCache
+
+DETAILS = ("제2종일반주거지역", "공동주택", "15만원", "서울 강남구 삼성동 123-4")
+
+
+def test_count_is_shared_between_instances_on_one_file(tmp_path):
+    path = str(tmp_path / "details.sqlite3")
+    first, second = DetailCache(path, max_entries=10), DetailCache(path, max_entries=10)
+    for i in range(6):
+        first.put(2400000000 + i, DETAILS)
+        second.put(2400001000 + i, DETAILS)
+    # 각 인스턴스는 6개씩만 넣었지만 파일 전체로는 상한 10을 넘었으므로 90%(9개)까지 줄어듦
+    assert len(first) == len(second) <= 10
+
+
+def test_replacing_an_entry_does_not_grow_the_count(tmp_path):
+    cache = DetailCache(str(tmp_path / "details.sqlite3"), max_entries=3)
+    for _ in range(5):
+        cache.put("2400000000", DETAILS)
+    assert len(cache) == 1
+    assert cache.get("2400000000") == DETAILS
+
+
+def test_empty_details_are_not_cached(tmp_path):
+    cache = DetailCache(str(tmp_path / "details.sqlite3"))
+    cache.put("2400000000", ("", "", "", ""))
+    assert len(cache) == 0
+    assert cache.get("2400000000") is None
@@ -0,0 +1,42 @@
+"""detail_parser.py 상세 페이지 추출 테스트 (lxml 단일 순회와 BeautifulSoup 경로의 결과 일치)"""
+import glob
+import os
+import sys
+
+import pytest
+
+from detail_parser import LXML_AVAILABLE, extract_details_lxml, extract_details_soup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_detail_parser import FIXTURE_DIR, padded_page  # noqa: E402
+
+EXPECTED = {
+    "apartment.html": ("제3종일반주거지역", "공동주택", "25만원", "서울특별시 강남구 삼성동 123-4512억 5,000"),
+    "factory.html": ("계획관리지역", "공장/창고", "없음", ""),
+    "empty.html": ("", "", "", ""),
+}
+FIXTURES = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+
+needs_lxml = pytest.mark.skipif(not LXML_AVAILABLE, reason="lxml이 설치되어 있지 않음")
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("name, expected", EXPECTED.items())
+def test_soup_extracts_expected_fields(name, expected):
+    assert extract_details_soup(read(os.path.join(FIXTURE_DIR, name))) == expected
+
+
+@needs_lxml
+@pytest.mark.parametrize("path", FIXTURES, ids=os.path.basename)
+@pytest.mark.parametrize("padded", [False, True], ids=["원본", "부풀림"])
+def test_lxml_matches_soup(path, padded):
+    html = read(path)
+    if padded:
+        html = padded_page(html)
+    assert extract_details_lxml(html) == extract_details_soup(html)
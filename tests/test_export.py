@@ -0,0 +1,29 @@
+"""export.py 내보내기 테스트"""
+import io
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from export import column_widths, dataframe_to_excel_bytes
+
+
+def test_column_widths_handles_categorical_with_missing_values():
+    df = pd.DataFrame({
+        "방향": pd.Categorical(["남향", None, "동남향"]),
+        "가격(만원)": [12000.0, np.nan, 5000.0],
+    })
+    assert column_widths(df) == [len("동남향") + 2, len("12000.0") + 2]
+
+
+def test_excel_round_trip_in_chunks():
+    df = pd.DataFrame({
+        "매물번호": [str(2400000000 + i) for i in range(7)],
+        "방향": pd.Categorical(["남향", None, "동향", "남향", None, "서향", "북향"]),
+        "가격(만원)": [1.5, np.nan, 3.0, 4.0, 5.0, 6.0, 7.0],
+    })
+    sheet = load_workbook(io.BytesIO(dataframe_to_excel_bytes(df, chunk_rows=3))).active
+    rows = list(sheet.values)
+    assert rows[0] == ("매물번호", "방향", "가격(만원)")
+    assert rows[1:3] == [("2400000000", "남향", 1.5), ("2400000001", None, None)]
+    assert len(rows) == 8
@@ -0,0 +1,44 @@
+"""legal_code.py 법정동코드 인덱스 부분 일치 테스트"""
+import pandas as pd
+import pytest
+
+from legal_code import LEGAL_CODE_COLUMNS, LegalCodeIndex
+
+ROWS = [
+    ("1168010100", "서울특별시", "강남구", "역삼동"),
+    ("1168010500", "서울특별시", "강남구", "삼성동"),
+    ("1165010100", "서울특별시", "서초구", "서초동"),
+    ("2635010500", "부산광역시", "해운대구", "우동"),
+    ("4113510900", "경기도", "성남시 분당구", "삼평동"),
+    ("4113511000", "경기도", "성남시 분당구", "삼평동"),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return LegalCodeIndex(pd.DataFrame(ROWS, columns=LEGAL_CODE_COLUMNS))
+
+
+def brute_force(sido, sigungu, dong):
+    """이전 구현과 같은 선형 탐색 (파일 순서의 첫 번째 일치)"""
+    return next((code for code, *names in ROWS
+                 if all(part in name for part, name in zip((sido, sigungu, dong), names))), None)
+
+
+@pytest.mark.parametrize("sido, sigungu, dong", [
+    ("서울", "강남", "삼성"),
+    ("서울", "", "동"),
+    ("", "", ""),
+    ("", "분당", "삼평"),
+    ("부산", "해운대", "우"),
+    ("서울", "강남", "우동"),
+    ("경기", "", "없는동"),
+    ("ㅅ", "", ""),
+])
+def test_find_partial_matches_linear_scan(index, sido, sigungu, dong):
+    assert index.find_partial(sido, sigungu, dong) == brute_force(sido, sigungu, dong)
+
+
+def test_find_partial_uses_first_code_of_duplicate_names(index):
+    assert index.find_partial("경기", "분당", "삼평동") == "4113510900"
+    assert index.find_exact("경기도", "성남시 분당구", "삼평동") == "4113510900"
@@ -0,0 +1,74 @@
+"""listing_groups.py 중복 매물 묶기 테스트"""
+import pandas as pd
+
+from crawler import build_property_record, search_properties
+from listing_groups import (
+    GROUP_COLUMN, GROUP_SIZE_COLUMN, DuplicateGrouper, add_group_sizes, collapse_duplicates, duplicate_group_key,
+    record_group_key,
+)
+from mock_naver import list_item
+
+DETAILS = ("제2종일반주거지역", "공동주택", "15만원", "서울 강남구 삼성동 123-4")
+QUERY = ("1168010500", "APT", "A1", 5, 0, "서울특별시", "강남구", "삼성동")
+
+
+def test_same_listing_from_other_agents_joins_the_first_ones_group():
+    grouper = DuplicateGrouper()
+    original = list_item("2400000001", 1, "APT", "A1")
+    copy = list_item("2400000002", 2, "APT", "A1", source="2400000001")
+    other = list_item("2400000003", 3, "APT", "A1")
+    assert [grouper.assign(item["atclNo"], duplicate_group_key(item)) for item in (original, copy, other)] == [
+        "2400000001", "2400000001", "2400000003"]
+
+
+def test_listings_without_building_or_price_are_never_grouped():
+    grouper = DuplicateGrouper()
+    items = [dict(list_item("2400000001", 1, "APT", "A1"), bildNm=""),
+             dict(list_item("2400000002", 2, "APT", "A1", source="2400000001"), bildNm="")]
+    assert duplicate_group_key(items[0]) is None
+    assert [grouper.assign(item["atclNo"], duplicate_group_key(item)) for item in items] == ["2400000001", "2400000002"]
+
+
+def test_record_key_matches_item_key_and_restore_rebuilds_groups():
+    item = list_item("2400000001", 1, "APT", "A1")
+    record = build_property_record(item, DETAILS, "1168010500", "APT", "A1", group="2400000001")
+    assert record_group_key(record) == duplicate_group_key(item)
+
+    grouper = DuplicateGrouper()
+    grouper.restore(record)
+    copy = list_item("2400000009", 9, "APT", "A1", source="2400000001")
+    assert grouper.assign(copy["atclNo"], duplicate_group_key(copy)) == "2400000001"
+    assert grouper.details["2400000001"] == DETAILS
+
+
+def test_group_sizes_and_collapse():
+    df = pd.DataFrame({"매물번호": ["1", "2", "3", "4"], GROUP_COLUMN: ["1", "1", "3", "1"]})
+    sized = add_group_sizes(df.copy())
+    assert sized[GROUP_SIZE_COLUMN].tolist() == [3, 3, 1, 3]
+    collapsed = collapse_duplicates(sized)
+    assert collapsed["매물번호"].tolist() == ["1", "3"]
+    ungrouped = df.drop(columns=GROUP_COLUMN)
+    assert collapse_duplicates(ungrouped) is ungrouped
+
+
+def test_crawl_requests_details_once_per_group(naver_server):
+    server = naver_server(listings_per_query=60, duplicate_rate=0.3)
+    stats = {}
+    records = search_properties(*QUERY, stats=stats)
+    groups = {record[GROUP_COLUMN] for record in records}
+    assert len(groups) < len(records)
+    assert server.counts["detail"] == len(groups)
+    assert stats["grouped"] == len(records) - len(groups)
+    # 같은 묶음의 매물은 대표의 상세 정보를 그대로 씀
+    by_group = {}
+    for record in records:
+        by_group.setdefault(record[GROUP_COLUMN], set()).add((record["지역지구"], record["용도"], record["관리비"]))
+    assert all(len(details) == 1 for details in by_group.values())
+
+
+def test_lazy_crawl_does_not_count_empty_copies_as_grouped(naver_server):
+    naver_server(listings_per_query=60, duplicate_rate=0.3)
+    stats = {}
+    records = search_properties(*QUERY, stats=stats, lazy_details=True)
+    assert stats["grouped"] == 0
+    assert stats["deferred"] == len(records)
@@ -0,0 +1,27 @@
+"""listing_store.py 증분 수집 저장소 테스트"""
+import pytest
+
+from listing_store import ListingStore, listing_fingerprint
+
+ITEM = {"atclNo": "2400000001", "hanPrc": "1억 2,000", "rentPrc": "", "spc1": "110", "spc2": "84.97", "flrInfo": "3/15"}
+DETAILS = ("제2종일반주거지역", "공동주택", "15만원", "서울 강남구 삼성동 123-4")
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ListingStore(str(tmp_path / "listings.sqlite3"))
+
+
+def test_empty_details_are_not_stored(store):
+    store.upsert(ITEM, ("", "", "", ""))
+    assert len(store) == 0
+
+
+def test_pending_listing_is_hidden_until_details_are_set(store):
+    store.upsert(ITEM, ("", "", "", ""), pending=True)
+    assert len(store) == 1
+    assert store.get_many([ITEM["atclNo"]]) == {}
+
+    assert store.set_details([ITEM["atclNo"], "2400000002"], ("", "", "", "")) == 0
+    assert store.set_details([ITEM["atclNo"], "2400000002"], DETAILS) == 1
+    assert store.get_many([ITEM["atclNo"]]) == {ITEM["atclNo"]: (listing_fingerprint(ITEM), DETAILS)}
@@ -0,0 +1,129 @@
+"""normalize.py 가격/면적 변환과 조건 마스크 테스트"""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from normalize import (
+    condition_mask, normalize_results, parse_area, parse_area_series, parse_price, parse_price_series,
+)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1억 2,500", 12500),
+    ("1억2500", 12500),
+    ("3.5억", 35000),
+    ("1억", 10000),
+    ("12억5000", 125000),
+    ("1억 2500만원", 12500),
+    ("5,000만", 5000),
+    ("5000만 원", 5000),
+    ("2500", 2500),
+    ("50", 50),
+    (" 9,000 ", 9000),
+    ("1억 2천", 12000),
+    ("5천만", 5000),
+    ("2천", 2000),
+    ("1억 2천만원", 12000),
+])
+def test_parse_price_series_formats(text, expected):
+    assert parse_price_series([text])[0] == expected
+
+
+@pytest.mark.parametrize("text", ["", "협의", "억", "만원", "천", "-", "1,000,000달러"])
+def test_parse_price_series_unparseable_is_nan(text):
+    assert math.isnan(parse_price_series([text])[0])
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("85.5㎡", 85.5),
+    ("84.97", 84.97),
+    ("1,234.5m²", 1234.5),
+    ("59", 59.0),
+    ("전용 84.9㎡ / 공급 112㎡", 84.9),
+])
+def test_parse_area_series_formats(text, expected):
+    assert parse_area_series([text])[0] == expected
+
+
+@pytest.mark.parametrize("text", ["", "-", "㎡"])
+def test_parse_area_series_unparseable_is_nan(text):
+    assert math.isnan(parse_area_series([text])[0])
+
+
+def test_missing_values_are_nan():
+    prices = parse_price_series([None, np.nan, "1억"])
+    areas = parse_area_series([None, np.nan, "84"])
+    assert np.isnan(prices[:2]).all() and prices[2] == 10000
+    assert np.isnan(areas[:2]).all() and areas[2] == 84.0
+
+
+def test_series_matches_scalar_parsers_for_repeated_values():
+    values = ["1억 2,500", "3.5억", "1억 2,500", "", "협의", "3.5억"]
+    expected = [parse_price(value.replace(",", "").strip()) for value in values]
+    np.testing.assert_array_equal(parse_price_series(values), expected)
+    areas = ["85.5㎡", "", "85.5㎡", "59"]
+    np.testing.assert_array_equal(parse_area_series(areas), [parse_area(area) for area in areas])
+
+
+def test_empty_input():
+    assert len(parse_price_series([])) == 0
+    assert len(parse_area_series([])) == 0
+    assert condition_mask([], [], True, 0, 100, True, 0, 100).tolist() == []
+
+
+def test_condition_mask_blank_passes_and_unparseable_area_fails():
+    mask = condition_mask(["85.5㎡", "", "-", "120"], ["1억 2,500", "3.5억", "1억", ""], True, 50, 100, True, 0, 40000)
+    assert mask.tolist() == [True, True, False, False]
+
+
+def test_condition_mask_unparseable_price_counts_as_zero():
+    prices = ["협의", "1억", ""]
+    assert condition_mask(["", "", ""], prices, False, 0, 0, True, 0, 40000).tolist() == [True, True, True]
+    assert condition_mask(["", "", ""], prices, False, 0, 0, True, 5000, 40000).tolist() == [False, True, True]
+
+
+def test_condition_mask_bounds_are_inclusive():
+    mask = condition_mask(["50", "100", "100.1"], ["", "", ""], True, 50, 100, False, 0, 0)
+    assert mask.tolist() == [True, True, False]
+    mask = condition_mask(["", "", ""], ["1억", "9,999", "1억 1"], False, 0, 0, True, 10000, 10000)
+    assert mask.tolist() == [True, False, False]
+
+
+def test_condition_mask_disabled_filters_pass_everything():
+    mask = condition_mask(["-", "999"], ["협의", "100억"], False, 0, 1, False, 0, 1)
+    assert mask.all()
+
+
+def test_normalize_results_adds_numeric_columns_without_touching_input():
+    df = pd.DataFrame({
+        "매물번호": ["1", "2", "3"],
+        "전용면적(㎡)": ["84.97", "", "59㎡"],
+        "임대면적(㎡)": ["112", "-", "79"],
+        "보증금/매매가": ["1억 2,500", "3.5억", "협의"],
+        "월세": ["", "50", "1,000"],
+    })
+    original = df.copy()
+    normalized = normalize_results(df)
+
+    pd.testing.assert_frame_equal(df, original)
+    np.testing.assert_array_equal(normalized["전용면적(㎡)"], [84.97, np.nan, 59.0])
+    np.testing.assert_array_equal(normalized["임대면적(㎡)"], [112.0, np.nan, 79.0])
+    np.testing.assert_array_equal(normalized["가격(만원)"], [12500.0, 35000.0, np.nan])
+    np.testing.assert_array_equal(normalized["월세(만원)"], [np.nan, 50.0, 1000.0])
+    # 원본 가격 문자열은 그대로 유지
+    assert normalized["보증금/매매가"].tolist() == ["1억 2,500", "3.5억", "협의"]
+    assert "중복수" not in normalized.columns
+
+
+def test_normalize_results_counts_duplicate_groups():
+    df = pd.DataFrame({"매물번호": ["1", "2", "3"], "보증금/매매가": ["1억"] * 3, "중복그룹": ["1", "1", "3"]})
+    assert normalize_results(df)["중복수"].tolist() == [2, 2, 1]
+
+
+def test_normalize_results_handles_missing_columns_and_categoricals():
+    df = pd.DataFrame({"보증금/매매가": pd.Categorical(["1억", "1억", "2억"])})
+    normalized = normalize_results(df)
+    assert normalized["가격(만원)"].tolist() == [10000.0, 10000.0, 20000.0]
+    assert "월세(만원)" not in normalized.columns
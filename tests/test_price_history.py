@@ -0,0 +1,66 @@
+"""price_history.py 가격 이력 저장소 테스트 (변경분만 저장, 이력/하락/최신 가격 조회)"""
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from bench_price_history import make_frame
+from price_history import PriceHistory
+
+DAY = date(2025, 1, 1)
+
+
+@pytest.fixture
+def history(tmp_path):
+    return PriceHistory(str(tmp_path / "history.sqlite3"))
+
+
+def test_only_new_and_changed_prices_are_stored(history):
+    assert history.append(make_frame(["1", "2", "3"], [10000.0, 20000.0, 30000.0]), DAY) == 3
+    assert history.append(make_frame(["1", "2", "3"], [10000.0, 20000.0, 30000.0]), DAY + timedelta(days=1)) == 0
+    # 1번 하락, 2번 상승, 4번 신규
+    frame = make_frame(["1", "2", "3", "4"], [9000.0, 21000.0, 30000.0, 5000.0])
+    assert history.append(frame, DAY + timedelta(days=8)) == 3
+    assert len(history) == 6
+    assert history.history("1")["가격(만원)"].tolist() == [10000.0, 9000.0]
+    assert history.history("3")["날짜"].tolist() == ["2025-01-01"]
+
+
+def test_same_day_append_overwrites_that_days_snapshot(history):
+    history.append(make_frame(["1"], [10000.0]), DAY)
+    assert history.append(make_frame(["1"], [9500.0]), DAY) == 1
+    assert history.history("1")["가격(만원)"].tolist() == [9500.0]
+
+
+def test_missing_prices_and_rent_changes_are_tracked(history):
+    frame = make_frame(["1", "2"], [np.nan, 5000.0])
+    history.append(frame, DAY)
+    assert history.append(frame, DAY + timedelta(days=1)) == 0
+    frame["월세(만원)"] = [np.nan, 100.0]
+    assert history.append(frame, DAY + timedelta(days=2)) == 1
+    assert history.history("2")["월세(만원)"].tolist()[-1] == 100.0
+
+
+def test_price_drops_since_a_date(history):
+    history.append(make_frame(["1", "2", "3"], [10000.0, 20000.0, 30000.0]), DAY)
+    history.append(make_frame(["1", "2", "3", "4"], [9000.0, 21000.0, 30000.0, 5000.0]), DAY + timedelta(days=8))
+    drops = history.price_drops(since=DAY + timedelta(days=1))
+    assert drops["매물번호"].tolist() == ["1"]
+    assert drops["변동(만원)"].tolist() == [-1000.0]
+    assert drops["변동률(%)"].tolist() == [-10.0]
+    assert history.price_drops(since=DAY + timedelta(days=1), min_drop=1000).empty
+    assert history.price_drops(since=DAY + timedelta(days=8)).empty
+
+
+def test_listings_and_version_follow_latest_prices(history):
+    history.append(make_frame(["1", "2"], [10000.0, 20000.0]), DAY)
+    version = history.version()
+    history.append(make_frame(["2"], [19000.0]), DAY + timedelta(days=3))
+    assert history.version() != version
+    assert history.listings()["가격(만원)"].tolist() == [10000.0, 19000.0]
+    assert history.listings(since=DAY + timedelta(days=1))["매물번호"].tolist() == ["2"]
+
+
+def test_empty_frame_is_ignored(history):
+    assert history.append(make_frame([], []), DAY) == 0
+    assert len(history) == 0
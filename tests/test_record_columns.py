@@ -0,0 +1,44 @@
+"""record_columns.py 컬럼 배열 저장소 테스트"""
+import numpy as np
+import pandas as pd
+
+from record_columns import RecordColumns
+
+
+def records(start, n, categories=3):
+    return [{"매물번호": str(start + i), "층수": f"{(start + i) % categories}층", "방향": None}
+            for i in range(n)]
+
+
+def test_to_frame_shares_category_codes_without_copy():
+    store = RecordColumns(categorical_columns=["층수", "방향"])
+    store.append(records(0, 10))
+    df = store.to_frame()
+    for column in ("층수", "방향"):
+        assert isinstance(df[column].dtype, pd.CategoricalDtype)
+        assert df[column].array.codes.dtype == np.int8
+        assert np.shares_memory(df[column].array.codes, store.codes(column))
+    assert df["층수"].tolist() == [f"{i % 3}층" for i in range(10)]
+    assert df["방향"].tolist() == [""] * 10
+
+
+def test_append_after_to_frame_keeps_earlier_frame():
+    store = RecordColumns(categorical_columns=["층수"])
+    store.append(records(0, 5))
+    before = store.to_frame()
+    # 용량을 넘기고 범주 수가 int8 범위를 넘도록 추가 (새 버퍼로 옮겨짐)
+    store.append(records(5, 3000, categories=300))
+    assert before["층수"].tolist() == [f"{i % 3}층" for i in range(5)]
+
+    after = store.to_frame()
+    assert len(after) == 3005
+    assert after["층수"].array.codes.dtype == np.int16
+    assert np.shares_memory(after["층수"].array.codes, store.codes("층수"))
+    assert after["층수"].iloc[4] == "1층"
+    assert after["층수"].iloc[-1] == f"{3004 % 300}층"
+
+
+def test_empty_store_gives_empty_frame():
+    store = RecordColumns()
+    assert not store
+    assert store.to_frame().empty
@@ -0,0 +1,135 @@
+"""response_cache.py 공유 응답 캐시 테스트 (TTL, LRU, single-flight)"""
+import threading
+import time
+
+import pytest
+
+import crawler
+import response_cache
+from crawler import HEADERS, fetch_shared
+from response_cache import ResponseCache
+from run_metrics import RunMetrics
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_hit_until_ttl_expires(clock):
+    cache = ResponseCache(ttl_seconds=10)
+    assert cache.get_or_fetch("a", lambda: "v1") == ("v1", "miss")
+    clock[0] += 9.9
+    assert cache.get_or_fetch("a", lambda: "v2") == ("v1", "hit")
+    clock[0] += 0.2
+    assert cache.get_or_fetch("a", lambda: "v2") == ("v2", "miss")
+    assert cache.stats()["expirations"] == 1
+
+
+def test_lru_eviction_by_entries_and_bytes(clock):
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    cache.get_or_fetch("a", lambda: "aaa")
+    cache.get_or_fetch("b", lambda: "bbb")
+    cache.get_or_fetch("a", lambda: "x")  # a를 최근 사용으로
+    cache.get_or_fetch("c", lambda: "ccc")
+    assert cache.get_or_fetch("b", lambda: "new")[1] == "miss"
+    assert cache.get_or_fetch("a", lambda: "x")[1] == "miss"  # b를 다시 넣으면서 a가 밀려남
+
+    cache.clear()
+    cache.get_or_fetch("big", lambda: "y" * 11)
+    assert len(cache) == 0
+    cache.get_or_fetch("d", lambda: "dddddd")
+    cache.get_or_fetch("e", lambda: "eeeeee")
+    assert len(cache) == 1 and cache.stats()["bytes"] == 6
+
+
+def test_uncacheable_values_are_returned_but_not_kept():
+    cache = ResponseCache()
+    assert cache.get_or_fetch("a", lambda: 500, size=lambda v: 1, cacheable=lambda v: v == 200) == (500, "miss")
+    assert len(cache) == 0
+
+
+def test_concurrent_requests_for_one_key_share_a_single_fetch():
+    cache = ResponseCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_fetch("k", slow_fetch)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("k", slow_fetch)))
+                 for _ in range(5)]
+    for thread in followers:
+        thread.start()
+    wait_for(lambda: cache.stats()["coalesced"] == 5)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+    assert len(calls) == 1
+    assert sorted(source for _, source in results) == ["coalesced"] * 5 + ["miss"]
+    assert {value for value, _ in results} == {"value"}
+
+
+def test_failed_fetch_is_shared_with_waiters_and_not_cached():
+    cache = ResponseCache()
+    started, release = threading.Event(), threading.Event()
+
+    def failing_fetch():
+        started.set()
+        release.wait(5)
+        raise ConnectionError("down")
+
+    errors = []
+
+    def call():
+        try:
+            cache.get_or_fetch("k", failing_fetch)
+        except ConnectionError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    wait_for(lambda: cache.stats()["coalesced"] == 1)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    assert len(errors) == 2 and errors[0] is errors[1]
+    assert len(cache) == 0
+
+
+def test_fetch_shared_reuses_ok_responses_only(naver_server, monkeypatch):
+    monkeypatch.setattr(crawler, "_retry_wait", lambda response, attempt: 0)
+    server = naver_server()
+    cache = ResponseCache()
+    metrics = RunMetrics()
+    url = f"{server.base_url}/article/info/2400000000"
+    for _ in range(3):
+        assert fetch_shared(url, HEADERS, "detail", 5, metrics, response_cache=cache).status_code == 200
+    assert server.counts["detail"] == 1
+    assert metrics.counters["detail_cache_hit"] == 2
+
+    server.error_rate = 1.0
+    error_url = f"{server.base_url}/article/info/2400000001"
+    for _ in range(2):
+        fetch_shared(error_url, HEADERS, "detail", 5, metrics, response_cache=cache)
+    assert len(cache) == 1
+    assert server.counts["error"] == 2 * (crawler.MAX_RETRIES + 1)